@@ -0,0 +1,66 @@
+"""Benchmarks of the package against the simulator
+
+Run the suite and store the results as JSON:
+> pytest benchmarks --benchmark-json=benchmark.json
+or save numbered runs in .benchmarks and compare them:
+> pytest benchmarks --benchmark-autosave
+> pytest-benchmark compare 0001 0002
+
+The options --latency and --bandwidth emulate a network connection, e.g.
+--latency 0.5e-3 --bandwidth 12.5e6 for 100 Mbit/s Ethernet. Without them the
+results are the overhead of the package and the simulator.
+
+Record lengths over 100000 are skipped unless --full is given.
+"""
+import pytest
+from tekinstr.simulator import simulate
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+MAX_RECORD_LENGTH = 100000  # without --full
+
+
+def pytest_addoption(parser):
+    parser.addoption("--latency", type=float, default=0.0, help="round trip time in s")
+    parser.addoption("--bandwidth", type=float, default=None, help="bytes per second")
+    parser.addoption(
+        "--full",
+        action="store_true",
+        help=f"include record lengths over {MAX_RECORD_LENGTH}",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("full"):
+        return
+    skip = pytest.mark.skip(
+        reason=f"record length over {MAX_RECORD_LENGTH}; use --full"
+    )
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec and callspec.params.get("record_length", 0) > MAX_RECORD_LENGTH:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def link(request):
+    return {
+        "latency": request.config.getoption("latency"),
+        "bandwidth": request.config.getoption("bandwidth"),
+    }
+
+
+@pytest.fixture(scope="module")
+def tek(link):
+    yield simulate("MDO3024", **link)
+
+
+@pytest.fixture
+def record_rate(benchmark):
+    """Record the rate of amount per round in the results, e.g. 'MB/s'"""
+
+    def record(unit, amount):
+        if benchmark.stats is not None:  # None with --benchmark-disable
+            benchmark.extra_info[unit] = amount / benchmark.stats.stats.mean
+
+    return record
@@ -0,0 +1,52 @@
+"""Setting and query benchmarks"""
+from operator import attrgetter
+import pytest
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+GETTERS = [
+    "oscilloscope.horizontal_scale",
+    "oscilloscope.record_length",
+    "oscilloscope.ch1.scale",
+    "oscilloscope.trigger.level",
+    "oscilloscope.measurement.CH1_frequency.value",
+]
+
+
+@pytest.fixture(scope="module")
+def tek(tek):
+    tek.oscilloscope.measurement.add("CH1", "frequency")
+    yield tek
+
+
+@pytest.mark.benchmark(group="get")
+@pytest.mark.parametrize("name", GETTERS)
+def test_get(benchmark, tek, name):
+    benchmark(attrgetter(name), tek)
+
+
+@pytest.mark.benchmark(group="get")
+def test_get_cached(benchmark, tek):
+    with tek.cached():
+        benchmark(attrgetter("oscilloscope.horizontal_scale"), tek)
+
+
+@pytest.mark.benchmark(group="set")
+def test_set_validated(benchmark, tek):
+    benchmark(setattr, tek.oscilloscope, "horizontal_scale", 4e-6)
+
+
+@pytest.mark.benchmark(group="set")
+def test_set_unvalidated(benchmark, tek):
+    benchmark(setattr, tek.oscilloscope.ch1, "scale", 0.1)
+
+
+@pytest.mark.benchmark(group="set")
+def test_apply(benchmark, tek):
+    settings = {"oscilloscope": {"horizontal_scale": 4e-6, "ch1": {"scale": 0.1}}}
+    benchmark(tek.apply, settings)
+
+
+@pytest.mark.benchmark(group="set")
+def test_snapshot(benchmark, tek):
+    benchmark(tek.snapshot)
@@ -0,0 +1,20 @@
+"""Import and attach benchmarks"""
+import subprocess
+import sys
+import pytest
+from tekinstr.simulator import simulate
+
+# pylint: disable=missing-function-docstring
+@pytest.mark.benchmark(group="startup")
+@pytest.mark.parametrize("model", ["MDO3024", "MSO4104B", "TDS3064B"])
+def test_attach(benchmark, link, model):
+    benchmark(simulate, model, **link)
+
+
+@pytest.mark.benchmark(group="startup")
+@pytest.mark.parametrize("statement", ["pass", "import tekinstr"])
+def test_import(benchmark, statement):
+    command = [sys.executable, "-c", statement]
+    benchmark.pedantic(
+        subprocess.run, args=(command,), kwargs={"check": True}, rounds=5
+    )
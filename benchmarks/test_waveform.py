@@ -0,0 +1,48 @@
+"""Waveform transfer and acquisition benchmarks"""
+import numpy as np
+import pytest
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+RECORD_LENGTHS = [1000, 10000, 100000, 1000000, 10000000]
+
+
+@pytest.mark.benchmark(group="read")
+@pytest.mark.parametrize("record_length", RECORD_LENGTHS)
+@pytest.mark.parametrize("channels", ["CH1", "CH1:2", "CH1:4"])
+def test_read(benchmark, record_rate, tek, channels, record_length):
+    oscilloscope = tek.oscilloscope
+    oscilloscope.record_length = record_length
+    benchmark(oscilloscope.read, channels)
+    n_channels = {"CH1": 1, "CH1:2": 2, "CH1:4": 4}[channels]
+    record_rate("MB/s", n_channels * record_length / 1e6)
+
+
+@pytest.mark.benchmark(group="curve")
+@pytest.mark.parametrize("record_length", RECORD_LENGTHS)
+@pytest.mark.parametrize("width", [1, 2])
+def test_curve(benchmark, record_rate, tek, width, record_length):
+    # pylint: disable=protected-access
+    tek.oscilloscope.record_length = record_length
+    visa = tek._visa
+    visa.write(f"DATA:SOURCE CH1;START 1;STOP {record_length};WIDTH {width}")
+    datatype = "b" if width == 1 else "h"
+    benchmark(
+        visa.query_binary_values,
+        "CURVE?",
+        datatype,
+        is_big_endian=True,
+        container=np.ndarray,
+    )
+    record_rate("MB/s", width * record_length / 1e6)
+
+
+@pytest.mark.benchmark(group="capture")
+@pytest.mark.parametrize("record_length", [10000, 1000000])
+def test_single_capture(benchmark, record_rate, tek, record_length):
+    oscilloscope = tek.oscilloscope
+    oscilloscope.record_length = record_length
+    benchmark.pedantic(
+        oscilloscope.read, args=("CH1",), kwargs={"previous": False}, rounds=3
+    )
+    record_rate("captures/s", 1)
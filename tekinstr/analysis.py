@@ -0,0 +1,234 @@
+"""Measurements of downloaded waveforms
+
+The measurement types of MeasurementSlot made on the host, vectorized over
+waveforms of one or more channels or frames:
+>>> wf = tek.oscilloscope.read("CH1:4")
+>>> analysis.measure(wf, "frequency")  # one value per channel
+>>> analysis.measure_many(wf, ["amplitude", "rise", "pduty"])
+
+As on the instrument, high and low are the most common values above and below the
+middle of the waveform (or its maximum and minimum with method='minmax'), the
+reference levels are percentages of high - low and timing measurements are made
+on the first cycle. An edge crosses from the low to the high reference level,
+or back; its time is that of the crossing of the mid reference level. Values
+that can't be measured are NaN.
+"""
+import numpy as np
+
+# low, mid and high reference levels in percent
+REFERENCE = (10.0, 50.0, 90.0)
+
+HISTOGRAM_BINS = 256
+
+TYPES = (
+    "AMPLITUDE",
+    "FREQUENCY",
+    "PERIOD",
+    "RISE",
+    "FALL",
+    "PWIDTH",
+    "NWIDTH",
+    "PDUTY",
+    "NDUTY",
+    "POVERSHOOT",
+    "NOVERSHOOT",
+    "PK2PK",
+    "HIGH",
+    "LOW",
+    "MAXIMUM",
+    "MINIMUM",
+    "MEAN",
+    "RMS",
+)
+
+
+def _samples(waveform, dt):
+    """(2-D samples, shape of the results, sample interval)"""
+    x = np.asarray(waveform, dtype=float)
+    if x.ndim == 0 or x.shape[-1] < 2:
+        raise ValueError("a waveform needs at least 2 samples")
+    if dt is None:
+        dt = getattr(waveform, "dt", 1.0)
+    return x.reshape(-1, x.shape[-1]), x.shape[:-1], dt
+
+
+def _high_low(x, method):
+    x_min, x_max = x.min(axis=-1), x.max(axis=-1)
+    if method == "minmax":
+        return x_max, x_min
+    if method != "histogram":
+        raise ValueError(f"unknown method {method}")
+    n_rows, half = len(x), HISTOGRAM_BINS // 2
+    width = np.where(x_max > x_min, x_max - x_min, 1.0) / HISTOGRAM_BINS
+    bins = ((x - x_min[:, None]) / width[:, None]).astype(int)
+    bins = np.minimum(bins, HISTOGRAM_BINS - 1)
+    bins += HISTOGRAM_BINS * np.arange(n_rows)[:, None]
+    counts = np.bincount(bins.ravel(), minlength=n_rows * HISTOGRAM_BINS)
+    counts = counts.reshape(n_rows, HISTOGRAM_BINS)
+    high = half + counts[:, half:].argmax(axis=-1) + 0.5
+    low = counts[:, :half].argmax(axis=-1) + 0.5
+    return x_min + high * width, x_min + low * width
+
+
+def _last(mask):
+    """Index of the last True at or before each sample, -1 if none"""
+    index = np.where(mask, np.arange(mask.shape[-1]), -1)
+    return np.maximum.accumulate(index, axis=-1)
+
+
+def _nth(mask, n, after=None):
+    """Index of the nth True of each row after an index, -1 if none"""
+    if after is not None:
+        mask = mask & (np.arange(mask.shape[-1]) > after[:, None])
+    count = np.cumsum(mask, axis=-1)
+    return np.where(count[:, -1] >= n, (count >= n).argmax(axis=-1), -1)
+
+
+def _take(x, index):
+    return np.take_along_axis(x, np.clip(index, 0, x.shape[-1] - 1)[:, None], -1)[:, 0]
+
+
+def _crossing(x, index, level):
+    """Interpolated time in samples at which x crosses level between index and the
+    next sample, NaN for an index of -1
+    """
+    x0, x1 = _take(x, index), _take(x, index + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        time = index + (level - x0) / (x1 - x0)
+    return np.where(index >= 0, time, np.nan)
+
+
+class _Record:
+    """Levels and edges of 2-D samples, computed once for all measurements"""
+
+    def __init__(self, x, dt, method, reference):
+        self.x, self.dt = x, dt
+        self.high, self.low = _high_low(x, method)
+        amplitude = self.high - self.low
+        self.levels = [self.low + amplitude * r / 100 for r in reference]
+        self._edges = None
+
+    def edges(self):
+        """Sample index of each row's first rising and falling edges"""
+        if self._edges is None:
+            low, _, high = [level[:, None] for level in self.levels]
+            state = np.where(self.x >= high, 1, np.where(self.x <= low, 0, -1))
+            last = _last(state >= 0)
+            state = np.where(last >= 0, np.take_along_axis(state, last.clip(0), -1), -1)
+            rising = np.zeros_like(self.x, dtype=bool)
+            falling = np.zeros_like(rising)
+            rising[:, 1:] = (state[:, 1:] == 1) & (state[:, :-1] == 0)
+            falling[:, 1:] = (state[:, 1:] == 0) & (state[:, :-1] == 1)
+            self._edges = rising, falling
+        return self._edges
+
+    def mid_time(self, edge, rising):
+        """Time in samples of the mid reference crossing of edges"""
+        mid = self.levels[1][:, None]
+        last = _last(self.x < mid if rising else self.x > mid)
+        return _crossing(self.x, np.where(edge >= 0, _take(last, edge), -1), mid[:, 0])
+
+    def cycle(self, rising):
+        """Times in samples of the mid crossings of the first cycle starting with a
+        rising or falling edge: start, opposite edge, end
+        """
+        edges = self.edges()
+        first, opposite = edges if rising else edges[::-1]
+        start = _nth(first, 1)
+        middle = _nth(opposite, 1, start)
+        end = _nth(first, 2)
+        return (
+            self.mid_time(start, rising),
+            self.mid_time(np.where(start >= 0, middle, -1), not rising),
+            self.mid_time(end, rising),
+        )
+
+    def transition(self, rising):
+        """Time in samples from the low to the high reference level of the first
+        rising edge, or from high to low of the first falling edge
+        """
+        low, _, high = self.levels
+        edge = _nth(self.edges()[0 if rising else 1], 1)
+        start_level, end_level = (low, high) if rising else (high, low)
+        last = _last(self.x < low[:, None] if rising else self.x > high[:, None])
+        start = _crossing(
+            self.x, np.where(edge >= 0, _take(last, edge), -1), start_level
+        )
+        end = _crossing(self.x, np.where(edge >= 1, edge - 1, -1), end_level)
+        return end - start
+
+
+def _measure(record, measurement_type):
+    x, dt = record.x, record.dt
+    amplitude = record.high - record.low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if measurement_type in ("PERIOD", "FREQUENCY"):
+            start, _, end = record.cycle(rising=True)
+            period = (end - start) * dt
+            return period if measurement_type == "PERIOD" else 1 / period
+        if measurement_type in ("PWIDTH", "NWIDTH", "PDUTY", "NDUTY"):
+            start, middle, end = record.cycle(rising=measurement_type[0] == "P")
+            if measurement_type.endswith("WIDTH"):
+                return (middle - start) * dt
+            return 100 * (middle - start) / (end - start)
+        if measurement_type in ("RISE", "FALL"):
+            return record.transition(rising=measurement_type == "RISE") * dt
+        values = {
+            "AMPLITUDE": lambda: amplitude,
+            "HIGH": lambda: record.high,
+            "LOW": lambda: record.low,
+            "MAXIMUM": lambda: x.max(axis=-1),
+            "MINIMUM": lambda: x.min(axis=-1),
+            "PK2PK": lambda: np.ptp(x, axis=-1),
+            "MEAN": lambda: x.mean(axis=-1),
+            "RMS": lambda: np.sqrt(np.mean(x * x, axis=-1)),
+            "POVERSHOOT": lambda: 100 * (x.max(axis=-1) - record.high) / amplitude,
+            "NOVERSHOOT": lambda: 100 * (record.low - x.min(axis=-1)) / amplitude,
+        }
+        return values[measurement_type]()
+
+
+def measure_many(
+    waveform, measurement_types, dt=None, method="histogram", reference=REFERENCE
+):
+    """Make measurements of waveforms
+
+    Args:
+        waveform (WaveformDT or numpy.ndarray): samples in the last axis, e.g. as
+            returned by OscilloscopeBase.read for one or more channels
+        measurement_types (list): types of measurement, see TYPES
+        dt (float): sample interval; default waveform.dt or 1
+        method (str): high and low from the 'histogram' or 'minmax'
+        reference (tuple): low, mid and high reference levels in percent
+    Returns:
+        (dict): measurement type -> values, one per waveform
+    """
+    measurement_types = [t.upper() for t in measurement_types]
+    for measurement_type in measurement_types:
+        if measurement_type not in TYPES:
+            raise ValueError(f"unknown measurement type {measurement_type}")
+    x, shape, dt = _samples(waveform, dt)
+    record = _Record(x, dt, method, reference)
+    return {
+        t.lower(): np.asarray(_measure(record, t)).reshape(shape)
+        for t in measurement_types
+    }
+
+
+def measure(
+    waveform, measurement_type, dt=None, method="histogram", reference=REFERENCE
+):
+    """Make a measurement of waveforms
+
+    Args:
+        waveform (WaveformDT or numpy.ndarray): see measure_many
+        measurement_type (str): type of measurement; amplitude, frequency, etc.
+        dt (float): sample interval; default waveform.dt or 1
+        method (str): high and low from the 'histogram' or 'minmax'
+        reference (tuple): low, mid and high reference levels in percent
+    Returns:
+        (numpy.ndarray or float): one value per waveform
+    """
+    values = measure_many(waveform, [measurement_type], dt, method, reference)
+    value = values[measurement_type.lower()]
+    return value.item() if value.ndim == 0 else value
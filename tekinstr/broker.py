@@ -0,0 +1,313 @@
+"""Broker sharing one instrument session among processes
+
+The broker owns the session of a model and serves clients over a Unix socket or
+a localhost TCP port, which requires an authkey. Each client gets the usual object
+tree with connect:
+>>> broker = Broker(tek, ("localhost", 6000), authkey=b"lab").start()
+>>> tek = connect(("localhost", 6000), authkey=b"lab")  # in another process
+>>> tek.oscilloscope.ch1.scale
+
+Requests of all clients are serialized by the session lock and compound
+operations, such as validated setters, hold the broker's lock throughout.
+Writes are pipelined: the client doesn't wait for them, an error is raised by its
+next request instead and other clients see them once that request is answered.
+Setting queries are answered from a cache that any write of the session clears,
+including those of the process owning it, and read_latest shares waveform reads
+among clients.
+
+The broker can be run as a daemon:
+    python -m tekinstr.broker <ip address> --port 6000
+"""
+import argparse
+import os
+import secrets
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing.connection import Client, Listener, address_type
+from tekinstr.common import _get_idn
+from tekinstr.session import Session
+
+
+def _nodelay(connection):
+    """Send pipelined writes without waiting for the acknowledgement of the last"""
+    with socket.socket(fileno=socket.dup(connection.fileno())) as sock:
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class _Remote:
+    """Resource proxy forwarding calls to the broker"""
+
+    def __init__(self, connection):
+        self.__dict__["_connection"] = connection
+
+    def request(self, *request):
+        """Send a request and return its result"""
+        self._connection.send(request)
+        status, result = self._connection.recv()
+        if status == "error":
+            raise result
+        return result
+
+    def write(self, message):
+        """Send a write without waiting for it"""
+        self._connection.send(("write", message))
+
+    def query(self, message):
+        """Query the instrument"""
+        return self.request("query", message, False)
+
+    def query_setting(self, message):
+        """Query a setting, possibly answered from the broker's cache"""
+        return self.request("query", message, True)
+
+    def query_binary_values(self, message, *args, **kwargs):
+        """Query the instrument for binary values"""
+        return self.request("binary", message, args, kwargs)
+
+    def close(self):
+        """Close the connection to the broker"""
+        self._connection.close()
+
+    def __getattr__(self, name):
+        return self.request("getattr", name)
+
+    def __setattr__(self, name, value):
+        self.request("setattr", name, value)
+
+
+class BrokerSession(Session):
+    """Session of a client of the broker
+
+    Attributes:
+        resource (_Remote): connection to the broker
+    """
+
+    def __init__(self, resource):
+        super().__init__(resource)
+        self.__dict__["_depth"] = 0
+
+    def query(self, message, cache=False):
+        if cache and self._state is None and self._cache() is None:
+            return self._transact("query", self._resource.query_setting, message)
+        return super().query(message, cache)
+
+    @contextmanager
+    def locked(self):
+        """Hold the session lock and the broker's lock
+
+        Other clients wait until the outermost compound operation is done. The
+        broker takes its lock even when acquire raises the error of a pipelined
+        write, so it's released in any case.
+        """
+        with super().locked():
+            self.__dict__["_depth"] += 1
+            try:
+                if self._depth == 1:
+                    self._resource.request("acquire")
+                yield
+            finally:
+                self.__dict__["_depth"] -= 1
+                if self._depth == 0:
+                    self._resource.request("release")
+
+
+class Broker:
+    """Serve the session of a model to clients
+
+    Attributes:
+        tek (Model): the model, such as returned by CommChannel
+        address (str or tuple): path of a Unix socket or (host, port); None for a
+            temporary Unix socket
+        authkey (bytes): shared secret clients authenticate with; required for a
+            TCP address
+        cache (bool): answer setting queries from a cache that writes clear; only
+            valid while the front panel isn't being operated
+    """
+
+    def __init__(self, tek, address=None, authkey=None, cache=True):
+        # without an authkey, requests are unpickled without authentication
+        tcp = address is not None and address_type(address) == "AF_INET"
+        if tcp and authkey is None:
+            raise ValueError("a TCP address requires an authkey")
+        self._tek = tek
+        self._session = tek._visa  # pylint: disable=protected-access
+        self._listener = Listener(address, authkey=authkey)
+        if address_type(self.address) == "AF_UNIX" and self.address[0] != "\0":
+            os.chmod(self.address, 0o600)
+        self._settings = self._session.settings_cache() if cache else None
+        self._waveforms = {}
+
+    @property
+    def address(self):
+        """(str or tuple): address the broker listens on"""
+        return self._listener.address
+
+    def serve_forever(self):
+        """Accept clients until closed, each served in a thread"""
+        while True:
+            try:
+                connection = self._listener.accept()
+            except OSError:
+                break
+            _nodelay(connection)
+            threading.Thread(
+                target=self._serve, args=(connection,), daemon=True
+            ).start()
+
+    def start(self):
+        """Serve in a background thread
+
+        Returns:
+            (Broker): self
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def close(self):
+        """Stop accepting clients"""
+        self._listener.close()
+
+    def _serve(self, connection):
+        """Handle the requests of one client in order"""
+        # pylint: disable=protected-access
+        lock = self._session._lock
+        depth = 0
+        error = None
+        try:
+            while True:
+                try:
+                    request = connection.recv()
+                except (EOFError, OSError):
+                    break
+                op, args = request[0], request[1:]
+                if op == "write":
+                    if error is None:
+                        try:
+                            self._write(*args)
+                        except Exception as exc:  # pylint: disable=broad-except
+                            error = exc
+                    continue
+                if op in ("acquire", "release"):
+                    getattr(lock, op)()
+                    depth += 1 if op == "acquire" else -1
+                if error is not None:
+                    connection.send(("error", error))
+                    error = None
+                    continue
+                if op in ("acquire", "release"):
+                    connection.send(("ok", None))
+                    continue
+                try:
+                    result = getattr(self, "_" + op)(*args)
+                except Exception as exc:  # pylint: disable=broad-except
+                    connection.send(("error", exc))
+                else:
+                    connection.send(("ok", result))
+        finally:
+            for _ in range(depth):
+                lock.release()
+            connection.close()
+
+    def _write(self, message):
+        self._session.write(message)
+
+    def _query(self, message, setting):
+        if not setting or self._settings is None:
+            return self._session.query(message)
+        with self._session.locked():
+            try:
+                return self._settings[message]
+            except KeyError:
+                response = self._settings[message] = self._session.query(message)
+                return response
+
+    def _binary(self, message, args, kwargs):
+        return self._session.query_binary_values(message, *args, **kwargs)
+
+    def _getattr(self, name):
+        return getattr(self._session, name)
+
+    def _setattr(self, name, value):
+        setattr(self._session, name, value)
+
+    def _read(self, channels, max_age, kwargs):
+        key = (channels, tuple(sorted(kwargs.items())))
+        with self._session.locked():
+            if key in self._waveforms:
+                acquired, waveform = self._waveforms[key]
+                if time.monotonic() - acquired < max_age:
+                    return waveform
+            waveform = self._tek.oscilloscope.read(channels, **kwargs)
+            self._waveforms[key] = (time.monotonic(), waveform)
+            return waveform
+
+
+def connect(address, authkey=None):
+    """Connect to a broker
+
+    Args:
+        address (str or tuple): the broker's address
+        authkey (bytes): shared secret of the broker
+    Returns:
+        (Model subclass)
+    """
+    # pylint: disable=import-outside-toplevel
+    from tekinstr import MODEL_CLASS
+
+    connection = Client(address, authkey=authkey)
+    _nodelay(connection)
+    session = BrokerSession(_Remote(connection))
+    return MODEL_CLASS[_get_idn(session).model](session)
+
+
+def read_latest(tek, channels, max_age=0.1, **kwargs):
+    """Read waveforms through the broker, sharing the transfers among clients
+
+    The broker reads the waveforms unless it read them with the same arguments
+    less than max_age seconds ago.
+
+    Args:
+        tek (Model): model returned by connect
+        channels (str): see OscilloscopeBase.read
+        max_age (float): age in seconds of a waveform that is reused
+        kwargs: other arguments of OscilloscopeBase.read
+    Returns:
+        WaveformDT or numpy.ndarray
+    """
+    # pylint: disable=protected-access
+    return tek._visa.request("read", channels, max_age, kwargs)
+
+
+def main():
+    """Run a broker for the oscilloscope at an IP address"""
+    # pylint: disable=import-outside-toplevel
+    from tekinstr import CommChannel
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("ipaddress", help="oscilloscope's IP address or host name")
+    parser.add_argument("--host", default="localhost", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=6000)
+    parser.add_argument("--socket", help="listen on a Unix socket instead")
+    parser.add_argument(
+        "--authkey", help="shared secret of the clients; generated for a TCP port"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="don't cache settings")
+    args = parser.parse_args()
+    address = args.socket or (args.host, args.port)
+    authkey = args.authkey.encode() if args.authkey else None
+    if authkey is None and not args.socket:
+        authkey = secrets.token_hex(16).encode()
+        print(f"authkey: {authkey.decode()}")
+    with CommChannel(args.ipaddress) as tek:
+        broker = Broker(tek, address, authkey, cache=not args.no_cache)
+        try:
+            broker.serve_forever()
+        except KeyboardInterrupt:
+            broker.close()
+
+
+if __name__ == "__main__":
+    main()
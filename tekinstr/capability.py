@@ -0,0 +1,141 @@
+"""Capability rules for checking arguments before they are sent"""
+import math
+
+
+class Choice:
+    """Enumerated argument
+
+    Mnemonics are written in SCPI notation where the uppercase characters are the
+    short form, e.g. 'SAMple' accepts 'SAM' or 'SAMPLE' in any case.
+
+    Attributes:
+        mnemonics (str): allowed arguments
+    """
+
+    def __init__(self, *mnemonics):
+        self._choices = {}
+        for mnemonic in mnemonics:
+            long_form = mnemonic.upper()
+            short_form = "".join(c for c in mnemonic if not c.islower())
+            self._choices[long_form] = long_form
+            self._choices[short_form] = long_form
+
+    def __call__(self, value):
+        try:
+            return self._choices[str(value).upper()]
+        except KeyError:
+            choices = sorted(set(self._choices.values()))
+            raise ValueError(f"'{value}' not one of {choices}") from None
+
+
+class Range:
+    """Numeric argument within limits
+
+    Attributes:
+        minimum (float): lowest allowed value
+        maximum (float): highest allowed value
+        coerce (callable): int or float
+    """
+
+    def __init__(self, minimum, maximum, coerce=float):
+        self._minimum = minimum
+        self._maximum = maximum
+        self._coerce = coerce
+
+    @property
+    def minimum(self):
+        """(float): lowest allowed value"""
+        return self._minimum
+
+    @property
+    def maximum(self):
+        """(float): highest allowed value"""
+        return self._maximum
+
+    def __call__(self, value):
+        try:
+            number = float(value)
+            if self._coerce is int and not number.is_integer():
+                raise ValueError
+            number = self._coerce(number)
+        except (ValueError, OverflowError):
+            raise ValueError(f"{value} isn't a valid {self._coerce.__name__}") from None
+        if not self._minimum <= number <= self._maximum:
+            raise ValueError(f"{value} not in [{self._minimum}, {self._maximum}]")
+        return number
+
+
+class Discrete:
+    """Numeric argument from a set of values
+
+    Attributes:
+        values (list): allowed values
+        coerce (callable): int or float
+    """
+
+    def __init__(self, values, coerce=float):
+        self._values = [coerce(v) for v in values]
+        self._coerce = coerce
+
+    def __call__(self, value):
+        number = float(value)
+        for allowed in self._values:
+            if math.isclose(number, allowed):
+                return allowed
+        raise ValueError(f"{value} not one of {self._values}")
+
+
+class AnyOf:
+    """Argument that satisfies any of the rules, e.g. a number or 'INFInite'
+
+    Attributes:
+        rules (callable): Choice, Range or Discrete
+    """
+
+    def __init__(self, *rules):
+        self._rules = rules
+
+    def __call__(self, value):
+        messages = []
+        for rule in self._rules:
+            try:
+                return rule(value)
+            except ValueError as exc:
+                messages.append(str(exc))
+        raise ValueError(" and ".join(messages))
+
+
+POWERS_OF_2 = [2 ** n for n in range(1, 10)]
+
+MEASUREMENT_TYPES = Choice(
+    "AMPlitude",
+    "AREa",
+    "BURst",
+    "CARea",
+    "CMEan",
+    "CRMs",
+    "DELay",
+    "FALL",
+    "FREQuency",
+    "HIGH",
+    "LOW",
+    "MAXimum",
+    "MEAN",
+    "MINImum",
+    "NDUty",
+    "NEDGECount",
+    "NOVershoot",
+    "NPULSECount",
+    "NWIdth",
+    "PDUty",
+    "PEDGECount",
+    "PERIod",
+    "PHAse",
+    "PK2pk",
+    "POVershoot",
+    "PPULSECount",
+    "PWIdth",
+    "RISe",
+    "RMS",
+    "TOVershoot",
+)
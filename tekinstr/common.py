@@ -20,23 +20,41 @@ class CommandError(Exception):
 
 
 def validate(func):
-    """Read the Command Error bit (CME) of the Standard Event Status Register (SESR)"""
+    """Read the Command Error bit (CME) of the Standard Event Status Register (SESR)
+
+    While the session is deferring commands, the check is left to the sender.
+    """
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         # pylint: disable=protected-access
         cme = 32
         self = args[0]
-        self._visa.write("*CLS")
-        original_deser = int(self._visa.query("DESE?"))
-        self._visa.write(f"DESE {cme}")
-        result = func(*args, **kwargs)
-        if bool(int(self._visa.query("*ESR?")) & cme):
-            msg = self._visa.query("EVMSG?").strip().split(",")[1].strip('"')
+        with self._visa.locked():
+            if self._visa.deferring:
+                return func(*args, **kwargs)
+            self._visa.write("*CLS")
+            original_deser = int(self._visa.query("DESE?"))
+            self._visa.write(f"DESE {cme}")
+            result = func(*args, **kwargs)
+            if bool(int(self._visa.query("*ESR?")) & cme):
+                msg = self._visa.query("EVMSG?").strip().split(",")[1].strip('"')
+                self._visa.write(f"DESE {original_deser}")
+                raise self._visa.command_error(msg)
             self._visa.write(f"DESE {original_deser}")
-            raise CommandError(msg)
-        self._visa.write(f"DESE {original_deser}")
-        return result
+            return result
+
+    return wrapper
+
+
+def atomic(func):
+    """Hold the session lock so that no other thread's messages are interleaved"""
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        # pylint: disable=protected-access
+        with self._visa.locked():
+            return func(self, *args, **kwargs)
 
     return wrapper
 
@@ -52,7 +70,8 @@ class TekBase:
         self._visa = visa
 
     def __setattr__(self, name, value):
-        if hasattr(self, name) and isinstance(getattr(self, name), TekBase):
+        # subsystems are instance attributes; properties aren't read to find them
+        if isinstance(self.__dict__.get(name), TekBase):
             raise AttributeError(f"can't set '{name}'")
         if hasattr(self.__class__, name):
             prop = getattr(self.__class__, name)
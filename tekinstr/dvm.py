@@ -1,7 +1,36 @@
 """Base Digital Voltmeter (DVM) definition"""
-from tekinstr.common import validate
+import time
+from collections import namedtuple
+import numpy as np
+from tekinstr.scpi import ScpiProperty, INVALID, VOLATILE
 from tekinstr.instrument import Instrument
 
+# reading returned by DVMBase.read_all
+DVM_READOUT = np.dtype(
+    [
+        ("value", "f8"),
+        ("frequency", "f8"),
+        ("minimum", "f8"),
+        ("maximum", "f8"),
+        ("average", "f8"),
+    ]
+)
+
+DVMSampling = namedtuple("DVMSampling", ["samples", "rate", "duplicates"])
+DVMSampling.__doc__ = """Readings of DVMBase.sample
+
+Attributes:
+    samples (numpy.recarray): time, seconds since the epoch, and value of each
+        reading, and frequency if sampled
+    rate (float): readings per second achieved
+    duplicates (int): readings equal to the previous one, i.e. not yet updated
+"""
+
+
+def _float(value):
+    value = float(value)
+    return np.nan if value == INVALID else value
+
 
 class DVMBase(Instrument, kind="DVMBase"):
     """Digital voltmeter instrument
@@ -11,47 +40,92 @@ class DVMBase(Instrument, kind="DVMBase"):
         visa (pyvisa.resources.Resource): pyvisa resource
     """
 
-    @property
-    def mode(self):
-        """value (str): ACRMS, ACDCRMS, DC, Frequency or OFF"""
-        return self._visa.query("DVM:MODE?")
-
-    @mode.setter
-    @validate
-    def mode(self, value):
-        self._visa.write(f"DVM:MODE {value}")
-
-    @property
-    def source(self):
-        """value (str): CHx"""
-        return self._visa.query("DVM:SOURCE?")
-
-    @source.setter
-    @validate
-    def source(self, value):
-        self._visa.write(f"DVM:SOURCE {value}")
-
-    @property
-    def value(self):
-        """(float): measurement value"""
-        return float(self._visa.query("DVM:MEASUREMENT:VALUE?"))
-
-    @property
-    def min(self):
-        """(float): minimum measurement value"""
-        return float(self._visa.query("DVM:MEASUREMENT:HISTORY:MINIMUM?"))
-
-    @property
-    def max(self):
-        """(float): maximum measurement value"""
-        return float(self._visa.query("DVM:MEASUREMENT:HISTORY:MAXIMUM?"))
-
-    @property
-    def avg(self):
-        """(float): average measurement value"""
-        return float(self._visa.query("DVM:MEASUREMENT:HISTORY:AVERAGE?"))
-
-    @property
-    def frequency(self):
-        """(float): frequency"""
-        return float(self._visa.query("DVM:MEASUREMENT:FREQUENCY?"))
+    mode = ScpiProperty(
+        "DVM:MODE",
+        doc="value (str): ACRMS, ACDCRMS, DC, Frequency or OFF",
+    )
+
+    source = ScpiProperty(
+        "DVM:SOURCE",
+        doc="value (str): CHx",
+    )
+
+    value = ScpiProperty(
+        "DVM:MEASUREMENT:VALUE",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): measurement value",
+    )
+
+    min = ScpiProperty(
+        "DVM:MEASUREMENT:HISTORY:MINIMUM",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): minimum measurement value",
+    )
+
+    max = ScpiProperty(
+        "DVM:MEASUREMENT:HISTORY:MAXIMUM",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): maximum measurement value",
+    )
+
+    avg = ScpiProperty(
+        "DVM:MEASUREMENT:HISTORY:AVERAGE",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): average measurement value",
+    )
+
+    frequency = ScpiProperty(
+        "DVM:MEASUREMENT:FREQUENCY",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): frequency",
+    )
+
+    def read_all(self):
+        """Read every DVM quantity in one query
+
+        Quantities that can't be measured are NaN.
+
+        Returns:
+            (numpy.record): DVM_READOUT of value, frequency and the minimum,
+                maximum and average of the history
+        """
+        response = self._visa.query(
+            "DVM:MEASUREMENT:VALUE?;FREQUENCY?;HISTORY:MINIMUM?;MAXIMUM?;AVERAGE?"
+        )
+        values = tuple(_float(v) for v in response.split(";"))
+        return np.rec.array([values], DVM_READOUT)[0]
+
+    def sample(self, n_samples, frequency=False):
+        """Take readings as fast as the connection allows
+
+        The session is held throughout, one query per reading.
+
+        Args:
+            n_samples (int): number of readings
+            frequency (bool): also read the frequency with each value
+        Returns:
+            (DVMSampling): the readings, achieved rate and duplicate readings
+        """
+        query = "DVM:MEASUREMENT:VALUE?" + (";FREQUENCY?" if frequency else "")
+        names = ["time", "value"] + (["frequency"] if frequency else [])
+        data = np.empty((n_samples, len(names)))
+        with self._visa.locked():
+            start = time.perf_counter()
+            for row in data:
+                row[0] = time.time()
+                row[1:] = [_float(v) for v in self._visa.query(query).split(";")]
+            elapsed = time.perf_counter() - start
+        readings = data[:, 1:]
+        duplicates = int((readings[1:] == readings[:-1]).all(axis=1).sum())
+        samples = np.rec.fromarrays(data.T, names=names)
+        return DVMSampling(samples, n_samples / max(elapsed, 1e-9), duplicates)
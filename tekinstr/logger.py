@@ -0,0 +1,220 @@
+"""Time series logging of measurements
+
+Samples are appended to a binary file in chunks. The file starts with MAGIC, the
+length of the JSON schema as uint32 and the schema, {'columns': [...],
+'units': [...]}, followed by the chunks. A chunk is its number of samples n as
+uint32 followed by the n float64 values of each column in turn, so a file can be
+appended to by another logger with the same columns. A chunk cut short by a crash
+is ignored when read and removed before appending.
+>>> samples, units = read_log("dut1.log")
+>>> samples.time, samples.ch1_frequency
+"""
+import json
+import os
+import struct
+import threading
+import time
+import numpy as np
+from tekinstr.scpi import INVALID
+
+MAGIC = b"TEKLOG1\n"
+
+
+def _write_header(file, columns, units):
+    schema = json.dumps({"columns": columns, "units": units}).encode()
+    file.write(MAGIC + struct.pack("<I", len(schema)) + schema)
+
+
+def _read_header(file):
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{file.name} isn't a measurement log")
+    (length,) = struct.unpack("<I", file.read(4))
+    schema = json.loads(file.read(length))
+    return schema["columns"], schema["units"]
+
+
+def _chunks(file, n_columns):
+    """Read the chunks after the header up to the first incomplete one
+
+    Yields:
+        (tuple): (offset of the end of the chunk, data of the chunk)
+    """
+    while True:
+        header = file.read(4)
+        if len(header) < 4:
+            return
+        (n_samples,) = struct.unpack("<I", header)
+        data = np.frombuffer(file.read(8 * n_samples * n_columns), "<f8")
+        if len(data) < n_samples * n_columns:
+            return
+        yield file.tell(), data.reshape(n_columns, n_samples)
+
+
+def read_log(path):
+    """Read a measurement log
+
+    Args:
+        path (str): file written by MeasurementLogger
+    Returns:
+        (tuple): numpy.recarray with a time field, seconds since the epoch, and a
+            field per measurement; dict of the units of the fields
+    """
+    with open(path, "rb") as file:
+        columns, units = _read_header(file)
+        chunks = [data for _, data in _chunks(file, len(columns))]
+    data = np.concatenate(chunks, axis=1) if chunks else np.zeros((len(columns), 0))
+    samples = np.rec.fromarrays(data, names=columns)
+    return samples, dict(zip(columns, units))
+
+
+class MeasurementLogger:
+    """Log the values of the active measurements at a target rate in a thread
+
+    The samples are kept in a ring buffer of capacity samples and each chunk of
+    samples is appended to the file as soon as it's complete, the rest when the
+    logger is closed. Samples that are due while the previous one is still being
+    read are skipped and counted as overruns.
+
+    Attributes:
+        measurement (Measurement)
+        path (str): file the samples are appended to
+        rate (float): target samples per second
+        dvm (DVMBase): also log the DVM value as column dvm
+        chunk (int): samples written to the file at a time
+        capacity (int): samples kept in memory
+        columns (list): time and the names of the measurements
+        units (list): units of the columns
+        n_samples (int): samples taken since the start
+        overruns (int): samples skipped because the rate couldn't be kept
+    """
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self, measurement, path, rate=10, dvm=None, chunk=1000, capacity=10000
+    ):
+        if capacity < chunk:
+            raise ValueError("capacity must be at least chunk")
+        readout = measurement.read_all()
+        queries = [f":MEASUREMENT:MEAS{slot}:VALUE?" for slot in readout.slot]
+        self.columns = ["time"] + list(readout.name)
+        self.units = ["s"] + list(readout.unit)
+        if dvm is not None:
+            mode = dvm.mode.upper()
+            queries.append(":DVM:MEASUREMENT:VALUE?")
+            self.columns.append("dvm")
+            self.units.append("Hz" if mode.startswith("FREQ") else "V")
+        if len(self.columns) == 1:
+            raise ValueError("No active measurements")
+        self._visa = measurement._visa  # pylint: disable=protected-access
+        self._query = ";".join(queries)
+        self._path = path
+        self._period = 1 / rate
+        self._chunk = chunk
+        self._buffer = np.zeros((len(self.columns), capacity))
+        self._lock = threading.Lock()
+        self._file = self._open(path)
+        self._flushed = 0
+        self.n_samples = 0
+        self.overruns = 0
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        """(bool): the logging thread is running"""
+        return self._thread.is_alive()
+
+    def _open(self, path):
+        """Open the file for appending, checking the columns of an existing one
+
+        A chunk cut short at the end of the file is removed, or the chunks
+        appended after it would be read as its data.
+        """
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "r+b") as file:
+                columns, _ = _read_header(file)
+                if columns != self.columns:
+                    raise ValueError(f"{path} has the columns {columns}")
+                end = file.tell()
+                for end, _ in _chunks(file, len(columns)):
+                    pass
+                file.truncate(end)
+            return open(path, "ab")  # pylint: disable=consider-using-with
+        file = open(path, "wb")  # pylint: disable=consider-using-with
+        _write_header(file, self.columns, self.units)
+        return file
+
+    def _run(self):
+        deadline = time.monotonic()
+        try:
+            while not self._stop.wait(max(deadline - time.monotonic(), 0)):
+                timestamp = time.time()
+                values = [float(v) for v in self._visa.query(self._query).split(";")]
+                self._append([timestamp] + values)
+                deadline += self._period
+                now = time.monotonic()
+                if deadline < now:
+                    skipped = int((now - deadline) / self._period) + 1
+                    self.overruns += skipped
+                    deadline += skipped * self._period
+                if self.n_samples - self._flushed >= self._chunk:
+                    self._flush(self._chunk)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._error = exc
+        finally:
+            try:
+                self._flush(self.n_samples - self._flushed)
+            finally:
+                self._file.close()
+
+    def _append(self, values):
+        values = np.asarray(values)
+        values[values == INVALID] = np.nan
+        with self._lock:
+            self._buffer[:, self.n_samples % self._buffer.shape[1]] = values
+            self.n_samples += 1
+
+    def _flush(self, n_samples):
+        """Append the next n_samples to the file"""
+        if n_samples <= 0:
+            return
+        indices = np.arange(self._flushed, self._flushed + n_samples)
+        with self._lock:
+            data = self._buffer[:, indices % self._buffer.shape[1]]
+        self._file.write(struct.pack("<I", n_samples) + data.astype("<f8").tobytes())
+        self._file.flush()
+        self._flushed += n_samples
+
+    def recent(self):
+        """Get the samples kept in memory
+
+        Returns:
+            (numpy.recarray): a copy with a field per column
+        """
+        if self._error is not None:
+            raise self._error
+        capacity = self._buffer.shape[1]
+        with self._lock:
+            first = max(self.n_samples - capacity, 0)
+            indices = np.arange(first, self.n_samples) % capacity
+            data = self._buffer[:, indices]
+        return np.rec.fromarrays(data, names=self.columns)
+
+    def close(self):
+        """Stop logging and write the remaining samples"""
+        self._stop.set()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<MeasurementLogger of {', '.join(self.columns[1:])} to {self._path}>"
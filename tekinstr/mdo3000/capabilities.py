@@ -0,0 +1,35 @@
+"""MDO3000 Series argument capabilities"""
+from tekinstr.capability import (
+    Choice,
+    Range,
+    Discrete,
+    AnyOf,
+    POWERS_OF_2,
+    MEASUREMENT_TYPES,
+)
+
+CAPABILITIES = {
+    "HORIZONTAL:RECORDLENGTH": Discrete([1e3, 1e4, 1e5, 1e6, 5e6, 1e7], int),
+    "ACQUIRE:MODE": Choice("SAMple", "PEAKdetect", "HIRes", "AVErage", "ENVelope"),
+    "ACQUIRE:NUMAVG": Discrete(POWERS_OF_2, int),
+    "ACQUIRE:NUMENV": AnyOf(Range(1, 2000, int), Choice("INFInite")),
+    "CH{ch}:COUPLING": Choice("AC", "DC"),
+    "CH{ch}:TER": Discrete([50, 75, 1e6]),
+    "TRIGGER:A:MODE": Choice("AUTO", "NORMal"),
+    "TRIGGER:{designation}:EDGE:COUPLING": Choice(
+        "AC", "DC", "HFRej", "LFRej", "NOISErej"
+    ),
+    "TRIGGER:{designation}:EDGE:SLOPE": Choice("RISe", "FALL", "EITHer"),
+    "TRIGGER:A:LOGIC:FUNCTION": Choice("AND", "NANd", "NOR", "OR"),
+    "TRIGGER:A:LOGIC:INPUT:CH{ch}": Choice("HIGH", "LOW", "X"),
+    "TRIGGER:A:LOGIC:INPUT:CLOCK:EDGE": Choice("RISe", "FALL"),
+    "DVM:MODE": Choice("ACRMS", "ACDCRMS", "DC", "FREQuency", "OFF"),
+    "RF:FREQUENCY": Range(0, 3e9),
+    "RF:SPAN": Range(1e3, 3e9),
+    "RF:RBW:MODE": Choice("AUTO", "MANual"),
+    "RF:WINDOW": Choice(
+        "RECTangular", "HAMming", "HANning", "BLAckmanharris", "KAIser", "FLATtop"
+    ),
+    "MEASUREMENT:MEAS{slot}:TYPE": MEASUREMENT_TYPES,
+    "MEASUREMENT:IMMED:TYPE": MEASUREMENT_TYPES,
+}
@@ -1,11 +1,12 @@
 """MDO3000 Series Oscilloscope"""
 import re
 from tekinstr.model import Model
+from tekinstr.mdo3000.capabilities import CAPABILITIES
 from tekinstr.mdo3000.oscilloscope import Oscilloscope
 from tekinstr.mdo3000.dvm import DVM
 from tekinstr.mdo3000.spectrum_analyzer import SpectrumAnalyzer
 from tekinstr.mdo3000.filesysystem import FileSystem
-from tekinstr.common import validate
+from tekinstr.common import validate, atomic
 
 
 class MDO3000(Model):
@@ -15,6 +16,9 @@ class MDO3000(Model):
         resource (pyvisa.resources.Resource): pyvisa resource
     """
 
+    _capabilities = CAPABILITIES
+    _measurement_stats = True
+
     def __init__(self, visa):
         super().__init__(visa)
         features = self._get_configuration()
@@ -57,6 +61,7 @@ class MDO3000(Model):
             configuration[feature] = value
         return configuration
 
+    @atomic
     def _get_select(self):
         """Get the current display selection"""
         original_header_state = self._visa.query("HEADER?")
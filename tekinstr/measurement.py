@@ -1,7 +1,29 @@
 """Measurement subsystem"""
+import numpy as np
 from unyt import unyt_quantity
-from tekinstr.common import validate
+from tekinstr.common import atomic
+from tekinstr.scpi import ScpiProperty, INVALID, VOLATILE, unquote
 from tekinstr.instrument import InstrumentSubsystem
+from tekinstr.logger import MeasurementLogger
+
+# (model, firmware version) -> measurement statistics are available, as probed
+_probed_stats = {}
+
+# record of a measurement returned by Measurement.read_all
+READOUT = np.dtype(
+    [
+        ("slot", "i1"),
+        ("name", "U32"),
+        ("source", "U8"),
+        ("type", "U16"),
+        ("unit", "U16"),
+        ("value", "f8"),
+        ("average", "f8"),
+        ("minimum", "f8"),
+        ("maximum", "f8"),
+        ("stddev", "f8"),
+    ]
+)
 
 
 class Measurement(InstrumentSubsystem, kind="Measurement"):
@@ -15,11 +37,18 @@ class Measurement(InstrumentSubsystem, kind="Measurement"):
     def __init__(self, owner, n_slots):
         super().__init__(owner)
         self._n_slots = n_slots
-        self._has_stats = self._has_stats_hw()
+        self._has_stats = self._instr._measurement_stats
+        if self._has_stats is None:
+            key = (self._instr.model, self._instr.firmware_version)
+            if key not in _probed_stats:
+                _probed_stats[key] = self._has_stats_hw()
+            self._has_stats = _probed_stats[key]
         self._slots = [MeasurementSlot(self, i) for i in range(1, n_slots + 1)]
         self._initialize()
 
+    @atomic
     def _has_stats_hw(self):
+        """Probe for measurement statistics when the model doesn't tell"""
         original_deser = int(self._visa.query("DESE?"))
         self._visa.write("DESE 16")  # check only for EXE bit
         self._visa.write("*CLS")
@@ -30,16 +59,33 @@ class Measurement(InstrumentSubsystem, kind="Measurement"):
         self._visa.write(f"DESE {original_deser}")
         return event_code == 0
 
+    def _query_slots(self, queries):
+        """Query every slot in one compound query
+
+        Args:
+            queries (list): queries relative to MEASUREMENT:MEASx:
+        Returns:
+            (list): responses to the queries of each slot
+        """
+        q_str = ";".join(queries)
+        slots = range(1, self._n_slots + 1)
+        response = self._visa.query(
+            ";".join(f":MEASUREMENT:MEAS{i}:{q_str}" for i in slots)
+        )
+        fields, n = response.split(";"), len(queries)
+        return [fields[i : i + n] for i in range(0, len(fields), n)]
+
+    @atomic
     def _initialize(self):
-        for i in range(1, self._n_slots + 1):
-            q_str = f"MEASUREMENT:MEAS{i}:"
-            state = self._visa.query(q_str + "STATE?")
+        responses = self._query_slots(["STATE?", "SOURCE?", "TYPE?"])
+        for measurement, (state, source, measurement_type) in zip(
+            self._slots, responses
+        ):
             if state in ["1", "ON"]:
-                source = self._visa.query(q_str + "SOURCE?").lower()
-                measurement_type = self._visa.query(q_str + "TYPE?").lower()
-                measurement = self._slots[i - 1]
-                setattr(self, source + "_" + measurement_type, measurement)
+                name = source.lower() + "_" + measurement_type.lower()
+                setattr(self, name, measurement)
 
+    @atomic
     def add(self, source, measurement_type):
         """Add a measurement
 
@@ -47,8 +93,8 @@ class Measurement(InstrumentSubsystem, kind="Measurement"):
             source (str): source channel; CHx
             measurement_type (str): type of measurement; amplitude, frequency, etc.
         """
-        for slot in self._slots:
-            if slot.state in ["0", "OFF"]:
+        for slot, (state,) in zip(self._slots, self._query_slots(["STATE?"])):
+            if state in ["0", "OFF"]:
                 measurement = slot
                 break
         else:
@@ -58,6 +104,7 @@ class Measurement(InstrumentSubsystem, kind="Measurement"):
         measurement.state = "ON"
         setattr(self, source + "_" + measurement_type, measurement)
 
+    @atomic
     def remove(self, name):
         """Remove a measurement
 
@@ -70,6 +117,115 @@ class Measurement(InstrumentSubsystem, kind="Measurement"):
         measurement.state = "OFF"
         delattr(self, name)
 
+    def read_all(self):
+        """Read every active measurement in one query
+
+        Values that can't be measured and statistics that the oscilloscope doesn't
+        have are NaN.
+
+        Returns:
+            (numpy.recarray): READOUT records of the active slots
+        """
+        queries = ["STATE?", "SOURCE?", "TYPE?", "UNITS?", "VALUE?"]
+        if self._has_stats:
+            queries += ["MEAN?", "MINIMUM?", "MAXIMUM?", "STDDEV?"]
+        records = []
+        for i, response in enumerate(self._query_slots(queries)):
+            state, source, measurement_type, unit, *values = response
+            if state not in ["1", "ON"]:
+                continue
+            values = [float(v) for v in values]
+            values = [np.nan if v == INVALID else v for v in values]
+            values += [np.nan] * (5 - len(values))
+            name = source.lower() + "_" + measurement_type.lower()
+            records.append(
+                (i + 1, name, source, measurement_type, unquote(unit), *values)
+            )
+        return np.array(records, READOUT).view(np.recarray)
+
+    def logger(self, path, rate=10, dvm=None, chunk=1000, capacity=10000):
+        """Log the values of the active measurements in a thread
+
+        The values of all active slots, and of the DVM, are read with one query
+        per sample. The samples are kept in a ring buffer and appended to the file
+        in chunks, see tekinstr.logger.read_log.
+        >>> with tek.oscilloscope.measurement.logger("dut1.log", dvm=tek.dvm) as log:
+        ...     time.sleep(3600)
+        ...     recent = log.recent()
+
+        Args:
+            path (str): file the samples are appended to
+            rate (float): target samples per second
+            dvm (DVMBase): also log the DVM value
+            chunk (int): samples written to the file at a time
+            capacity (int): samples kept in memory, at least chunk
+        Returns:
+            (MeasurementLogger)
+        """
+        # pylint: disable=too-many-arguments
+        return MeasurementLogger(self, path, rate, dvm, chunk, capacity)
+
+    def immediate(self, source, measurement_type):
+        """Make a measurement of the current acquisition without using a slot
+
+        Args:
+            source (str): source channel; CHx
+            measurement_type (str): type of measurement; amplitude, frequency, etc.
+        Returns:
+            (unyt_quantity): NaN if it can't be measured
+        """
+        readout = self.immediate_many([(source, measurement_type)])
+        return unyt_quantity(readout.value[0], readout.unit[0])
+
+    @atomic
+    def immediate_many(self, measurements, batch_size=16):
+        """Make measurements of the current acquisition without using slots
+
+        The source and type of each measurement are set and its value queried in
+        one compound query per batch of measurements, which ends with *ESR? so
+        that an error of the instrument is raised.
+
+        Args:
+            measurements (list): (source, measurement type) pairs
+            batch_size (int): measurements per query
+        Returns:
+            (numpy.recarray): READOUT records with slot 0 and NaN statistics
+        Raises:
+            ValueError: unknown measurement type
+            CommandError: command or execution error
+        """
+        # pylint: disable=protected-access
+        rule = self._instr._capabilities.get("MEASUREMENT:IMMED:TYPE", str.upper)
+        try:
+            measurements = [(source.upper(), rule(t)) for source, t in measurements]
+        except ValueError as exc:
+            raise ValueError(f"invalid measurement_type: {exc}") from None
+        records = []
+        for start in range(0, len(measurements), batch_size):
+            batch = measurements[start : start + batch_size]
+            units = [
+                f":MEASUREMENT:IMMED:SOURCE {source};TYPE {measurement_type};"
+                "VALUE?;UNITS?"
+                for source, measurement_type in batch
+            ]
+            fields = self._visa.query_checked(units)
+            for (source, measurement_type), value, unit in zip(
+                batch, fields[::2], fields[1::2]
+            ):
+                value = float(value)
+                records.append(
+                    (
+                        0,
+                        source.lower() + "_" + measurement_type.lower(),
+                        source,
+                        measurement_type,
+                        unquote(unit),
+                        np.nan if value == INVALID else value,
+                        *[np.nan] * 4,
+                    )
+                )
+        return np.array(records, READOUT).view(np.recarray)
+
 
 class MeasurementSlot(InstrumentSubsystem, kind="MeasurementSlot"):
     """A measurement slot
@@ -84,80 +240,72 @@ class MeasurementSlot(InstrumentSubsystem, kind="MeasurementSlot"):
         self._slot = slot
         self._has_stats = owner._has_stats
 
-    @property
-    def source(self):
-        """value (str): source channel; CHx"""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:SOURCE?"
-        return self._visa.query(q_str)
-
-    @source.setter
-    @validate
-    def source(self, value):
-        cmd_str = f"MEASUREMENT:MEAS{self._slot}:SOURCE {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def measurement_type(self):
-        """value (str): measurement type; amplitude, frequency, etc."""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:TYPE?"
-        return self._visa.query(q_str)
-
-    @measurement_type.setter
-    @validate
-    def measurement_type(self, value):
-        cmd_str = f"MEASUREMENT:MEAS{self._slot}:TYPE {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def state(self):
-        """value (str): {ON, OFF}"""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:STATE?"
-        return self._visa.query(q_str)
-
-    @state.setter
-    @validate
-    def state(self, value):
-        cmd_str = f"MEASUREMENT:MEAS{self._slot}:STATE {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def value(self):
-        """(float): measurement value"""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:VALUE?"
-        return float(self._visa.query(q_str))
-
-    @property
-    def min(self):
-        """(float): minimum measurement value"""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:MINIMUM?"
-        return float(self._visa.query(q_str))
-
-    @property
-    def max(self):
-        """(float): maximum measurement value"""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:MAXIMUM?"
-        return float(self._visa.query(q_str))
-
-    @property
-    def avg(self):
-        """(float): average measurement value"""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:MEAN?"
-        return float(self._visa.query(q_str))
-
-    @property
-    def stddev(self):
-        """(float): standard deviation of measurement"""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:STDDEV?"
-        return float(self._visa.query(q_str))
-
-    @property
-    def unit(self):
-        """(str): unit of measurement"""
-        q_str = f"MEASUREMENT:MEAS{self._slot}:UNITS?"
-        return self._visa.query(q_str).strip('"')
+    source = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:SOURCE",
+        doc="value (str): source channel; CHx",
+    )
+
+    measurement_type = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:TYPE",
+        doc="value (str): measurement type; amplitude, frequency, etc.",
+    )
+
+    state = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:STATE",
+        doc="value (str): {ON, OFF}",
+    )
+
+    value = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:VALUE",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): measurement value",
+    )
+
+    min = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:MINIMUM",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): minimum measurement value",
+    )
+
+    max = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:MAXIMUM",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): maximum measurement value",
+    )
+
+    avg = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:MEAN",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): average measurement value",
+    )
+
+    stddev = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:STDDEV",
+        float,
+        readonly=True,
+        cache=VOLATILE,
+        doc="(float): standard deviation of measurement",
+    )
+
+    unit = ScpiProperty(
+        "MEASUREMENT:MEAS{slot}:UNITS",
+        unquote,
+        readonly=True,
+        doc="(str): unit of measurement",
+    )
 
     def __repr__(self):
-        return str(unyt_quantity(self.value, self.unit))
+        q_str = f"MEASUREMENT:MEAS{self._slot}:"
+        value, unit = self._visa.query(q_str + "VALUE?;UNITS?").split(";")
+        return str(unyt_quantity(float(value), unquote(unit)))
 
     def __dir__(self):
         attrs = super().__dir__()
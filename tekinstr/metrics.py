@@ -0,0 +1,239 @@
+"""Runtime metrics of sessions for monitoring long running acquisitions"""
+import time
+import threading
+from bisect import bisect_left
+from itertools import accumulate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# upper bounds in seconds
+LATENCY_BUCKETS = (
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+KINDS = ("write", "query", "binary")
+
+
+class Histogram:
+    """Distribution of observed values in buckets
+
+    Attributes:
+        buckets (tuple): increasing upper bounds of the buckets
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Add a value"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        """(int): number of observed values"""
+        return sum(self.counts)
+
+    def cumulative(self):
+        """Cumulative counts
+
+        Returns:
+            (dict): upper bound -> number of values less than or equal to it
+        """
+        bounds = self.buckets + (float("inf"),)
+        return dict(zip(bounds, accumulate(self.counts)))
+
+    def __repr__(self):
+        return f"<Histogram of {self.count} values>"
+
+
+class Metrics:
+    """Counters of the transactions, errors and acquisitions of a session
+
+    Lock wait is the time threads waited for the session lock held by another thread.
+
+    Attributes:
+        labels (dict): identify the instrument, e.g. {'model': 'MDO3024'}
+    """
+
+    def __init__(self, labels=None):
+        self.labels = dict(labels or {})
+        self.transactions = dict.fromkeys(KINDS, 0)
+        self.bytes = dict.fromkeys(KINDS, 0)
+        self.latency = {kind: Histogram() for kind in KINDS}
+        self.timeouts = 0
+        self.command_errors = 0
+        self.dead_time = Histogram()
+        self.lock_wait = Histogram()
+        self._start = time.monotonic()
+        self._last = (self._start, 0, 0)
+
+    def record(self, kind, n_bytes, duration):
+        """Record a transaction
+
+        Args:
+            kind (str): 'write', 'query' or 'binary'
+            n_bytes (int): bytes written and read
+            duration (float): wall time in seconds
+        """
+        self.transactions[kind] += 1
+        self.bytes[kind] += n_bytes
+        self.latency[kind].observe(duration)
+
+    def record_acquisition(self, dead_time):
+        """Record a waveform read
+
+        Args:
+            dead_time (float): seconds the acquisition was held stopped
+        """
+        self.dead_time.observe(dead_time)
+
+    def snapshot(self):
+        """Get the metrics
+
+        The rates are averages since the previous snapshot.
+
+        Returns:
+            (dict)
+        """
+        now = time.monotonic()
+        count, n_bytes = sum(self.transactions.values()), sum(self.bytes.values())
+        last, last_count, last_bytes = self._last
+        self._last = (now, count, n_bytes)
+        interval = max(now - last, 1e-9)
+        return {
+            "labels": dict(self.labels),
+            "uptime": now - self._start,
+            "transactions": dict(self.transactions),
+            "transactions_per_second": (count - last_count) / interval,
+            "bytes": dict(self.bytes),
+            "bytes_per_second": (n_bytes - last_bytes) / interval,
+            "latency": {k: _summary(h) for k, h in self.latency.items()},
+            "timeouts": self.timeouts,
+            "command_errors": self.command_errors,
+            "acquisitions": self.dead_time.count,
+            "dead_time": _summary(self.dead_time),
+            "lock_wait": _summary(self.lock_wait),
+        }
+
+    def __repr__(self):
+        return f"<Metrics of {sum(self.transactions.values())} transactions>"
+
+
+def _summary(histogram):
+    return {
+        "count": histogram.count,
+        "sum": histogram.sum,
+        "buckets": histogram.cumulative(),
+    }
+
+
+def _labels(labels):
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def _value(value):
+    return "+Inf" if value == float("inf") else repr(value)
+
+
+def exposition(metrics):
+    """Format metrics in the Prometheus text exposition format
+
+    Args:
+        metrics (list): Metrics of one or more sessions
+    Returns:
+        (str)
+    """
+    families = [
+        ("transactions_total", "counter", "writes and queries sent"),
+        ("transferred_bytes_total", "counter", "bytes written and read"),
+        ("transaction_duration_seconds", "histogram", "transaction latency"),
+        ("timeouts_total", "counter", "VISA timeouts"),
+        ("command_errors_total", "counter", "command and execution errors"),
+        ("acquisition_dead_time_seconds", "histogram", "acquisition held stopped"),
+        ("lock_wait_seconds", "histogram", "wait for the session lock"),
+    ]
+    samples = {name: [] for name, _, _ in families}
+    for metric in metrics:
+        for kind in KINDS:
+            labels = {**metric.labels, "kind": kind}
+            samples["transactions_total"].append((labels, metric.transactions[kind]))
+            samples["transferred_bytes_total"].append((labels, metric.bytes[kind]))
+            samples["transaction_duration_seconds"].append(
+                (labels, metric.latency[kind])
+            )
+        samples["timeouts_total"].append((metric.labels, metric.timeouts))
+        samples["command_errors_total"].append((metric.labels, metric.command_errors))
+        samples["acquisition_dead_time_seconds"].append(
+            (metric.labels, metric.dead_time)
+        )
+        samples["lock_wait_seconds"].append((metric.labels, metric.lock_wait))
+    lines = []
+    for family, kind, doc in families:
+        name = "tekinstr_" + family
+        lines.append(f"# HELP {name} {doc}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples[family]:
+            if kind == "counter":
+                lines.append(f"{name}{{{_labels(labels)}}} {value}")
+                continue
+            for bound, count in value.cumulative().items():
+                bucket = _labels({**labels, "le": _value(bound)})
+                lines.append(f"{name}_bucket{{{bucket}}} {count}")
+            lines.append(f"{name}_sum{{{_labels(labels)}}} {value.sum!r}")
+            lines.append(f"{name}_count{{{_labels(labels)}}} {value.count}")
+    return "\n".join(lines) + "\n"
+
+
+def serve(models, port=9464, address="127.0.0.1"):
+    """Serve the metrics of models at http://address:port/metrics in a thread
+
+    >>> server = serve([tek])
+    >>> server.shutdown()
+
+    Args:
+        models (list): Model or Metrics objects; metrics are collected for models
+        port (int): TCP port, 0 for any free port
+        address (str): interface to listen on
+    Returns:
+        (http.server.ThreadingHTTPServer): see server_address
+    """
+    metrics = [m if isinstance(m, Metrics) else m.collect_metrics() for m in models]
+
+    class Handler(BaseHTTPRequestHandler):
+        """Respond to GET /metrics"""
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """Send the exposition"""
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = exposition(metrics).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+    server = ThreadingHTTPServer((address, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
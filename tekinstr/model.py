@@ -1,7 +1,21 @@
 """Model base class"""
 from datetime import datetime
 import numpy as np
-from tekinstr.common import TekBase, _get_idn
+from tekinstr.common import TekBase, _get_idn, atomic
+from tekinstr.state import InstrumentState
+from tekinstr.session import Session
+
+
+def _assign(obj, settings):
+    """Set the attributes of obj and its subsystems from nested settings"""
+    for name, value in settings.items():
+        if isinstance(value, dict):
+            subsystem = getattr(obj, name, None)
+            if not isinstance(subsystem, TekBase):
+                raise ValueError(f"'{name}' is not a subsystem of {obj}")
+            _assign(subsystem, value)
+        else:
+            setattr(obj, name, value)
 
 
 class Model(TekBase):
@@ -11,12 +25,18 @@ class Model(TekBase):
         visa (pyvisa.resources.Resource): pyvisa resource
     """
 
+    # header template -> rule, see capability
+    _capabilities = {}
+
+    # measurement statistics are available; None to probe the instrument
+    _measurement_stats = None
+
     def __init__(self, visa):
-        super().__init__(visa)
+        super().__init__(visa if isinstance(visa, Session) else Session(visa))
         self._visa.write("HEADER OFF")
         self._visa.write("DESE 255")
         self._visa.write("VERBOSE ON")
-        self._idn = _get_idn(visa)
+        self._idn = _get_idn(self._visa)
 
     @property
     def model(self):
@@ -33,6 +53,7 @@ class Model(TekBase):
         """(str): the firmware version"""
         return self._idn.firmware_version
 
+    @atomic
     def lock_frontpanel(self, message=None):
         """Lock the front panel controls
 
@@ -46,6 +67,7 @@ class Model(TekBase):
             self._visa.write("MESSAGE:BOX 0, 0")
             self._visa.write("MESSAGE:STATE ON")
 
+    @atomic
     def unlock_frontpanel(self):
         """Unlock the front panel controls and clear message box if displayed"""
         self._visa.write("UNLOCK ALL")
@@ -61,6 +83,80 @@ class Model(TekBase):
         self._visa.write(f"DATE '{datetime.now().strftime('%Y-%m-%d')}'")
         self._visa.write(f"TIME '{datetime.now().strftime('%H:%M:%S')}'")
 
+    def snapshot(self):
+        """Get the instrument settings with a single SET? query
+
+        Returns:
+            (InstrumentState)
+        """
+        return InstrumentState(self._visa.query("SET?"))
+
+    def restore(self, state):
+        """Restore the instrument settings in a single write
+
+        Args:
+            state (InstrumentState or str): state returned by snapshot
+        """
+        # the setup includes HEADER and VERBOSE, which this package relies on
+        self._visa.write(f"{state};:HEADER OFF;:VERBOSE ON")
+
+    @atomic
+    def apply(self, settings):
+        """Apply settings, sending only those that differ from the current state
+
+        The current state is read with a single SET? query and the changes are sent
+        as one error-checked program message.
+
+        Args:
+            settings (dict): nested settings mirroring the object tree, e.g.
+                {'oscilloscope': {'ch1': {'scale': 0.5}, 'trigger': {'level': 1}}}
+        Returns:
+            (list): commands sent
+        """
+        state = self.snapshot()
+        with self._visa.defer(state) as commands:
+            _assign(self, settings)
+        changes = [cmd for cmd in commands if not state.matches(cmd)]
+        if changes:
+            self._visa.write_checked(changes)
+        return changes
+
+    def cached(self):
+        """Context manager that caches setting queries until the next write
+
+        Only valid while the front panel isn't being operated.
+        >>> with tek.cached():
+        ...     scale = tek.oscilloscope.ch1.scale  # queried
+        ...     scale = tek.oscilloscope.ch1.scale  # from cache
+        """
+        return self._visa.caching()
+
+    def trace(self, maxlen=10000):
+        """Context manager that records the transactions with the instrument
+
+        >>> with tek.trace() as trace:
+        ...     position = tek.oscilloscope.horizontal_position
+        >>> print(trace)  # count, time and bytes per command and per property
+
+        Args:
+            maxlen (int): number of transactions kept, None for all
+        """
+        return self._visa.tracing(maxlen)
+
+    def collect_metrics(self):
+        """Collect runtime metrics of the session from now on
+
+        Metrics are pulled with snapshot or served for Prometheus with
+        tekinstr.metrics.serve.
+        >>> metrics = tek.collect_metrics()
+        >>> metrics.snapshot()["transactions_per_second"]
+
+        Returns:
+            (Metrics): labeled with the model and serial number
+        """
+        labels = {"model": self.model, "serial": self.serial_number}
+        return self._visa.collect_metrics(labels)
+
     @property
     def time(self):
         """Get date and time"""
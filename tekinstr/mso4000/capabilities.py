@@ -0,0 +1,28 @@
+"""MSO4000 Series argument capabilities"""
+from tekinstr.capability import (
+    Choice,
+    Range,
+    Discrete,
+    AnyOf,
+    POWERS_OF_2,
+    MEASUREMENT_TYPES,
+)
+
+CAPABILITIES = {
+    "HORIZONTAL:RECORDLENGTH": Discrete([1e3, 1e4, 1e5, 1e6, 1e7], int),
+    "ACQUIRE:MODE": Choice("SAMple", "PEAKdetect", "HIRes", "AVErage", "ENVelope"),
+    "ACQUIRE:NUMAVG": Discrete(POWERS_OF_2, int),
+    "ACQUIRE:NUMENV": AnyOf(Range(1, 2000, int), Choice("INFInite")),
+    "CH{ch}:COUPLING": Choice("AC", "DC"),
+    "CH{ch}:TER": Discrete([50, 1e6]),
+    "TRIGGER:A:MODE": Choice("AUTO", "NORMal"),
+    "TRIGGER:{designation}:EDGE:COUPLING": Choice(
+        "AC", "DC", "HFRej", "LFRej", "NOISErej"
+    ),
+    "TRIGGER:{designation}:EDGE:SLOPE": Choice("RISe", "FALL", "EITHer"),
+    "TRIGGER:A:LOGIC:FUNCTION": Choice("AND", "NANd", "NOR", "OR"),
+    "TRIGGER:A:LOGIC:INPUT:CH{ch}": Choice("HIGH", "LOW", "X"),
+    "TRIGGER:A:LOGIC:INPUT:CLOCK:EDGE": Choice("RISe", "FALL"),
+    "MEASUREMENT:MEAS{slot}:TYPE": MEASUREMENT_TYPES,
+    "MEASUREMENT:IMMED:TYPE": MEASUREMENT_TYPES,
+}
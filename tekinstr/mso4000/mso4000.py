@@ -1,8 +1,9 @@
 """MSO4000B Series Oscilloscope"""
 import re
 from tekinstr.model import Model
+from tekinstr.mso4000.capabilities import CAPABILITIES
 from tekinstr.mso4000.oscilloscope import Oscilloscope
-from tekinstr.common import validate
+from tekinstr.common import validate, atomic
 from tekinstr.mso4000.filesystem import FileSystem
 
 # pylint: disable=invalid-name
@@ -13,6 +14,9 @@ class MSO4000(Model):
         resource (pyvisa.resources.Resource): pyvisa resource
     """
 
+    _capabilities = CAPABILITIES
+    _measurement_stats = True
+
     def __init__(self, visa):
         super().__init__(visa)
         # features = self._get_configuration()
@@ -50,6 +54,7 @@ class MSO4000(Model):
     #         configuration[feature] = value
     #     return configuration
 
+    @atomic
     def _get_select(self):
         """Get the current display selection"""
         original_header_state = self._visa.query("HEADER?")
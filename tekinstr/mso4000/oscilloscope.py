@@ -1,5 +1,6 @@
 """Oscilloscope instrument definition"""
 from tekinstr.common import validate
+from tekinstr.scpi import ScpiProperty, float_or_str
 from tekinstr.oscilloscope import (
     OscilloscopeBase,
     ChannelBase,
@@ -27,22 +28,23 @@ class Oscilloscope(OscilloscopeBase, kind="Oscilloscope"):
         self.measurement = Measurement(self, 4)
         self.math = MathChannelBase(self)
 
-    @property
-    def sample_rate(self):
-        """(float): sample rate in hertz
+    sample_rate = ScpiProperty(
+        "HORIZONTAL:SAMPLERATE",
+        float,
+        readonly=True,
+        doc="""(float): sample rate in hertz
         The oscilloscope always acquires at this maximum rate and the displayed
         waveform is decimated according to the time per division setting.
-        """
-        return float(self._visa.query("HORIZONTAL:SAMPLERATE?"))
+        """,
+    )
 
-    @property
-    def record_length(self):
-        """value (int): 1e3, 1e4, 1e5, 1e6, 5e6, 1e7 samples"""
-        return int(self._visa.query("HORIZONTAL:RECORDLENGTH?"))
-
-    @record_length.setter
-    def record_length(self, value):
-        self._visa.write(f"HORIZONTAL:RECORDLENGTH {int(value)}")
+    record_length = ScpiProperty(
+        "HORIZONTAL:RECORDLENGTH",
+        int,
+        int,
+        check=False,
+        doc="value (int): 1e3, 1e4, 1e5, 1e6, 5e6, 1e7 samples",
+    )
 
     @property
     def horizontal_delay_mode(self):
@@ -81,18 +83,13 @@ class Oscilloscope(OscilloscopeBase, kind="Oscilloscope"):
         else:
             self._visa.write(f"HORIZONTAL:DELAY:TIME {value}")
 
-    @property
-    def acquisition_mode(self):
-        """value (str): SAMPLE, PEAKDETECT, HIRES, AVERAGE, ENVELOPE
+    acquisition_mode = ScpiProperty(
+        "ACQUIRE:MODE",
+        doc="""value (str): SAMPLE, PEAKDETECT, HIRES, AVERAGE, ENVELOPE
         AVERAGE - specify num_averages
         ENVELOPE - specify num_envelopes
-        """
-        return self._visa.query("ACQUIRE:MODE?")
-
-    @acquisition_mode.setter
-    @validate
-    def acquisition_mode(self, value):
-        self._visa.write(f"ACQUIRE:MODE {value}")
+        """,
+    )
 
     def _get_wfmpre(self, inout=""):
         return super()._get_wfmpre("OUT")
@@ -125,25 +122,17 @@ class Channel(ChannelBase, kind="CH"):
     def label(self, value):
         self._visa.write(f"CH{self._ch}:LABEL '{value}'")
 
-    @property
-    def coupling(self):
-        """value (str): channel coupling AC or DC"""
-        return self._visa.query(f"CH{self._ch}:COUPLING?")
+    coupling = ScpiProperty(
+        "CH{ch}:COUPLING",
+        doc="value (str): channel coupling AC or DC",
+    )
 
-    @coupling.setter
-    @validate
-    def coupling(self, value):
-        self._visa.write(f"CH{self._ch}:COUPLING {value}")
-
-    @property
-    def termination(self):
-        """value (float): channel termination in ohms, (1e6, 50, 75) Ω"""
-        return float(self._visa.query(f"CH{self._ch}:TER?"))
-
-    @termination.setter
-    @validate
-    def termination(self, value):
-        self._visa.write(f"CH{self._ch}:TER {float(value)}")
+    termination = ScpiProperty(
+        "CH{ch}:TER",
+        float,
+        float,
+        doc="value (float): channel termination in ohms, (1e6, 50, 75) Ω",
+    )
 
     @property
     def bandwidth(self):
@@ -164,52 +153,25 @@ class Channel(ChannelBase, kind="CH"):
             bandwidth = value
         self._visa.write(f"CH{self._ch}:BANDWIDTH {bandwidth}")
 
-    @property
-    def trigger_level(self):
-        """value (float or str): A-trigger threshold level, {voltage, ECL, TTL}
+    trigger_level = ScpiProperty(
+        "TRIGGER:A:LEVEL:CH{ch}",
+        float_or_str,
+        doc="""value (float or str): A-trigger threshold level, {voltage, ECL, TTL}
         float: level in volts
         str: ECL (-1.3 V) or TTL (1.4 V)
-        """
-        level = self._visa.query(f"TRIGGER:A:LEVEL:CH{self._ch}?")
-        try:
-            level = float(level)
-        except ValueError:
-            pass
-        return level
+        """,
+    )
 
-    @trigger_level.setter
-    @validate
-    def trigger_level(self, value):
-        self._visa.write(f"TRIGGER:A:LEVEL:CH{self._ch} {value}")
+    logic_input = ScpiProperty(
+        "TRIGGER:A:LOGIC:INPUT:CH{ch}",
+        doc="value (str): input condition for logic triggering, {HIGH, LOW, X}",
+    )
 
-    @property
-    def logic_input(self):
-        """value (str): input condition for logic triggering, {HIGH, LOW, X}"""
-        q_str = f"TRIGGER:A:LOGIC:INPUT:CH{self._ch}?"
-        return self._visa.query(q_str)
-
-    @logic_input.setter
-    @validate
-    def logic_input(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:INPUT:CH{self._ch} {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def logic_threshold(self):
-        """value (float or str): A-trigger logic threshold, {voltage, ECL, TTL}"""
-        q_str = f"TRIGGER:A:LOGIC:THRESHOLD:CH{self._ch}?"
-        threshold = self._visa.query(q_str)
-        try:
-            threshold = float(threshold)
-        except ValueError:
-            pass
-        return threshold
-
-    @logic_threshold.setter
-    @validate
-    def logic_threshold(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:THRESHOLD:CH{self._ch} {value}"
-        self._visa.write(cmd_str)
+    logic_threshold = ScpiProperty(
+        "TRIGGER:A:LOGIC:THRESHOLD:CH{ch}",
+        float_or_str,
+        doc="value (float or str): A-trigger logic threshold, {voltage, ECL, TTL}",
+    )
 
 
 class MeasurementSlot:
@@ -313,19 +275,19 @@ class Probe(ProbeBase, kind="Probe"):
         """(str): probe model"""
         return self._visa.query(f"CH{self._ch}:PROBE:MODEL?").strip('"')
 
-    @property
-    def gain(self):
-        """value (float): probe gain factor (output/input)"""
-        return float(self._visa.query(f"CH{self._ch}:PROBE:GAIN?"))
-
-    @gain.setter
-    def gain(self, value):
-        self._visa.write(f"CH{self._ch}:PROBE:GAIN {value}")
-
-    @property
-    def impedance(self):
-        """value (float): probe impedance in ohms"""
-        return float(self._visa.query(f"CH{self._ch}:PROBE:RESISTANCE?"))
+    gain = ScpiProperty(
+        "CH{ch}:PROBE:GAIN",
+        float,
+        check=False,
+        doc="value (float): probe gain factor (output/input)",
+    )
+
+    impedance = ScpiProperty(
+        "CH{ch}:PROBE:RESISTANCE",
+        float,
+        readonly=True,
+        doc="value (float): probe impedance in ohms",
+    )
 
     def __repr__(self):
         owner = self._owner.__repr__().strip("<>")
@@ -2,6 +2,7 @@
 from tekinstr.instrument import InstrumentSubsystem
 from tekinstr.trigger import TriggerBase
 from tekinstr.common import validate
+from tekinstr.scpi import ScpiProperty, float_or_str
 
 
 class Trigger(TriggerBase, kind="Trigger"):
@@ -39,35 +40,20 @@ class EdgeTrigger(InstrumentSubsystem, kind="Edge"):
         super().__init__(owner)
         self._designation = owner._designation
 
-    @property
-    def coupling(self):
-        """value (str): {AC, DC, HFRej, LFRej, NOISErej}"""
-        return self._visa.query(f"TRIGGER:{self._designation}:EDGE:COUPLING?")
+    coupling = ScpiProperty(
+        "TRIGGER:{designation}:EDGE:COUPLING",
+        doc="value (str): {AC, DC, HFRej, LFRej, NOISErej}",
+    )
 
-    @coupling.setter
-    @validate
-    def coupling(self, value):
-        self._visa.write(f"TRIGGER:{self._designation}:EDGE:COUPLING {value}")
+    slope = ScpiProperty(
+        "TRIGGER:{designation}:EDGE:SLOPE",
+        doc="value (str): trigger on slope, {RISE, FALL, EITHER}",
+    )
 
-    @property
-    def slope(self):
-        """value (str): trigger on slope, {RISE, FALL, EITHER}"""
-        return self._visa.query(f"TRIGGER:{self._designation}:EDGE:SLOPE?")
-
-    @slope.setter
-    @validate
-    def slope(self, value):
-        self._visa.write(f"TRIGGER:{self._designation}:EDGE:SLOPE {value}")
-
-    @property
-    def source(self):
-        """value (str): trigger source, {AUX, CHx, Dx, LINE, RF}"""
-        return self._visa.query(f"TRIGGER:{self._designation}:EDGE:SOURCE?")
-
-    @source.setter
-    @validate
-    def source(self, value):
-        self._visa.write(f"TRIGGER:{self._designation}:EDGE:SOURCE {value}")
+    source = ScpiProperty(
+        "TRIGGER:{designation}:EDGE:SOURCE",
+        doc="value (str): trigger source, {AUX, CHx, Dx, LINE, RF}",
+    )
 
 
 class LogicTrigger(InstrumentSubsystem, kind="Logic"):
@@ -87,17 +73,10 @@ class LogicTrigger(InstrumentSubsystem, kind="Logic"):
         self.clock = LogicClock(self)
         self.pattern = LogicPattern(self)
 
-    @property
-    def function(self):
-        """value (str): {AND, NAND, NOR, OR}"""
-        q_str = f"TRIGGER:A:LOGIC:FUNCTION?"
-        return self._visa.query(q_str)
-
-    @function.setter
-    @validate
-    def function(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:FUNCTION {value}"
-        self._visa.write(cmd_str)
+    function = ScpiProperty(
+        "TRIGGER:A:LOGIC:FUNCTION",
+        doc="value (str): {AND, NAND, NOR, OR}",
+    )
 
     def __dir__(self):
         attrs = super().__dir__()
@@ -123,34 +102,16 @@ class LogicInputChannel(InstrumentSubsystem, kind="LogicInput"):
     def __repr__(self):
         return f"<{self._designation} trigger: {self._kind}>"
 
-    @property
-    def state(self):
-        """value (str): input condition, {HIGH, LOW, X}"""
-        q_str = f"TRIGGER:A:LOGIC:INPUT:CH{self._ch}?"
-        return self._visa.query(q_str)
+    state = ScpiProperty(
+        "TRIGGER:A:LOGIC:INPUT:CH{ch}",
+        doc="value (str): input condition, {HIGH, LOW, X}",
+    )
 
-    @state.setter
-    @validate
-    def state(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:INPUT:CH{self._ch} {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def threshold(self):
-        """value (float or str): {voltage, ECL, TTL}"""
-        q_str = f"TRIGGER:A:LOGIC:THRESHOLD:CH{self._ch}?"
-        value = self._visa.query(q_str)
-        try:
-            value = float(value)
-        except ValueError:
-            pass
-        return value
-
-    @threshold.setter
-    @validate
-    def threshold(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:THRESHOLD:CH{self._ch} {value}"
-        self._visa.write(cmd_str)
+    threshold = ScpiProperty(
+        "TRIGGER:A:LOGIC:THRESHOLD:CH{ch}",
+        float_or_str,
+        doc="value (float or str): {voltage, ECL, TTL}",
+    )
 
 
 class LogicClock(InstrumentSubsystem, kind="LogicClock"):
@@ -180,17 +141,10 @@ class LogicClock(InstrumentSubsystem, kind="LogicClock"):
         cmd_str = f"TRIGGER:A:LOGIC:INPUT:CLOCK:SOURCE {value}"
         self._visa.write(cmd_str)
 
-    @property
-    def edge(self):
-        """value (str): {RISE, FALL}"""
-        q_str = "TRIGGER:A:LOGIC:INPUT:CLOCK:EDGE?"
-        return self._visa.query(q_str)
-
-    @edge.setter
-    @validate
-    def edge(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:INPUT:CLOCK:EDGE {value}"
-        self._visa.write(cmd_str)
+    edge = ScpiProperty(
+        "TRIGGER:A:LOGIC:INPUT:CLOCK:EDGE",
+        doc="value (str): {RISE, FALL}",
+    )
 
 
 class LogicPattern(InstrumentSubsystem, kind="Logic Pattern"):
@@ -200,29 +154,16 @@ class LogicPattern(InstrumentSubsystem, kind="Logic Pattern"):
         owner (Instrument)
     """
 
-    @property
-    def when(self):
-        """value (str): {TRUE, FALSE, LESSTHAN, MORETHAN, EQUAL, UNEQUAL}"""
-        q_str = "TRIGGER:A:LOGIC:PATTERN:WHEN?"
-        return self._visa.query(q_str)
-
-    @when.setter
-    @validate
-    def when(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:PATTERN:WHEN {value}"
-        self._visa.write(cmd_str)
+    when = ScpiProperty(
+        "TRIGGER:A:LOGIC:PATTERN:WHEN",
+        doc="value (str): {TRUE, FALSE, LESSTHAN, MORETHAN, EQUAL, UNEQUAL}",
+    )
 
-    @property
-    def deltatime(self):
-        """value (float): trigger delta time in seconds"""
-        q_str = "TRIGGER:A:LOGIC:PATTERN:DELTATIME?"
-        return float(self._visa.query(q_str))
-
-    @deltatime.setter
-    @validate
-    def deltatime(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:PATTERN:DELTATIME {value}"
-        self._visa.write(cmd_str)
+    deltatime = ScpiProperty(
+        "TRIGGER:A:LOGIC:PATTERN:DELTATIME",
+        float,
+        doc="value (float): trigger delta time in seconds",
+    )
 
 
 class SetHoldTrigger(InstrumentSubsystem, kind="SetHold"):
@@ -1,5 +1,6 @@
 """Oscilloscope base class"""
 import re
+from time import perf_counter
 from datetime import datetime, timedelta
 import sys
 import asyncio
@@ -8,7 +9,9 @@ from dataclasses import dataclass
 import numpy as np
 import pyvisa
 from tekinstr.instrument import Instrument, InstrumentSubsystem
-from tekinstr.common import validate
+from tekinstr.common import validate, atomic
+from tekinstr.scpi import ScpiProperty, VOLATILE, unquote, quote
+from tekinstr.stream import Stream, Roll
 from waveformDT.waveform import WaveformDT
 
 # pylint: disable=invalid-name
@@ -19,6 +22,25 @@ class State:
     running: bool = False
 
 
+def _parse_channels(channels):
+    """Convert a specification such as 'CH1:3' to a list such as ['CH1', 'CH2', 'CH3']"""
+    chs = []
+    match = re.match("^CH(?P<first>[1-4])(?P<last>:[1-4])?|(MATH)$", channels)
+    if match is None:
+        raise ValueError(f"{channels} not a valid specification")
+    if match.groups()[2] is not None:
+        return [channels]
+    first = int(match.group("first"))
+    last = match.group("last")
+    if last is None:
+        last = first
+    else:
+        last = int(last[-1])
+    for ch in range(first, last + 1):
+        chs.append(f"CH{ch}")
+    return chs
+
+
 class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
     """Oscilloscope base class
 
@@ -30,15 +52,12 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
         super().__init__(instr)
         self._state = State()
 
-    @property
-    def horizontal_scale(self):
-        """value (float): amount of time per division coerced to nearest setting"""
-        return float(self._visa.query("HORIZONTAL:SCALE?"))
-
-    @horizontal_scale.setter
-    @validate
-    def horizontal_scale(self, value):
-        self._visa.write(f"HORIZONTAL:SCALE {float(value)}")
+    horizontal_scale = ScpiProperty(
+        "HORIZONTAL:SCALE",
+        float,
+        float,
+        doc="value (float): amount of time per division coerced to nearest setting",
+    )
 
     @property
     def horizontal_delay_mode(self):
@@ -77,69 +96,48 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
         else:
             self._visa.write(f"HORIZONTAL:DELAY:TIME {float(value)}")
 
-    @property
-    def record_length(self):
-        """value (int): 500 or 10000 samples"""
-        return int(self._visa.query("HORIZONTAL:RECORDLENGTH?"))
-
-    @record_length.setter
-    @validate
-    def record_length(self, value):
-        self._visa.write(f"HORIZONTAL:RECORDLENGTH {int(value)}")
+    record_length = ScpiProperty(
+        "HORIZONTAL:RECORDLENGTH", int, int, doc="value (int): 500 or 10000 samples"
+    )
 
-    @property
-    def acquisition_mode(self):
-        """value (str): acquisition mode; SAMPLE, PEAKDETECT, AVERAGE, ENVELOPE
+    acquisition_mode = ScpiProperty(
+        "ACQUIRE:MODE",
+        doc="""value (str): acquisition mode; SAMPLE, PEAKDETECT, AVERAGE, ENVELOPE
         AVERAGE - specify num_averages
         ENVELOPE - specify num_envelopes
-        """
-        return self._visa.query("ACQUIRE:MODE?")
-
-    @acquisition_mode.setter
-    @validate
-    def acquisition_mode(self, value):
-        self._visa.write(f"ACQUIRE:MODE {value}")
+        """,
+    )
 
-    @property
-    def acquisition_count(self):
-        """(int): number of acquisitions since setting acquisition_state to RUN
+    acquisition_count = ScpiProperty(
+        "ACQUIRE:NUMACQ",
+        int,
+        readonly=True,
+        cache=VOLATILE,
+        doc="""(int): number of acquisitions since setting acquisition_state to RUN
 
         This value is reset to zero when any acquisition, horizontal or vertical
         arguments that affect the waveform are changed.
-        """
-        return int(self._visa.query("ACQUIRE:NUMACQ?"))
+        """,
+    )
 
-    @property
-    def num_averages(self):
-        """value (int): number of waveforms to average
+    num_averages = ScpiProperty(
+        "ACQUIRE:NUMAVG",
+        int,
+        doc="""value (int): number of waveforms to average
         The range of values is 2 to 512 in powers of 2.
-        """
-        return int(self._visa.query("ACQUIRE:NUMAVG?"))
-
-    @num_averages.setter
-    @validate
-    def num_averages(self, value):
-        self._visa.write(f"ACQUIRE:NUMAVG {value}")
+        """,
+    )
 
-    @property
-    def num_envelopes(self):
-        """value (int or str): number of envelopes from 1 to 2000 or INFINITE"""
-        return self._visa.query("ACQUIRE:NUMENV?")
-
-    @num_envelopes.setter
-    @validate
-    def num_envelopes(self, value):
-        self._visa.write(f"ACQUIRE:NUMENV {value}")
+    num_envelopes = ScpiProperty(
+        "ACQUIRE:NUMENV",
+        doc="value (int or str): number of envelopes from 1 to 2000 or INFINITE",
+    )
 
-    @property
-    def acquisition_state(self):
-        """value (str): start or stop acquisition; RUN (1) or STOP (0)"""
-        return self._visa.query("ACQUIRE:STATE?")
-
-    @acquisition_state.setter
-    @validate
-    def acquisition_state(self, value):
-        self._visa.write(f"ACQUIRE:STATE {value}")
+    acquisition_state = ScpiProperty(
+        "ACQUIRE:STATE",
+        cache=VOLATILE,
+        doc="value (str): start or stop acquisition; RUN (1) or STOP (0)",
+    )
 
     @property
     def single_acquisition(self):
@@ -157,6 +155,7 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
         self._visa.write(f"ACQUIRE:STOPAFTER {stop_after}")
         stop_after = self._visa.query("ACQUIRE:STOPAFTER?")
 
+    @atomic
     def _get_wfmpre(self, inout=""):
         """Get waveform preamble
 
@@ -180,6 +179,25 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
         self._visa.write("HEADER OFF")
         return preamble
 
+    def _set_data(self, samples):
+        """Set the range and the 8-bit binary encoding of the transferred samples
+
+        Args:
+            samples ('all', int or tuple): see read
+        """
+        if isinstance(samples, tuple):
+            start, stop = samples
+        elif isinstance(samples, int):
+            start = 1
+            stop = samples
+        else:
+            start = 1
+            stop = self.record_length
+        self._visa.write(f"DATA:START {start}")
+        self._visa.write(f"DATA:STOP {stop}")
+        self._visa.write("DATA:WIDTH 1")
+        self._visa.write("DATA:ENCDG RIBinary")
+
     async def _show_spinner(self):
         """Show an in-progress spinner during acquisition"""
         spinner = itertools.cycle(["-", "/", "|", "\\"])
@@ -195,6 +213,16 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
         finally:
             sys.stdout.write("\b \b")
 
+    def _read_stb(self):
+        """Read the status byte, counting a timeout as transactions do"""
+        try:
+            return self._visa.stb
+        except pyvisa.VisaIOError as exc:
+            # the status byte isn't read through a session transaction
+            if exc.abbreviation == "VI_ERROR_TMO" and self._visa.metrics is not None:
+                self._visa.metrics.timeouts += 1
+            raise
+
     async def _acquire(self):
         """Acquire single sequence"""
         try:
@@ -205,7 +233,7 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
             self.single_acquisition = True
             self._visa.write("ACQUIRE:STATE RUN; *OPC")
             # poll the ESB bit for an event occurance indicating completion or error
-            while not self._visa.stb & 32:
+            while not self._read_stb() & 32:
                 await asyncio.sleep(1)
             esr = int(self._visa.query("*ESR?"))
             op_complete = bool(esr & 1)
@@ -237,6 +265,7 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
         else:
             return ret_value
 
+    @atomic
     def read(self, channels, samples="all", timeout=10, wdt=True, previous=True):
         """Transfer waveform data of the specified channel(s) from the oscilloscope
 
@@ -257,36 +286,11 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
         Returns:
             WaveformDT or numpy.ndarray
         """
-        chs = []
-        match = re.match("^CH(?P<first>[1-4])(?P<last>:[1-4])?|(MATH)$", channels)
-        if match is None:
-            raise ValueError(f"{channels} not a valid specification")
-        if match.groups()[2] is not None:
-            channels = [channels]
-        else:
-            first = int(match.group("first"))
-            last = match.group("last")
-            if last is None:
-                last = first
-            else:
-                last = int(last[-1])
-            for ch in range(first, last + 1):
-                chs.append(f"CH{ch}")
-            channels = chs
-        if isinstance(samples, tuple):
-            start, stop = samples
-        elif isinstance(samples, int):
-            start = 1
-            stop = samples
-        else:
-            start = 1
-            stop = self.record_length
-        self._visa.write(f"DATA:START {start}")
-        self._visa.write(f"DATA:STOP {stop}")
-        self._visa.write("DATA:WIDTH 1")
-        self._visa.write("DATA:ENCDG RIBinary")
+        channels = _parse_channels(channels)
+        self._set_data(samples)
         original_state = self.acquisition_state
         self._visa.write("ACQUIRE:STATE STOP")
+        stopped = perf_counter()
         if not previous:
             ret_value = asyncio.run(self._start_task(timeout))
             if ret_value is None:
@@ -310,6 +314,8 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
             )
             data.append(y_offset + y_multiplier * (rawdata - y_position))
         self.acquisition_state = original_state
+        if self._visa.metrics is not None:
+            self._visa.metrics.record_acquisition(perf_counter() - stopped)
         data = data[0] if len(data) == 1 else np.asarray(data)
         if wdt:
             time = [int(n) for n in time.strip().strip('"').split(":")]
@@ -324,14 +330,62 @@ class OscilloscopeBase(Instrument, kind="OscilloscopeBase"):
             setattr(data, "y_offset", y_offset)
         return data
 
+    # pylint: disable=too-many-arguments
+    def stream(
+        self, channels, samples="all", maxsize=8, policy="block", timeout=10, wdt=True
+    ):
+        """Stream the waveforms of continuous acquisitions
+
+        The acquisition keeps running and the latest acquisition is transferred
+        whenever the acquisition count has advanced.
+        >>> with tek.oscilloscope.stream("CH1:2", policy="drop") as stream:
+        ...     for sequence, wf in stream:
+        ...         print(sequence, stream.missed)
+
+        Args:
+            channels (str): specification such as 'CH1' or 'CH1:4'
+            samples ('all', int or tuple): see read
+            maxsize (int): number of waveforms queued for the consumer
+            policy (str): when the queue is full, 'block' waits for the consumer and
+                'drop' discards the oldest waveform
+            timeout (float): seconds to wait for an acquisition, None for no timeout
+            wdt (bool): If true, yield data as WaveformDT.
+        Returns:
+            (Stream): iterator and async iterator of (sequence number, waveform)
+        """
+        channels = _parse_channels(channels)
+        return Stream(self, channels, samples, maxsize, policy, timeout, wdt=wdt)
+
+    def roll(self, channels, scale=0.1, capacity=1000000, interval=0.1):
+        """Record a gapless time series of slow signals in roll mode
+
+        Only the samples acquired since the previous read are transferred. The
+        settings are restored when the Roll is closed.
+        >>> with tek.oscilloscope.roll("CH1", scale=1, interval=1) as roll:
+        ...     time.sleep(3600)
+        ...     wf = roll.series()
+
+        Args:
+            channels (str): specification such as 'CH1' or 'CH1:4'
+            scale (float): time base in s/div; roll mode requires 40 ms/div or slower
+            capacity (int): samples kept per channel, taking 8 bytes each
+            interval (float): seconds between reads, well below the time span of
+                the record
+        Returns:
+            (Roll): see series
+        """
+        return Roll(self, _parse_channels(channels), scale, capacity, interval)
+
     def force_trigger(self):
         """Force a trigger event"""
         self._visa.write("TRIGGER FORCE")
 
-    @property
-    def trigger_state(self):
-        """(str): ARMED, AUTO, READY, SAVE, TRIGGER"""
-        return self._visa.query("TRIGGER:STATE?")
+    trigger_state = ScpiProperty(
+        "TRIGGER:STATE",
+        readonly=True,
+        cache=VOLATILE,
+        doc="(str): ARMED, AUTO, READY, SAVE, TRIGGER",
+    )
 
 
 class ChannelBase(InstrumentSubsystem, kind="ChannelBase"):
@@ -346,68 +400,46 @@ class ChannelBase(InstrumentSubsystem, kind="ChannelBase"):
         super().__init__(owner)
         self._ch = CHx
 
-    @property
-    def bandwidth(self):
-        """value (str): TWENTY, ONEFIFTY or FULL"""
-        return self._visa.query(f"CH{self._ch}:BANDWIDTH?")
-
-    @bandwidth.setter
-    def bandwidth(self, value):
-        self._visa.write(f"CH{self._ch}:BANDWIDTH {value}")
-
-    @property
-    def coupling(self):
-        """value (str): AC, DC or GND"""
-        return self._visa.query(f"CH{self._ch}:COUPLING?")
-
-    @coupling.setter
-    def coupling(self, value):
-        self._visa.write(f"CH{self._ch}:COUPLING {value}")
-
-    @property
-    def invert(self):
-        """value (str): ON (1) or OFF (0)"""
-        return self._visa.query(f"CH{self._ch}:INVERT?")
-
-    @invert.setter
-    def invert(self, value):
-        self._visa.write(f"CH{self._ch}:INVERT {value}")
-
-    @property
-    def offset(self):
-        """value (float): value subtracted from the signal before acquisition"""
-        return float(self._visa.query(f"CH{self._ch}:OFFSET?"))
-
-    @offset.setter
-    def offset(self, value):
-        self._visa.write(f"CH{self._ch}:OFFSET {value}")
-
-    @property
-    def position(self):
-        """value (float): vertical position in divisions from center graticule"""
-        return float(self._visa.query(f"CH{self._ch}:POSITION?"))
-
-    @position.setter
-    def position(self, value):
-        self._visa.write(f"CH{self._ch}:POSITION {value}")
-
-    @property
-    def scale(self):
-        """value (float): vertical gain in y_unit per division"""
-        return float(self._visa.query(f"CH{self._ch}:SCALE?"))
-
-    @scale.setter
-    def scale(self, value):
-        self._visa.write(f"CH{self._ch}:SCALE {value}")
-
-    @property
-    def y_unit(self):
-        """value (str): 'V' for voltage or 'A' for amperage"""
-        return self._visa.query(f"CH{self._ch}:YUN?").strip('"')
-
-    @y_unit.setter
-    def y_unit(self, value):
-        self._visa.write(f"CH{self._ch}:YUN '{value}'")
+    bandwidth = ScpiProperty(
+        "CH{ch}:BANDWIDTH", check=False, doc="value (str): TWENTY, ONEFIFTY or FULL"
+    )
+
+    coupling = ScpiProperty(
+        "CH{ch}:COUPLING", check=False, doc="value (str): AC, DC or GND"
+    )
+
+    invert = ScpiProperty(
+        "CH{ch}:INVERT", check=False, doc="value (str): ON (1) or OFF (0)"
+    )
+
+    offset = ScpiProperty(
+        "CH{ch}:OFFSET",
+        float,
+        check=False,
+        doc="value (float): value subtracted from the signal before acquisition",
+    )
+
+    position = ScpiProperty(
+        "CH{ch}:POSITION",
+        float,
+        check=False,
+        doc="value (float): vertical position in divisions from center graticule",
+    )
+
+    scale = ScpiProperty(
+        "CH{ch}:SCALE",
+        float,
+        check=False,
+        doc="value (float): vertical gain in y_unit per division",
+    )
+
+    y_unit = ScpiProperty(
+        "CH{ch}:YUN",
+        unquote,
+        quote,
+        check=False,
+        doc="value (str): 'V' for voltage or 'A' for amperage",
+    )
 
 
 class ProbeBase(InstrumentSubsystem, kind="ProbeBase"):
@@ -421,20 +453,11 @@ class ProbeBase(InstrumentSubsystem, kind="ProbeBase"):
         super().__init__(owner)
         self._ch = owner._ch
 
-    @property
-    def model(self):
-        """(str): probe model"""
-        return self._visa.query(f"CH{self._ch}:ID?").strip('"')
+    model = ScpiProperty("CH{ch}:ID", unquote, readonly=True, doc="(str): probe model")
 
-    @property
-    def gain(self):
-        """value (float): probe gain factor (output/input)"""
-        return float(self._visa.query(f"CH{self._ch}:PROBE?"))
-
-    @gain.setter
-    @validate
-    def gain(self, value):
-        self._visa.write(f"CH{self._ch}:PROBE {value}")
+    gain = ScpiProperty(
+        "CH{ch}:PROBE", float, doc="value (float): probe gain factor (output/input)"
+    )
 
     @property
     def impedance(self):
@@ -0,0 +1,159 @@
+"""Analysis of captured waveforms in a pool of processes or threads
+
+>>> pipeline = Pipeline(workers=4)
+>>> pipeline.register("peak", np.max)
+>>> pipeline.register("spectrum", np.fft.rfft)
+>>> for results in pipeline.map(waveforms):
+...     print(results["peak"])
+
+The waveforms of a stream are analyzed as they're acquired, each result with the
+sequence number of its acquisition:
+>>> with tek.oscilloscope.stream("CH1") as stream:
+...     for sequence, results in pipeline.map_stream(stream):
+...         print(sequence, results["peak"])
+
+Results are yielded in the order of the waveforms. At most max_pending waveforms
+are analyzed at a time and the next waveform is taken from the iterable only
+when a result is consumed, so a slow consumer holds back the capture rather than
+piling up waveforms in memory.
+
+Functions run in worker processes must be picklable, e.g. module level
+functions. Waveforms are sent to the processes through a WaveformRing when one
+is given, instead of being pickled.
+"""
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from tekinstr.ring import WaveformRing
+
+_rings = {}  # rings attached to by this worker process
+
+_Slot = namedtuple("_Slot", ["name", "sequence"])
+
+
+def _analyze(functions, waveform):
+    if isinstance(waveform, _Slot):
+        if waveform.name not in _rings:
+            _rings[waveform.name] = WaveformRing(waveform.name)
+        waveform = _rings[waveform.name].get(waveform.sequence)
+    return {name: func(waveform) for name, func in functions.items()}
+
+
+def split(record, size, overlap=0):
+    """Split a long record into chunks
+
+    Args:
+        record (numpy.ndarray): samples; the last axis is split
+        size (int): samples per chunk
+        overlap (int): samples each chunk shares with the previous one
+    Yields:
+        (numpy.ndarray): views of the record
+    """
+    if not 0 <= overlap < size:
+        raise ValueError("overlap must be at least 0 and less than size")
+    n_samples = record.shape[-1]
+    for start in range(0, max(n_samples - overlap, 1), size - overlap):
+        yield record[..., start : start + size]
+
+
+class Pipeline:
+    """Run registered analysis functions on waveforms in a pool
+
+    Attributes:
+        workers (int): number of processes or threads; None for the number of CPUs
+        processes (bool): use processes rather than threads; threads suit functions
+            that release the GIL, such as most numpy operations on long records
+        max_pending (int): waveforms analyzed at a time; default twice workers
+        ring (WaveformRing): ring created by the caller to send the waveforms to
+            the processes; max_pending must be less than its number of slots
+    """
+
+    def __init__(self, workers=None, processes=True, max_pending=None, ring=None):
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self._executor = executor(workers)
+        self._max_pending = 2 * workers if max_pending is None else max_pending
+        if ring is not None and self._max_pending >= ring.n_slots:
+            raise ValueError(f"max_pending must be less than {ring.n_slots} slots")
+        self._ring = ring if processes else None
+        self._functions = {}
+
+    @property
+    def functions(self):
+        """(dict): name -> registered analysis function"""
+        return dict(self._functions)
+
+    def register(self, name, func):
+        """Register an analysis function
+
+        Args:
+            name (str): key of the result
+            func (callable): called with the waveform
+        """
+        self._functions[name] = func
+
+    def unregister(self, name):
+        """Unregister an analysis function
+
+        Args:
+            name (str): name it was registered with
+        """
+        del self._functions[name]
+
+    def _submit(self, waveform):
+        if self._ring is not None:
+            waveform = _Slot(self._ring.name, self._ring.publish(waveform))
+        return self._executor.submit(_analyze, self._functions, waveform)
+
+    def map(self, waveforms):
+        """Analyze waveforms
+
+        Args:
+            waveforms (iterable): waveforms or chunks, e.g. from split
+        Yields:
+            (dict): name -> result of each registered function, in order
+        """
+        for _, results in self._map((None, waveform) for waveform in waveforms):
+            yield results
+
+    def map_stream(self, stream):
+        """Analyze the waveforms of a stream
+
+        Args:
+            stream (iterable): (sequence number, waveform) items, e.g. the Stream
+                of OscilloscopeBase.stream
+        Yields:
+            (tuple): sequence number and name -> result of each registered
+                function, in order
+        """
+        yield from self._map(stream)
+
+    def _map(self, items):
+        """Analyze the waveforms of (key, waveform) items, yielding (key, results)"""
+        pending = deque()
+        try:
+            for key, waveform in items:
+                pending.append((key, self._submit(waveform)))
+                if len(pending) >= self._max_pending:
+                    key, future = pending.popleft()
+                    yield key, future.result()
+            while pending:
+                key, future = pending.popleft()
+                yield key, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def close(self):
+        """Shut the pool down"""
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        kind = type(self._executor).__name__
+        return f"<Pipeline of {', '.join(self._functions)} in {kind}>"
@@ -0,0 +1,248 @@
+"""Shared memory ring of waveforms for multi-process analysis
+
+The publisher copies each waveform into the next of n_slots preallocated slots
+and consumer processes attach to the ring by name and get views of the slots,
+so waveforms aren't pickled.
+>>> ring = WaveformRing(create=True, n_slots=8, n_channels=4, n_samples=10000)
+>>> sequence = ring.publish(tek.oscilloscope.read("CH1:4"))
+>>> consumer = WaveformRing(ring.name)  # in another process
+>>> wf = consumer.get(sequence)
+
+A view is overwritten when the ring wraps around; check current(sequence) after
+processing it. The ring requires Python 3.8 for multiprocessing.shared_memory.
+"""
+import sys
+import time
+import numpy as np
+from waveformDT.waveform import WaveformDT
+
+# latest sequence number, n_slots, n_channels, n_samples
+CONTROL = np.dtype(("i8", 4))
+
+HEADER = np.dtype(
+    [
+        ("sequence", "i8"),  # 0 while the slot is written
+        ("ndim", "i8"),
+        ("n_channels", "i8"),
+        ("n_samples", "i8"),
+        ("t0", "datetime64[us]"),
+        ("dt", "f8"),
+        ("wf_start_offset", "f8"),
+        ("y_position", "f8"),
+        ("y_offset", "f8"),
+        ("x_unit", "S16"),
+        ("y_unit", "S16"),
+    ]
+)
+
+ALIGNMENT = 64
+
+
+def _align(n_bytes):
+    return -(-n_bytes // ALIGNMENT) * ALIGNMENT
+
+
+def _data_offset(n_slots):
+    return _align(CONTROL.itemsize) + _align(n_slots * HEADER.itemsize)
+
+
+def _shared_memory():
+    """multiprocessing.shared_memory.SharedMemory, imported when a ring is made"""
+    # pylint: disable=import-outside-toplevel
+    try:
+        from multiprocessing.shared_memory import SharedMemory
+    except ImportError:
+        raise ImportError(
+            "WaveformRing requires multiprocessing.shared_memory of Python 3.8"
+        ) from None
+    return SharedMemory
+
+
+def _attach(name):
+    """Attach to shared memory without registering it with the resource tracker,
+    which would remove it when this process exits
+    """
+    # pylint: disable=import-outside-toplevel
+    # pylint: disable=invalid-name
+    SharedMemory = _shared_memory()
+    from multiprocessing import resource_tracker  # new in Python 3.8 as well
+
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)  # pylint: disable=unexpected-keyword-arg
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class WaveformRing:
+    """Ring of waveform slots in shared memory
+
+    Attributes:
+        name (str): name of the shared memory block; None for a new unique name
+        create (bool): create the ring rather than attach to an existing one
+        n_slots (int): number of slots; only used when creating
+        n_channels (int): maximum number of channels per waveform
+        n_samples (int): maximum number of samples per channel
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, name=None, create=False, n_slots=8, n_channels=4, n_samples=10000
+    ):
+        if create:
+            size = _data_offset(n_slots) + n_slots * n_channels * n_samples * 8
+            self._shm = _shared_memory()(name, create=True, size=size)
+            self._control = np.ndarray((), CONTROL, self._shm.buf)
+            self._control[...] = [0, n_slots, n_channels, n_samples]
+        else:
+            self._shm = _attach(name)
+            self._control = np.ndarray((), CONTROL, self._shm.buf)
+            _, n_slots, n_channels, n_samples = self._control.tolist()
+        self._headers = np.ndarray(
+            n_slots, HEADER, self._shm.buf, _align(CONTROL.itemsize)
+        )
+        self._data = np.ndarray(
+            (n_slots, n_channels, n_samples), "f8", self._shm.buf, _data_offset(n_slots)
+        )
+        self._owner = create
+
+    @property
+    def name(self):
+        """(str): name to attach to the ring with"""
+        return self._shm.name
+
+    @property
+    def n_slots(self):
+        """(int): number of slots"""
+        return len(self._headers)
+
+    @property
+    def sequence(self):
+        """(int): sequence number of the latest waveform, 0 if none"""
+        return int(self._control[0])
+
+    def publish(self, waveform):
+        """Copy a waveform, as returned by OscilloscopeBase.read, into the next slot
+
+        Args:
+            waveform (WaveformDT or numpy.ndarray): samples of one or more channels
+        Returns:
+            (int): sequence number of the waveform
+        """
+        data = np.asarray(waveform)
+        samples = np.atleast_2d(data)
+        n_channels, n_samples = samples.shape
+        if n_channels > self._data.shape[1] or n_samples > self._data.shape[2]:
+            raise ValueError(
+                f"waveform of shape {data.shape} exceeds the slots of "
+                f"{self._data.shape[1]} channels of {self._data.shape[2]} samples"
+            )
+        sequence = self.sequence + 1
+        slot = (sequence - 1) % self.n_slots
+        header = self._headers[slot]
+        header["sequence"] = 0
+        self._data[slot, :n_channels, :n_samples] = samples
+        header["ndim"] = data.ndim
+        header["n_channels"] = n_channels
+        header["n_samples"] = n_samples
+        t0 = getattr(waveform, "t0", None)
+        header["t0"] = np.datetime64(0 if t0 is None else t0, "us")
+        header["dt"] = getattr(waveform, "dt", 1.0)
+        for field in ["wf_start_offset", "y_position", "y_offset"]:
+            header[field] = getattr(waveform, field, 0.0)
+        header["x_unit"] = getattr(waveform, "_xunit", "").encode()
+        header["y_unit"] = getattr(waveform, "_yunit", "").encode()
+        header["sequence"] = sequence
+        self._control[0] = sequence
+        return sequence
+
+    def current(self, sequence):
+        """Check that the waveform is still in its slot
+
+        Args:
+            sequence (int): sequence number of the waveform
+        Returns:
+            (bool)
+        """
+        if sequence < 1:
+            return False
+        return int(self._headers[(sequence - 1) % self.n_slots]["sequence"]) == sequence
+
+    def get(self, sequence, wdt=True):
+        """Get a view of a waveform
+
+        Args:
+            sequence (int): sequence number of the waveform
+            wdt (bool): If true, return data as WaveformDT.
+        Returns:
+            WaveformDT or numpy.ndarray
+        Raises:
+            KeyError: the waveform isn't in the ring
+        """
+        if not self.current(sequence):
+            raise KeyError(f"waveform {sequence} isn't in the ring")
+        slot = (sequence - 1) % self.n_slots
+        header = self._headers[slot].copy()
+        n_channels, n_samples = int(header["n_channels"]), int(header["n_samples"])
+        data = self._data[slot, :n_channels, :n_samples]
+        if header["ndim"] == 1:
+            data = data[0]
+        if not wdt:
+            return data
+        data = WaveformDT(data, float(header["dt"]), header["t0"].item())
+        setattr(data, "wf_start_offset", float(header["wf_start_offset"]))
+        setattr(data, "_xunit", header["x_unit"].decode())
+        setattr(data, "_yunit", header["y_unit"].decode())
+        setattr(data, "y_position", float(header["y_position"]))
+        setattr(data, "y_offset", float(header["y_offset"]))
+        return data
+
+    def latest(self, wdt=True):
+        """Get a view of the latest waveform
+
+        Returns:
+            WaveformDT, numpy.ndarray or None if nothing was published
+        """
+        sequence = self.sequence
+        return self.get(sequence, wdt) if sequence else None
+
+    def wait(self, after, timeout=None, interval=1e-3):
+        """Wait for a waveform to be published
+
+        Args:
+            after (int): sequence number of the last waveform seen
+            timeout (float): timeout in seconds, None for no timeout
+            interval (float): polling interval in seconds
+        Returns:
+            (int): sequence number of the latest waveform
+        Raises:
+            TimeoutError
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.sequence <= after:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"no waveform after {after} within {timeout} s")
+            time.sleep(interval)
+        return self.sequence
+
+    def close(self):
+        """Detach from the ring; the creator also removes it
+
+        Views of the slots must be deleted first.
+        """
+        self._control = self._headers = self._data = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<WaveformRing {self.name} of {self.n_slots} slots>"
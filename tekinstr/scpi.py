@@ -0,0 +1,125 @@
+"""Declarative SCPI properties"""
+from string import Formatter
+from tekinstr.common import validate
+
+# caching classes
+SETTING = "setting"  # cached within Session.caching until the next write
+VOLATILE = "volatile"  # always queried, e.g. measurement results
+
+INVALID = 9.91e37  # value of a measurement that can't be made
+
+
+def float_or_str(value):
+    """Convert to float if possible, e.g. '1.4' or 'TTL'"""
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def unquote(value):
+    """Remove the double quotes of a string response"""
+    return value.strip('"')
+
+
+def quote(value):
+    """Quote a string argument"""
+    return f"'{value}'"
+
+
+class ScpiProperty:
+    """Instrument property accessed through a SCPI header
+
+    Fields of the header template are the owner's attributes of the same name with
+    a leading underscore, e.g. 'CH{ch}:SCALE' is formatted with owner._ch.
+
+    Attributes:
+        header (str): header template such as 'CH{ch}:SCALE'
+        parser (callable): converts the query response
+        formatter (callable): converts the value to the command argument
+        set_header (str): header template for setting, if different from header
+        readonly (bool): the property can't be set
+        check (bool): read the SESR after setting, see validate
+        cache (str): caching class; SETTING or VOLATILE
+        rule (callable): checks and coerces the value before it's sent, such as
+            capability.Choice; the model's capability table takes precedence
+        doc (str): docstring
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        header,
+        parser=str,
+        formatter=str,
+        set_header=None,
+        readonly=False,
+        check=True,
+        cache=SETTING,
+        rule=None,
+        doc=None,
+    ):
+        self.header = header
+        self.set_header = header if set_header is None else set_header
+        self.parser = parser
+        self.formatter = formatter
+        self.cache = cache
+        self.rule = rule
+        self.name = None
+        self.__doc__ = doc
+        templates = [header, self.set_header]
+        self._fields = {
+            f for t in templates for _, f, _, _ in Formatter().parse(t) if f
+        }
+        self._messages = None if self._fields else (f"{header}?", self.set_header)
+        self._send = validate(self._write) if check else self._write
+        self.fset = None if readonly else self._set
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def messages(self, instance):
+        """Get the query and the command header of instance
+
+        Args:
+            instance (TekBase)
+        Returns:
+            (tuple): (query, command header) such as ('CH1:SCALE?', 'CH1:SCALE')
+        """
+        if self._messages is not None:
+            return self._messages
+        messages = instance.__dict__.setdefault("_scpi_messages", {})
+        try:
+            return messages[self.name]
+        except KeyError:
+            fields = {f: getattr(instance, "_" + f) for f in self._fields}
+            query = self.header.format(**fields) + "?"
+            messages[self.name] = (query, self.set_header.format(**fields))
+            return messages[self.name]
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        query = self.messages(instance)[0]
+        cache = self.cache == SETTING
+        return self.parser(instance._visa.query(query, cache=cache))
+
+    def __set__(self, instance, value):
+        if self.fset is None:
+            raise AttributeError(f"can't set '{self.name}'")
+        self.fset(instance, value)
+
+    def _set(self, instance, value):
+        # pylint: disable=protected-access
+        model = getattr(instance, "_instr", instance)
+        rule = model._capabilities.get(self.header, self.rule)
+        if rule is not None:
+            try:
+                value = rule(value)
+            except ValueError as exc:
+                raise ValueError(f"invalid {self.name}: {exc}") from None
+        self._send(instance, value)
+
+    def _write(self, instance, value):
+        header = self.messages(instance)[1]
+        instance._visa.write(f"{header} {self.formatter(value)}")
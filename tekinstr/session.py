@@ -0,0 +1,273 @@
+"""VISA session shared by a model and its instruments"""
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pyvisa.errors import VisaIOError
+from tekinstr.common import CommandError
+from tekinstr.metrics import Metrics
+from tekinstr.state import InstrumentState
+from tekinstr.trace import Trace
+
+# commands that configure the session rather than the instrument setup
+SESSION_HEADERS = ("HEADER", "VERBOSE")
+
+
+class Session:
+    """Wrapper of the pyvisa resource shared by a model and all of its instruments
+
+    Attributes not defined here, such as timeout or stb, are those of the resource.
+    Each transaction holds the session lock, so threads can share the session; hold
+    it with locked for compound operations. Deferring holds the lock and a cache
+    is used only by the thread that opened it.
+
+    Attributes:
+        resource (pyvisa.resources.Resource): pyvisa resource
+    """
+
+    def __init__(self, resource):
+        self.__dict__["_resource"] = resource
+        self.__dict__["_commands"] = None
+        self.__dict__["_state"] = None
+        self.__dict__["_caches"] = []
+        self.__dict__["_local"] = threading.local()
+        self.__dict__["_traces"] = []
+        self.__dict__["_metrics"] = None
+        self.__dict__["_lock"] = threading.RLock()
+
+    def __getattr__(self, name):
+        return getattr(self._resource, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resource, name, value)
+
+    @property
+    def deferring(self):
+        """(bool): commands are being collected instead of sent"""
+        return self._commands is not None
+
+    @property
+    def metrics(self):
+        """(Metrics): the collected metrics; None unless collect_metrics was called"""
+        return self._metrics
+
+    def collect_metrics(self, labels=None):
+        """Collect metrics of the transactions from now on
+
+        Args:
+            labels (dict): identify the instrument, e.g. {'model': 'MDO3024'}
+        Returns:
+            (Metrics): the same object on every call
+        """
+        if self._metrics is None:
+            self.__dict__["_metrics"] = Metrics(labels)
+        return self._metrics
+
+    def command_error(self, message):
+        """Create a CommandError and count it in the metrics
+
+        Args:
+            message (str): event message of the instrument
+        Returns:
+            (CommandError)
+        """
+        if self._metrics is not None:
+            self._metrics.command_errors += 1
+        return CommandError(message)
+
+    def write(self, message):
+        """Write message to the instrument unless deferring"""
+        with self._lock:
+            for cache in self._caches:
+                cache.clear()
+            if self._commands is None or message.upper().startswith(SESSION_HEADERS):
+                return self._transact("write", self._resource.write, message)
+            self._commands.append(message)
+            return None
+
+    def query(self, message, cache=False):
+        """Query the instrument
+
+        While deferring, the response comes from the collected commands or the
+        deferred state if possible.
+
+        Args:
+            message (str): query
+            cache (bool): the response can be cached, see caching
+        """
+        with self._lock:
+            deferred = not message.upper().startswith(SESSION_HEADERS)
+            if self._state is not None and deferred:
+                pending = ";".join(":" + cmd.lstrip(":") for cmd in self._commands)
+                for state in [InstrumentState(pending), self._state]:
+                    response = state.lookup(message.rstrip("?"))
+                    if response is not None:
+                        return response
+            responses = self._cache() if cache else None
+            if responses is None:
+                return self._query(message)
+            try:
+                return responses[message]
+            except KeyError:
+                response = responses[message] = self._query(message)
+                return response
+
+    def _cache(self):
+        """The innermost cache opened by the current thread, None if there's none"""
+        return getattr(self._local, "cache", None)
+
+    def settings_cache(self):
+        """Create a dict that any write clears, for settings read once and reused
+
+        Changes made on the front panel aren't noticed.
+
+        Returns:
+            (dict)
+        """
+        cache = {}
+        with self._lock:
+            self._caches.append(cache)
+        return cache
+
+    def _query(self, message):
+        return self._transact("query", self._resource.query, message)
+
+    def query_binary_values(self, message, *args, **kwargs):
+        """Query the instrument for binary values"""
+        return self._transact(
+            "binary", self._resource.query_binary_values, message, *args, **kwargs
+        )
+
+    def _transact(self, kind, func, message, *args, **kwargs):
+        """Call func(message, ...) and record the transaction in traces and metrics"""
+        # metrics are never turned off, so the lock wait is timed once they're on
+        with self._lock if self._metrics is None else self.locked():
+            if not self._traces and self._metrics is None:
+                return func(message, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                response = func(message, *args, **kwargs)
+            except VisaIOError as exc:
+                if self._metrics is not None and exc.abbreviation == "VI_ERROR_TMO":
+                    self._metrics.timeouts += 1
+                raise
+            duration = time.perf_counter() - start
+            if kind == "binary":
+                datatype = args[0] if args else kwargs.get("datatype", "f")
+                n_bytes = len(response) * struct.calcsize(datatype)
+            else:
+                n_bytes = len(response) if kind == "query" else 0
+            # recorded under the lock as the counters aren't atomic
+            if self._metrics is not None:
+                self._metrics.record(kind, len(message) + n_bytes, duration)
+            for trace in self._traces:
+                trace.record(kind, message, len(message) + n_bytes, duration)
+        return response
+
+    @contextmanager
+    def locked(self):
+        """Hold the session lock so that a compound operation is atomic
+
+        The lock is reentrant. While collecting metrics, the time waited for the
+        lock held by another thread is recorded.
+        """
+        if not self._lock.acquire(blocking=False):
+            start = time.perf_counter()
+            self._lock.acquire()
+            if self._metrics is not None:
+                self._metrics.lock_wait.observe(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    @contextmanager
+    def defer(self, state=None):
+        """Collect written commands instead of sending them to the instrument
+
+        The session lock is held throughout, so the messages of other threads wait
+        instead of being collected.
+
+        Args:
+            state (InstrumentState): answer queries from state when possible
+        Yields:
+            (list): the collected commands
+        """
+        commands = []
+        with self.locked():
+            self.__dict__["_commands"] = commands
+            self.__dict__["_state"] = state
+            try:
+                yield commands
+            finally:
+                self.__dict__["_commands"] = None
+                self.__dict__["_state"] = None
+
+    @contextmanager
+    def caching(self):
+        """Cache the responses of setting queries of this thread until the next write
+
+        A write of any thread clears the cache.
+        """
+        cache = {}
+        previous = self._cache()
+        with self._lock:
+            self._caches.append(cache)
+        self._local.cache = cache
+        try:
+            yield
+        finally:
+            self._local.cache = previous
+            with self._lock:
+                self._caches.remove(cache)
+
+    @contextmanager
+    def tracing(self, maxlen=10000):
+        """Record the transactions with the instrument
+
+        Traces can be nested and each records all transactions within it.
+
+        Args:
+            maxlen (int): number of transactions kept, None for all
+        Yields:
+            (Trace)
+        """
+        trace = Trace(maxlen)
+        with self._lock:
+            self._traces.append(trace)
+        try:
+            yield trace
+        finally:
+            with self._lock:
+                self._traces.remove(trace)
+
+    def write_checked(self, commands):
+        """Send commands as one program message and check for errors
+
+        Args:
+            commands (list): commands such as ['CH1:SCALE 0.5', 'ACQUIRE:MODE SAMPLE']
+        Raises:
+            CommandError: command or execution error
+        """
+        self.query_checked(commands)
+
+    def query_checked(self, commands):
+        """Send commands and queries as one program message and check for errors
+
+        Args:
+            commands (list): commands and queries such as ['CH1:SCALE 0.5',
+                'CH1:SCALE?']
+        Returns:
+            (list): fields of the responses to the queries, split at semicolons
+        Raises:
+            CommandError: command or execution error
+        """
+        cme, exe = 32, 16
+        units = [cmd if cmd.startswith((":", "*")) else ":" + cmd for cmd in commands]
+        with self.locked():
+            response = self._query(";".join(["*CLS", *units, "*ESR?"]))
+            *fields, esr = response.split(";")
+            if int(esr) & (cme | exe):
+                msg = self._query("EVMSG?").strip().split(",")[1].strip('"')
+                raise self.command_error(msg)
+        return fields
@@ -0,0 +1,801 @@
+"""Simulated oscilloscopes for testing and benchmarking without hardware
+
+The simulator interprets the MDO3000, MSO4000(B) and TDS3000 command sets well
+enough for this package: settings are stateful and accept the short form of
+headers, CURVE? returns synthetic waveforms at any record length, the waveform
+preamble describes them and acquisitions, measurements, the DVM and the spectrum
+analyzer produce values consistent with the simulated signals.
+
+>>> from tekinstr.simulator import simulate
+>>> tek = simulate("MDO3024", latency=1e-3)
+>>> tek.oscilloscope.read("CH1:2")
+"""
+import math
+import re
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+import numpy as np
+from pyvisa import constants
+from pyvisa.errors import VisaIOError
+from pyvisa.util import from_ieee_block
+from tekinstr import MODEL_CLASS
+from tekinstr.common import _get_idn
+from tekinstr.scpi import INVALID
+from tekinstr.state import message_units, find_header
+from tekinstr.simulator_profiles import (
+    default_settings,
+    profile,
+    read_only,
+)
+
+Signal = namedtuple("Signal", ["frequency", "amplitude", "offset", "noise"])
+Signal.__doc__ = """Sine wave applied to a channel input
+
+Attributes:
+    frequency (float): frequency in hertz
+    amplitude (float): peak amplitude in volts
+    offset (float): DC offset in volts
+    noise (float): standard deviation of the added noise in volts
+"""
+
+# event code -> (message, SESR bit)
+EVENTS = {
+    113: ("Undefined header", 32),
+    221: ("Settings conflict", 16),
+    222: ("Data out of range", 16),
+    224: ("Illegal parameter value", 16),
+    410: ("Query INTERRUPTED", 4),
+}
+
+RF_POINTS = 1000
+
+# slowest time base without roll mode in s/div
+ROLL_SCALE = 40e-3
+
+
+def _template_pattern(template):
+    """Regular expression of the headers a capability template applies to"""
+    return re.compile(re.sub(r"\\\{\w+\\\}", "[A-Z0-9]+", re.escape(template)) + "$")
+
+
+def _normalize(args):
+    """Argument as the instrument returns it"""
+    if len(args) > 1 and args[0] == args[-1] == "'":
+        return '"' + args[1:-1] + '"'
+    if args.upper() in ["ON", "OFF"]:
+        return "1" if args.upper() == "ON" else "0"
+    if re.match(r"^[A-Za-z_][\w.]*$", args):
+        return args.upper()
+    return args
+
+
+def _nr3(value):
+    return f"{value:.4E}"
+
+
+class SimulatedInstrument:
+    """Interpreter of the command set of a simulated oscilloscope
+
+    Attributes:
+        model (str): model number such as 'MDO3024', 'MSO4104B' or 'TDS3064B'
+        signals (dict): channel -> Signal applied to the channel input; channels not
+            given get a sine of x MHz for CHx
+        trigger_rate (float): maximum number of acquisitions per second
+        seed (int): seed of the random noise
+    """
+
+    def __init__(self, model="MDO3024", signals=None, trigger_rate=1000.0, seed=0):
+        self.model = model
+        self.profile = profile(model)
+        self.signals = {
+            f"CH{x}": Signal(x * 1e6, 0.25, 0.0, 2e-3)
+            for x in range(1, self.profile.n_channels + 1)
+        }
+        self.signals.update(signals or {})
+        self.trigger_rate = trigger_rate
+        self._seed = seed
+        self._lock = threading.RLock()
+        self._read_only = read_only(self.profile)
+        rules = self.profile.capabilities.items()
+        self._rules = [(_template_pattern(t), rule) for t, rule in rules]
+        self._queries = [
+            (re.compile(pattern + "$"), handler)
+            for pattern, handler in [
+                (r"\*IDN", self._idn),
+                (r"\*ESR", self._esr),
+                (r"\*STB", lambda m: str(self.status_byte())),
+                (r"\*OPC", self._opc_query),
+                (r"EVENT", self._event),
+                (r"EVMSG", self._evmsg),
+                (r"ALLEV", self._allev),
+                (r"(SET|\*LRN)", self._set),
+                (r"TIME", lambda m: datetime.now().strftime('"%H:%M:%S"')),
+                (r"DATE", lambda m: datetime.now().strftime('"%Y-%m-%d"')),
+                (r"CURVE?", self._curve),
+                (r"(WFMOUTPRE|WFMPRE|WFMO|WFMP)(:(?P<key>\w+))?", self._wfmpre),
+                (r"ACQ(UIRE)?:NUMAC(Q)?", lambda m: str(self._acquisitions)),
+                (r"ACQ(UIRE)?:STATE?", lambda m: "1" if self._running else "0"),
+                (r"TRIG(GER)?:STATE?", self._trigger_state),
+                (
+                    r"MEAS(UREMENT)?:(?P<slot>MEAS\d|IMMED):"
+                    r"(?P<key>VALUE|MEAN|MINIMUM|MAXIMUM|STDDEV|UNITS|COUNT)",
+                    self._measurement,
+                ),
+                (
+                    r"DVM:MEAS(UREMENT)?:(?P<key>VALUE|FREQUENCY|"
+                    r"HISTORY:AVERAGE|HISTORY:MINIMUM|HISTORY:MAXIMUM)",
+                    self._dvm,
+                ),
+            ]
+        ]
+        self._commands = [
+            (re.compile(pattern + "$"), handler)
+            for pattern, handler in [
+                (r"\*CLS", self._cls),
+                (r"\*RST", lambda args: self.reset()),
+                (r"\*OPC", self._opc),
+                (r"\*WAI", lambda args: None),
+                (r"ACQ(UIRE)?:STATE?", self._acquire_state),
+                (r"TRIG(GER)?", self._trigger),
+            ]
+        ]
+        self.reset()
+
+    def reset(self):
+        """Restore the default settings, clear the status and start acquiring"""
+        with self._lock:
+            self._settings = default_settings(self.profile)
+            self._resolved = {}
+            self._sesr = 0
+            self._events = deque(maxlen=32)
+            self._opc_pending = False
+            self._acquisitions = 0
+            self._running = False
+            self._started = self._done = 0.0
+            self._start_acquisition()
+
+    def process(self, message):
+        """Execute a program message
+
+        Args:
+            message (str): program message such as 'CH1:SCALE 0.5;:CH1:SCALE?'
+        Returns:
+            (bytes or None): response message, None if message has no query
+        """
+        with self._lock:
+            self._update()
+            responses = []
+            for header, args in message_units(message):
+                if header.endswith("?"):
+                    response = self._query(header[:-1], args)
+                    if response is not None:
+                        responses.append(
+                            response
+                            if isinstance(response, bytes)
+                            else response.encode()
+                        )
+                else:
+                    self._command(header, args)
+            return b";".join(responses) if responses else None
+
+    def interrupt(self):
+        """Report that the response to a query was not read"""
+        with self._lock:
+            self._error(410)
+
+    def status_byte(self):
+        """(int): status byte without the MAV bit"""
+        with self._lock:
+            self._update()
+            esb = 32 if self._sesr & int(self._settings["*ESE"]) else 0
+            mss = 64 if esb & int(self._settings["*SRE"]) else 0
+            return esb | mss
+
+    def _error(self, code):
+        """Report an event if the DESE register enables it"""
+        bit = EVENTS[code][1]
+        if int(self._settings["DESE"]) & bit:
+            self._sesr |= bit
+            self._events.append(code)
+
+    def _find(self, header):
+        """Find the settings key of header, None if it isn't a setting"""
+        try:
+            return self._resolved[header]
+        except KeyError:
+            key = header if header in self._settings else None
+            key = find_header(self._settings, header) if key is None else key
+            self._resolved[header] = key
+            return key
+
+    def _response(self, items, headers=False):
+        """Format (header, value) items with headers if HEADER is ON or headers"""
+        if self._settings["HEADER"] == "0" and not headers:
+            return ";".join(value for _, value in items)
+        units = []
+        path = None
+        for header, value in items:
+            parent = header.rsplit(":", maxsplit=1)[0] if ":" in header else ""
+            if parent and parent == path:
+                units.append(f"{header[len(parent) + 1:]} {value}")
+            else:
+                units.append(f"{'' if header[0] == '*' else ':'}{header} {value}")
+            path = parent
+        return ";".join(units)
+
+    def _query(self, header, _args):
+        for pattern, handler in self._queries:
+            match = pattern.match(header)
+            if match:
+                response = handler(match)
+                if response is None or isinstance(response, bytes):
+                    return response
+                if header.startswith("*") or self._settings["HEADER"] == "0":
+                    return response
+                return f":{header} {response}"
+        if header in self._read_only:
+            return self._response([(header, self._read_only[header])])
+        key = self._find(header)
+        if key is not None:
+            return self._response([(key, self._settings[key])])
+        node = [(k, v) for k, v in self._settings.items() if k.startswith(header + ":")]
+        if not node:
+            headers = [k.rsplit(":", maxsplit=1)[0] for k in self._settings]
+            key = find_header(headers, header)
+            node = [
+                (k, v) for k, v in self._settings.items() if k.startswith(f"{key}:")
+            ]
+        if key is None and not node:
+            self._error(113)
+            return None
+        return self._response(node)
+
+    def _command(self, header, args):
+        for pattern, handler in self._commands:
+            if pattern.match(header):
+                handler(args)
+                return
+        if not args:
+            return  # command without arguments, e.g. MESSAGE:CLEAR
+        if header in self._read_only:
+            self._error(221)
+            return
+        for pattern, rule in self._rules:
+            if pattern.match(header):
+                try:
+                    value = rule(args.strip("\"'"))
+                except ValueError:
+                    self._error(224 if re.match("^[A-Za-z]", args) else 222)
+                    return
+                args = _nr3(value) if isinstance(value, float) else str(value)
+                break
+        key = self._find(header)
+        if key is None:
+            key = header
+            self._resolved = {}
+        value, self._settings[key] = self._settings.get(key), _normalize(args)
+        if value == self._settings[key]:
+            return
+        if key in ["ACQUIRE:STOPAFTER", "ACQUIRE:MODE"] or key.startswith(
+            ("HORIZONTAL:", "CH")
+        ):
+            # changes that affect the waveform restart the acquisition count
+            self._started = time.monotonic()
+            self._acquisitions = 0
+
+    def _setting(self, header):
+        return self._settings[self._find(header)]
+
+    def _set(self, _match):
+        registers = ["DESE", "*ESE", "*SRE"]
+        items = [(k, v) for k, v in self._settings.items() if k not in registers]
+        return self._response(items, headers=True)
+
+    # status
+
+    def _idn(self, _match):
+        return self.profile.idn
+
+    def _esr(self, _match):
+        esr, self._sesr = self._sesr, 0
+        return str(esr)
+
+    def _cls(self, _args):
+        self._sesr = 0
+        self._events.clear()
+        self._opc_pending = False
+
+    def _opc(self, _args):
+        if self._running and self._settings["ACQUIRE:STOPAFTER"] == "SEQUENCE":
+            self._opc_pending = True
+        elif int(self._settings["DESE"]) & 1:
+            self._sesr |= 1
+
+    def _opc_query(self, _match):
+        if self._running and self._settings["ACQUIRE:STOPAFTER"] == "SEQUENCE":
+            time.sleep(max(0.0, self._done - time.monotonic()))
+            self._update()
+        return "1"
+
+    def _event(self, _match):
+        return str(self._events.popleft()) if self._events else "0"
+
+    def _evmsg(self, _match):
+        if not self._events:
+            return '0,"No events to report - queue empty"'
+        code = self._events.popleft()
+        return f'{code},"{EVENTS[code][0]}"'
+
+    def _allev(self, _match):
+        if not self._events:
+            return '0,"No events to report - queue empty"'
+        events = [f'{code},"{EVENTS[code][0]}"' for code in self._events]
+        self._events.clear()
+        return ",".join(events)
+
+    # acquisition
+
+    def _period(self):
+        """Duration of an acquisition in seconds"""
+        span = 10 * float(self._settings["HORIZONTAL:SCALE"])
+        return max(span, 1 / self.trigger_rate)
+
+    def _start_acquisition(self):
+        self._running = True
+        self._settings["ACQUIRE:STATE"] = "1"
+        self._started = time.monotonic()
+        self._acquisitions = 0
+        count = 1
+        if self._settings["ACQUIRE:MODE"] == "AVERAGE":
+            count = int(self._settings["ACQUIRE:NUMAVG"])
+        self._done = self._started + count * self._period()
+
+    def _stop_acquisition(self):
+        self._update()
+        self._running = False
+        self._settings["ACQUIRE:STATE"] = "0"
+
+    def _update(self):
+        """Advance the acquisition system to the current time"""
+        if not self._running:
+            return
+        now = time.monotonic()
+        if self._settings["ACQUIRE:STOPAFTER"] == "SEQUENCE":
+            if now >= self._done:
+                self._acquisitions += 1
+                self._running = False
+                self._settings["ACQUIRE:STATE"] = "0"
+                if self._opc_pending:
+                    self._opc_pending = False
+                    if int(self._settings["DESE"]) & 1:
+                        self._sesr |= 1
+        else:
+            self._acquisitions = int((now - self._started) / self._period())
+
+    def _acquire_state(self, args):
+        if _normalize(args) in ["RUN", "1"]:
+            if not self._running:
+                self._start_acquisition()
+        else:
+            self._stop_acquisition()
+
+    def _trigger(self, args):
+        if args.upper().startswith("FORC") and self._running:
+            self._done = time.monotonic()
+            self._update()
+
+    def _trigger_state(self, _match):
+        if not self._running:
+            return "SAVE"
+        if self._settings["ACQUIRE:STOPAFTER"] == "SEQUENCE":
+            return "READY"
+        return "TRIGGER" if self._settings["TRIGGER:A:MODE"] == "NORMAL" else "AUTO"
+
+    # waveforms
+
+    def _channel_signal(self, source):
+        """Signal at the digitizer of channel source after coupling"""
+        signal = self.signals.get(source, Signal(1e6, 0.0, 0.0, 0.0))
+        coupling = self._settings.get(f"{source}:COUPLING", "DC")
+        if coupling == "GND":
+            return Signal(signal.frequency, 0.0, 0.0, 0.0)
+        if coupling == "AC":
+            return signal._replace(offset=0.0)
+        return signal
+
+    def _time_axis(self):
+        """(record length, sample interval, time of the first sample)"""
+        record_length = int(self._settings["HORIZONTAL:RECORDLENGTH"])
+        span = 10 * float(self._settings["HORIZONTAL:SCALE"])
+        dt = span / record_length
+        delay = self._settings.get(
+            "HORIZONTAL:DELAY:MODE", self._settings.get("HORIZONTAL:DELAY:STATE")
+        )
+        if delay == "1":
+            t0 = float(self._settings["HORIZONTAL:DELAY:TIME"]) - span / 2
+        else:
+            position = self._settings.get(
+                "HORIZONTAL:POSITION", self._settings.get("HORIZONTAL:TRIGGER:POSITION")
+            )
+            t0 = -float(position) / 100 * span
+        return record_length, dt, t0
+
+    def _rolling(self):
+        """The acquisition is in roll mode"""
+        return (
+            self._running
+            and self._settings["HORIZONTAL:ROLL"] != "OFF"
+            and self._settings["ACQUIRE:STOPAFTER"] == "RUNSTOP"
+            and float(self._settings["HORIZONTAL:SCALE"]) >= ROLL_SCALE
+        )
+
+    def _volts(self, source, start, stop):
+        """Synthesize samples start to stop, counting from 1, of source in volts"""
+        record_length, dt, t0 = self._time_axis()
+        if source == "MATH":
+            return self._volts("CH1", start, stop) + self._volts("CH2", start, stop)
+        if source not in self.signals:
+            return np.zeros(stop - start + 1)
+        signal = self._channel_signal(source)
+        if self._rolling():
+            # samples scroll through the record as they're acquired
+            latest = int((time.monotonic() - self._started) / dt)
+            t = dt * (latest - record_length + np.arange(start, stop + 1))
+            return signal.offset + signal.amplitude * np.sin(
+                2 * np.pi * signal.frequency * t
+            )
+        rng = np.random.default_rng([self._seed, self._acquisitions, int(source[2:])])
+        t = t0 + dt * np.arange(start - 1, stop) + rng.normal(0, dt / 100)
+        volts = signal.offset + signal.amplitude * np.sin(
+            2 * np.pi * signal.frequency * t
+        )
+        volts += rng.normal(0, signal.noise, len(t)) if signal.noise else 0.0
+        if self._settings.get(f"{source}:INVERT") == "1":
+            volts = -volts
+        return volts
+
+    def _data_range(self, points):
+        start = max(1, int(self._settings["DATA:START"]))
+        stop = min(points, int(self._settings["DATA:STOP"]))
+        return start, max(start, stop)
+
+    def _preamble(self):
+        """Waveform preamble of DATA:SOURCE as (header, value) items"""
+        source = self._settings["DATA:SOURCE"]
+        width = int(self._settings["DATA:WIDTH"])
+        encoding = self._settings["DATA:ENCDG"]
+        ascii_encoding = encoding.startswith("ASC")
+        if source.startswith("RF_"):
+            span = float(self._settings["RF:SPAN"])
+            center = float(self._settings["RF:FREQUENCY"])
+            start, stop = self._data_range(RF_POINTS)
+            dx = span / (RF_POINTS - 1)
+            items = [
+                ("BYT_NR", "4"),
+                ("BIT_NR", "32"),
+                ("ENCDG", "BIN"),
+                ("BN_FMT", "FP"),
+                ("BYT_OR", "MSB"),
+                ("WFID", f'"{source}, {RF_POINTS} points"'),
+                ("NR_PT", str(stop - start + 1)),
+                ("PT_FMT", "Y"),
+                ("XUNIT", '"Hz"'),
+                ("XINCR", _nr3(dx)),
+                ("XZERO", _nr3(center - span / 2 + (start - 1) * dx)),
+                ("PT_OFF", "0"),
+                ("YUNIT", '"W"'),
+                ("YMULT", _nr3(1.0)),
+                ("YOFF", _nr3(0.0)),
+                ("YZERO", _nr3(0.0)),
+            ]
+            return [(f"{self.profile.wfmpre}:{k}", v) for k, v in items]
+        record_length, dt, t0 = self._time_axis()
+        start, stop = self._data_range(record_length)
+        channel = "CH1" if source == "MATH" else source
+        scale = float(self._settings.get(f"{channel}:SCALE", "1.0"))
+        position = float(self._settings.get(f"{channel}:POSITION", "0.0"))
+        offset = float(self._settings.get(f"{channel}:OFFSET", "0.0"))
+        levels = 25 if width == 1 else 6400
+        hscale = float(self._settings["HORIZONTAL:SCALE"])
+        mode = self._settings["ACQUIRE:MODE"].capitalize()
+        wfid = (
+            f"{source.capitalize()}, {self._settings.get(f'{channel}:COUPLING', 'DC')}"
+            f" coupling, {scale:.4g}V/div, {hscale:.4g}s/div, {record_length} points,"
+            f" {mode} mode"
+        )
+        items = [
+            ("BYT_NR", str(width)),
+            ("BIT_NR", str(8 * width)),
+            ("ENCDG", "ASC" if ascii_encoding else "BIN"),
+            ("BN_FMT", "RI"),
+            ("BYT_OR", "LSB" if encoding.startswith("SRI") else "MSB"),
+            ("WFID", f'"{wfid}"'),
+            ("NR_PT", str(stop - start + 1)),
+            ("PT_FMT", "Y"),
+            ("XUNIT", '"s"'),
+            ("XINCR", _nr3(dt)),
+            ("XZERO", _nr3(t0 + (start - 1) * dt)),
+            ("PT_OFF", "0"),
+            ("YUNIT", self._settings.get(f"{channel}:YUNITS", '"V"')),
+            ("YMULT", _nr3(scale / levels)),
+            ("YOFF", _nr3(position * levels)),
+            ("YZERO", _nr3(offset)),
+        ]
+        return [(f"{self.profile.wfmpre}:{k}", v) for k, v in items]
+
+    def _wfmpre(self, match):
+        items = self._preamble()
+        if match.group("key") is not None:
+            items = [(k, v) for k, v in items if k.endswith(":" + match.group("key"))]
+            if not items:
+                self._error(113)
+                return None
+        return self._response(items).encode()
+
+    def _curve(self, _match):
+        source = self._settings["DATA:SOURCE"]
+        if source.startswith("RF_"):
+            if not self.profile.rf:
+                self._error(221)
+                return None
+            start, stop = self._data_range(RF_POINTS)
+            data = self._spectrum(source)[start - 1 : stop].astype(">f4").tobytes()
+        else:
+            if not (source in self.signals or re.match("^(MATH|REF[1-4])$", source)):
+                self._error(221)
+                return None
+            preamble = dict(self._preamble())
+            start, stop = self._data_range(
+                int(self._settings["HORIZONTAL:RECORDLENGTH"])
+            )
+            volts = self._volts(source, start, stop)
+            wfmpre = self.profile.wfmpre
+            levels = (volts - float(preamble[f"{wfmpre}:YZERO"])) / float(
+                preamble[f"{wfmpre}:YMULT"]
+            ) + float(preamble[f"{wfmpre}:YOFF"])
+            width = int(self._settings["DATA:WIDTH"])
+            limit = 2 ** (8 * width - 1)
+            levels = np.clip(np.rint(levels), -limit, limit - 1)
+            encoding = self._settings["DATA:ENCDG"]
+            if encoding.startswith("ASC"):
+                return ",".join(str(int(v)) for v in levels).encode()
+            dtype = f"{'<' if encoding.startswith('SRI') else '>'}i{width}"
+            data = levels.astype(dtype).tobytes()
+        size = str(len(data))
+        return f"#{len(size)}{size}".encode() + data
+
+    def _spectrum(self, trace):
+        """Power spectrum in watts of the RF input"""
+        center = float(self._settings["RF:FREQUENCY"])
+        span = float(self._settings["RF:SPAN"])
+        rbw = float(self._settings["RF:RBW"])
+        frequency = center - span / 2 + span / (RF_POINTS - 1) * np.arange(RF_POINTS)
+        rng = np.random.default_rng([self._seed, self._acquisitions, 0])
+        floor = 1e-3 * 10 ** (-90 / 10)
+        gain = {
+            "RF_NORMAL": 1.0,
+            "RF_AVERAGE": 1.0,
+            "RF_MAXHOLD": 4.0,
+            "RF_MINHOLD": 0.1,
+        }
+        if trace == "RF_AVERAGE":
+            noise = np.full(RF_POINTS, floor)
+        else:
+            noise = floor * gain.get(trace, 1.0) * rng.exponential(size=RF_POINTS)
+        tone = 1e-3 * 10 ** (-20 / 10) * np.exp(-(((frequency - 1e9) / rbw) ** 2))
+        return noise + tone
+
+    # measurements
+
+    def _measure(self, measurement_type, source):
+        """(value, unit) of measurement_type of the signal at source"""
+        if source not in self.signals:
+            return INVALID, '"?"'
+        signal = self._channel_signal(source)
+        a, f, o = signal.amplitude, signal.frequency, signal.offset
+        rise = 2 * math.asin(0.8) / (2 * math.pi * f) if f else INVALID
+        volts = {
+            "AMPLITUDE": 2 * a,
+            "PK2PK": 2 * a,
+            "MAXIMUM": o + a,
+            "MINIMUM": o - a,
+            "HIGH": o + a,
+            "LOW": o - a,
+            "MEAN": o,
+            "CMEAN": o,
+            "RMS": math.sqrt(o**2 + a**2 / 2),
+            "CRMS": math.sqrt(o**2 + a**2 / 2),
+        }
+        seconds = {
+            "PERIOD": 1 / f if f else INVALID,
+            "RISE": rise,
+            "FALL": rise,
+            "PWIDTH": 0.5 / f if f else INVALID,
+            "NWIDTH": 0.5 / f if f else INVALID,
+            "DELAY": 0.0,
+        }
+        percent = {"PDUTY": 50.0, "NDUTY": 50.0, "POVERSHOOT": 0.0, "NOVERSHOOT": 0.0}
+        if measurement_type in volts:
+            return volts[measurement_type], self._settings.get(
+                f"{source}:YUNITS", '"V"'
+            )
+        if measurement_type in seconds:
+            return seconds[measurement_type], '"s"'
+        if measurement_type in percent:
+            return percent[measurement_type], '"%"'
+        if measurement_type == "FREQUENCY":
+            return float(f) if f else INVALID, '"Hz"'
+        if measurement_type == "PHASE":
+            return 0.0, '"degrees"'
+        return INVALID, '"?"'
+
+    def _measurement(self, match):
+        slot, key = match.group("slot"), match.group("key")
+        if key in ["MEAN", "MINIMUM", "MAXIMUM", "STDDEV", "COUNT"] and (
+            not self.profile.stats or slot == "IMMED"
+        ):
+            self._error(221)
+            return None
+        prefix = f"MEASUREMENT:{slot}:"
+        measurement_type = self._settings[prefix + "TYPE"]
+        value, unit = self._measure(
+            measurement_type, self._settings[prefix + "SOURCE1"]
+        )
+        if key == "UNITS":
+            return unit
+        if key == "COUNT":
+            return str(self._acquisitions)
+        if value == INVALID:
+            return _nr3(value)
+        sigma = 1e-3 * abs(value)
+        if key == "VALUE":
+            rng = np.random.default_rng(
+                [self._seed, self._acquisitions, int(slot[-1], 36)]
+            )
+            return _nr3(value + rng.normal(0, sigma))
+        deviation = {"MEAN": 0.0, "MINIMUM": -3 * sigma, "MAXIMUM": 3 * sigma}
+        if key == "STDDEV":
+            return _nr3(sigma)
+        return _nr3(value + deviation[key])
+
+    def _dvm(self, match):
+        if not self.profile.dvm:
+            self._error(113)
+            return None
+        key = match.group("key")
+        signal = self._channel_signal(self._settings["DVM:SOURCE"])
+        values = {
+            "DC": signal.offset,
+            "ACRMS": signal.amplitude / math.sqrt(2),
+            "ACDCRMS": math.sqrt(signal.offset**2 + signal.amplitude**2 / 2),
+            "FREQUENCY": signal.frequency,
+        }
+        if key == "FREQUENCY":
+            return _nr3(signal.frequency)
+        value = values.get(self._settings["DVM:MODE"], INVALID)
+        if value == INVALID:
+            return _nr3(value)
+        sigma = 1e-3 * abs(value) + signal.noise / 100
+        if key == "VALUE":
+            update = int(time.monotonic() / 0.1)  # the reading updates every 100 ms
+            rng = np.random.default_rng([self._seed, update])
+            return _nr3(value + rng.normal(0, sigma))
+        deviation = {
+            "HISTORY:AVERAGE": 0.0,
+            "HISTORY:MINIMUM": -3 * sigma,
+            "HISTORY:MAXIMUM": 3 * sigma,
+        }
+        return _nr3(value + deviation[key])
+
+
+class SimulatedResource:
+    """pyvisa message based resource connected to a SimulatedInstrument
+
+    Latency and bandwidth are injected by sleeping, so throughput measured against
+    the simulator resembles that of a network connection.
+
+    Attributes:
+        instrument (SimulatedInstrument)
+        latency (float): round trip time of a query in seconds
+        bandwidth (float): transfer rate in bytes per second, None if unlimited
+    """
+
+    def __init__(self, instrument, latency=0.0, bandwidth=None):
+        self.instrument = instrument
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.timeout = 2000
+        self.read_termination = "\n"
+        self.write_termination = "\n"
+        self.chunk_size = 20 * 1024
+        self.resource_name = f"SIM::{instrument.model}::INSTR"
+        self._output = None
+
+    def _transfer(self, n_bytes, latency=0.0):
+        delay = latency + (n_bytes / self.bandwidth if self.bandwidth else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def write(self, message):
+        """Write message to the instrument
+
+        The response to a query that was not read is discarded.
+
+        Returns:
+            (int): number of bytes written
+        """
+        self._transfer(len(message))
+        if self._output is not None:
+            self.instrument.interrupt()
+        self._output = self.instrument.process(message)
+        return len(message) + len(self.write_termination)
+
+    def read_raw(self, size=None):  # pylint: disable=unused-argument
+        """Read the response including the termination
+
+        Raises:
+            VisaIOError: timeout when there is no response to read
+        """
+        if self._output is None:
+            raise VisaIOError(constants.StatusCode.error_timeout)
+        data = self._output + self.read_termination.encode()
+        self._output = None
+        self._transfer(len(data), self.latency)
+        return data
+
+    def read(self):
+        """Read the response as str without the termination"""
+        return self.read_raw().decode("latin-1")[: -len(self.read_termination)]
+
+    def query(self, message, delay=None):  # pylint: disable=unused-argument
+        """Write message and read the response"""
+        self.write(message)
+        return self.read()
+
+    def query_binary_values(
+        self, message, datatype="f", is_big_endian=False, container=list, **kwargs
+    ):
+        """Write message and read an IEEE 488.2 definite length block"""
+        # pylint: disable=unused-argument
+        self.write(message)
+        return from_ieee_block(self.read_raw(), datatype, is_big_endian, container)
+
+    @property
+    def stb(self):
+        """(int): status byte"""
+        mav = 16 if self._output is not None else 0
+        return self.instrument.status_byte() | mav
+
+    def read_stb(self):
+        """Read the status byte"""
+        return self.stb
+
+    def clear(self):
+        """Clear the output queue"""
+        self._output = None
+
+    def close(self):
+        """Close the resource"""
+
+
+def simulate(model="MDO3024", latency=0.0, bandwidth=None, **kwargs):
+    """Connect to a simulated oscilloscope
+
+    Args:
+        model (str): model number such as 'MDO3024', 'MSO4104B' or 'TDS3064B'
+        latency (float): round trip time of a query in seconds
+        bandwidth (float): transfer rate in bytes per second, None if unlimited
+        kwargs: SimulatedInstrument arguments; signals, trigger_rate and seed
+    Returns:
+        (Model subclass)
+    """
+    resource = SimulatedResource(
+        SimulatedInstrument(model, **kwargs), latency, bandwidth
+    )
+    resource.write("*CLS")
+    try:
+        return MODEL_CLASS[_get_idn(resource).model](resource)
+    except KeyError:
+        raise NotImplementedError(f"{model} not currently supported") from None
@@ -0,0 +1,281 @@
+"""Command tables of the simulated model families
+
+A Profile describes the command set of a family: the *IDN? response, the
+capability tables the instrument checks arguments against, the settings after
+*RST in the order of the SET? response and the query-only headers.
+"""
+import re
+from dataclasses import dataclass, field
+from tekinstr.mdo3000.capabilities import CAPABILITIES as MDO3000_CAPABILITIES
+from tekinstr.mso4000.capabilities import CAPABILITIES as MSO4000_CAPABILITIES
+from tekinstr.mso4000b.capabilities import CAPABILITIES as MSO4000B_CAPABILITIES
+from tekinstr.tds3000.capabilities import CAPABILITIES as TDS3000_CAPABILITIES
+
+
+@dataclass
+class Profile:
+    """Command set of a model family
+
+    Attributes:
+        idn (str): response to *IDN?
+        n_channels (int): number of analog channels
+        capabilities (dict): header template -> rule, see capability
+        wfmpre (str): waveform preamble header; WFMOUTPRE or WFMPRE
+        stats (bool): measurement statistics are available
+        n_slots (int): number of measurement slots
+        configuration (dict): responses to CONFIGURATION queries
+        dvm (bool): has a digital voltmeter
+        rf (bool): has a spectrum analyzer
+    """
+
+    idn: str
+    n_channels: int
+    capabilities: dict
+    wfmpre: str = "WFMOUTPRE"
+    stats: bool = True
+    n_slots: int = 4
+    configuration: dict = field(default_factory=dict)
+    dvm: bool = False
+    rf: bool = False
+
+
+def profile(model):
+    """Get the profile of model
+
+    Args:
+        model (str): model number such as 'MDO3024', 'MSO4104B' or 'TDS3064B'
+    Returns:
+        (Profile)
+    """
+    firmware = "CF:91.1CT FV:v1.30"
+    if re.match(r"^MDO3\d\d[24]$", model):
+        n_channels = int(model[-1])
+        configuration = {
+            "ADVMATH": 0,
+            "AFG": 0,
+            "APPLICATIONS:POWER": 1,
+            "ARB": 0,
+            "AUXIN": 0,
+            "DVM": 1,
+            "ANALOG:NUMCHANNELS": n_channels,
+            "DIGITAL:NUMCHANNELS": 0,
+            "NUMMEAS": 4,
+            "RF:NUMCHANNELS": 1,
+        }
+        return Profile(
+            f"TEKTRONIX,{model},C000001,{firmware}",
+            n_channels,
+            MDO3000_CAPABILITIES,
+            configuration=configuration,
+            dvm=True,
+            rf=True,
+        )
+    if re.match(r"^(MSO|DPO|MDO)4\d\d\d(B|B-L|-6)$", model):
+        configuration = {
+            "ADVMATH": 1,
+            "AFG": 0,
+            "APPLICATIONS:POWER": 0,
+            "ARB": 0,
+            "AUXIN": 0,
+            "ANALOG:NUMCHANNELS": 4,
+            "DIGITAL:NUMCHANNELS": 16 if model.startswith("MSO") else 0,
+            "NUMMEAS": 8,
+        }
+        return Profile(
+            f"TEKTRONIX,{model},C000001,CF:91.1CT FV:v3.18",
+            4,
+            MSO4000B_CAPABILITIES,
+            n_slots=8,
+            configuration=configuration,
+        )
+    if re.match(r"^MSO4\d\d4$", model):
+        return Profile(
+            f"TEKTRONIX,{model},C000001,CF:91.1CT FV:v2.68",
+            4,
+            MSO4000_CAPABILITIES,
+            n_slots=8,
+        )
+    match = re.match(r"^TDS30[1-6](?P<n_channels>[24])[BC]*$", model)
+    if match:
+        return Profile(
+            f"TEKTRONIX,TDS {model[3:]},0,CF:91.1CT FV:v3.41 TDS3FFT:v1.00",
+            int(match.group("n_channels")),
+            TDS3000_CAPABILITIES,
+            wfmpre="WFMPRE",
+            stats=False,
+        )
+    raise NotImplementedError(f"{model} can't be simulated")
+
+
+def default_settings(prof):
+    """Settings after *RST, in the order of the SET? response"""
+    tds = prof.wfmpre == "WFMPRE"
+    n_channels = prof.n_channels
+    channels = [f"CH{x}" for x in range(1, n_channels + 1)]
+    settings = {
+        "HEADER": "1",
+        "VERBOSE": "1",
+        "DESE": "255",
+        "*ESE": "0",
+        "*SRE": "0",
+        "ACQUIRE:STOPAFTER": "RUNSTOP",
+        "ACQUIRE:STATE": "1",
+        "ACQUIRE:MODE": "SAMPLE",
+        "ACQUIRE:NUMENV": "INFINITE",
+        "ACQUIRE:NUMAVG": "16",
+        "HORIZONTAL:SCALE": "4.0E-6",
+        "HORIZONTAL:RECORDLENGTH": "10000",
+        "HORIZONTAL:DELAY:TIME": "0.0E+0",
+        "HORIZONTAL:ROLL": "AUTO",
+    }
+    if tds:
+        settings["HORIZONTAL:DELAY:STATE"] = "0"
+        settings["HORIZONTAL:TRIGGER:POSITION"] = "10.0E+0"
+    else:
+        settings["HORIZONTAL:DELAY:MODE"] = "0"
+        settings["HORIZONTAL:POSITION"] = "50.0E+0"
+    for ch in channels:
+        settings[f"{ch}:BANDWIDTH"] = "FULL" if tds else "200.0000E+6"
+        settings[f"{ch}:COUPLING"] = "DC"
+        settings[f"{ch}:INVERT"] = "0"
+        settings[f"{ch}:OFFSET"] = "0.0E+0"
+        settings[f"{ch}:POSITION"] = "0.0E+0"
+        settings[f"{ch}:SCALE"] = "100.0000E-3"
+        settings[f"{ch}:YUNITS"] = '"V"'
+        if tds:
+            settings[f"{ch}:IMPEDANCE"] = "MEG"
+            settings[f"{ch}:PROBE"] = "1.0E+0"
+        else:
+            settings[f"{ch}:LABEL"] = '""'
+            settings[f"{ch}:TERMINATION"] = "1.0E+6"
+            settings[f"{ch}:PROBE:GAIN"] = "1.0E+0"
+    settings.update(
+        {
+            "TRIGGER:A:MODE": "AUTO",
+            "TRIGGER:A:TYPE": "EDGE",
+            "TRIGGER:A:LEVEL": "0.0E+0",
+            "TRIGGER:A:HOLDOFF:TIME": "20.0000E-9",
+            "TRIGGER:A:EDGE:SOURCE": "CH1",
+            "TRIGGER:A:EDGE:COUPLING": "DC",
+            "TRIGGER:A:EDGE:SLOPE": "RISE",
+        }
+    )
+    if tds:
+        settings.update(
+            {
+                "TRIGGER:A:LOGIC:CLASS": "PATTERN",
+                "TRIGGER:A:LOGIC:INPUT1:SOURCE": "CH1",
+                "TRIGGER:A:LOGIC:INPUT1:LOGICLEVEL": "HIGH",
+                "TRIGGER:A:LOGIC:INPUT1:THRESHOLD": "0.0E+0",
+                "TRIGGER:A:LOGIC:INPUT2:SOURCE": "CH2",
+                "TRIGGER:A:LOGIC:INPUT2:LOGICLEVEL": "HIGH",
+                "TRIGGER:A:LOGIC:INPUT2:SLOPE": "RISE",
+                "TRIGGER:A:LOGIC:INPUT2:THRESHOLD": "0.0E+0",
+                "TRIGGER:A:LOGIC:PATTERN:FUNCTION": "AND",
+                "TRIGGER:A:LOGIC:PATTERN:WHEN": "TRUE",
+                "TRIGGER:A:LOGIC:PATTERN:DELTATIME": "8.0000E-9",
+                "TRIGGER:A:LOGIC:STATE:WHEN": "TRUE",
+                "TRIGGER:A:PULSE:CLASS": "WIDTH",
+                "TRIGGER:A:PULSE:SOURCE": "CH1",
+                "TRIGGER:A:PULSE:WIDTH:POLARITY": "POSITIVE",
+                "TRIGGER:A:PULSE:WIDTH:WHEN": "LESSTHAN",
+                "TRIGGER:A:PULSE:WIDTH:WIDTH": "8.0000E-9",
+                "TRIGGER:A:PULSE:RUNT:POLARITY": "POSITIVE",
+                "TRIGGER:A:PULSE:RUNT:THRESHOLD:HIGH": "2.0E+0",
+                "TRIGGER:A:PULSE:RUNT:THRESHOLD:LOW": "800.0000E-3",
+                "TRIGGER:A:PULSE:RUNT:WHEN": "OCCURS",
+                "TRIGGER:A:PULSE:RUNT:WIDTH": "8.0000E-9",
+                "TRIGGER:A:PULSE:SLEWRATE:DELTATIME": "8.0000E-9",
+                "TRIGGER:A:PULSE:SLEWRATE:POLARITY": "POSITIVE",
+                "TRIGGER:A:PULSE:SLEWRATE:SLEWRATE": "150.0000E+6",
+                "TRIGGER:A:PULSE:SLEWRATE:THRESHOLD:HIGH": "2.0E+0",
+                "TRIGGER:A:PULSE:SLEWRATE:THRESHOLD:LOW": "800.0000E-3",
+                "TRIGGER:A:PULSE:SLEWRATE:WHEN": "FASTER",
+            }
+        )
+    else:
+        for ch in channels:
+            settings[f"TRIGGER:A:LEVEL:{ch}"] = "0.0E+0"
+        settings["TRIGGER:A:LOGIC:FUNCTION"] = "AND"
+        for ch in channels:
+            settings[f"TRIGGER:A:LOGIC:INPUT:{ch}"] = "X"
+        for ch in channels:
+            settings[f"TRIGGER:A:LOGIC:THRESHOLD:{ch}"] = "0.0E+0"
+        settings.update(
+            {
+                "TRIGGER:A:LOGIC:INPUT:CLOCK:SOURCE": "NONE",
+                "TRIGGER:A:LOGIC:INPUT:CLOCK:EDGE": "RISE",
+                "TRIGGER:A:LOGIC:PATTERN:WHEN": "TRUE",
+                "TRIGGER:A:LOGIC:PATTERN:DELTATIME": "8.0000E-9",
+            }
+        )
+    settings.update(
+        {
+            "TRIGGER:B:STATE": "0",
+            "TRIGGER:B:BY": "TIME",
+            "TRIGGER:B:TIME": "16.0000E-9",
+            "TRIGGER:B:EVENTS:COUNT": "2",
+            "TRIGGER:B:TYPE": "EDGE",
+            "TRIGGER:B:LEVEL": "0.0E+0",
+            "TRIGGER:B:EDGE:SOURCE": "CH1",
+            "TRIGGER:B:EDGE:COUPLING": "DC",
+            "TRIGGER:B:EDGE:SLOPE": "RISE",
+        }
+    )
+    for ch in channels:
+        settings[f"SELECT:{ch}"] = "1" if ch == "CH1" else "0"
+    settings["SELECT:MATH"] = "0"
+    for ref in range(1, 5 if n_channels == 4 else 3):
+        settings[f"SELECT:REF{ref}"] = "0"
+    if not tds:
+        settings["SELECT:BUS1"] = "0"
+        settings["SELECT:BUS2"] = "0"
+    if prof.rf:
+        for trace in ["NORMAL", "MINHOLD", "MAXHOLD", "AVERAGE"]:
+            settings[f"SELECT:RF_{trace}"] = "0"
+    settings["SELECT:CONTROL"] = "CH1"
+    settings["MATH:DEFINE"] = '"CH1+CH2"'
+    for slot in range(1, prof.n_slots + 1):
+        settings[f"MEASUREMENT:MEAS{slot}:TYPE"] = "PERIOD"
+        settings[f"MEASUREMENT:MEAS{slot}:SOURCE1"] = "CH1"
+        settings[f"MEASUREMENT:MEAS{slot}:STATE"] = "0"
+    settings["MEASUREMENT:IMMED:TYPE"] = "PERIOD"
+    settings["MEASUREMENT:IMMED:SOURCE1"] = "CH1"
+    settings["DATA:SOURCE"] = "CH1"
+    settings["DATA:START"] = "1"
+    settings["DATA:STOP"] = "10000"
+    settings["DATA:ENCDG"] = "RIBINARY"
+    settings["DATA:WIDTH"] = "1"
+    if prof.dvm:
+        settings["DVM:MODE"] = "OFF"
+        settings["DVM:SOURCE"] = "CH1"
+    if prof.rf:
+        settings.update(
+            {
+                "RF:FREQUENCY": "1.5000E+9",
+                "RF:SPAN": "3.0000E+9",
+                "RF:RBW:MODE": "AUTO",
+                "RF:RBW": "3.0000E+6",
+                "RF:SPANRBWRATIO": "1.0000E+3",
+                "RF:REFLEVEL": "0.0E+0",
+                "RF:POSITION": "0.0E+0",
+                "RF:SCALE": "10.0000E+0",
+                "RF:UNITS": "DBM",
+                "RF:WINDOW": "KAISER",
+                "RF:LABEL": '""',
+            }
+        )
+    return settings
+
+
+def read_only(prof):
+    """Query-only headers and their responses"""
+    values = {"HORIZONTAL:SAMPLERATE": "2.5000E+9", "RF:CLIPPING": "0"}
+    for ch in range(1, prof.n_channels + 1):
+        values[f"CH{ch}:ID"] = '"No Probe"'
+        values[f"CH{ch}:PROBE:MODEL"] = '"No Probe"'
+        values[f"CH{ch}:PROBE:RESISTANCE"] = "1.0E+6"
+    values["POWER:BATTERY:GASGAUGE"] = "15"
+    for feature, value in prof.configuration.items():
+        values[f"CONFIGURATION:{feature}"] = str(value)
+    return values
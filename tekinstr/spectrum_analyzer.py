@@ -1,12 +1,53 @@
 """Base Spectrum Analyzer definition"""
 import re
 from datetime import datetime
+from functools import lru_cache
 import numpy as np
-from tekinstr.common import validate
+from tekinstr.capability import Range
+from tekinstr.common import validate, atomic
+from tekinstr.scpi import ScpiProperty
 from tekinstr.instrument import Instrument
+from tekinstr.stream import Spectrogram
 from waveformDT.waveform import WaveformDT
 
 
+def _rf_source(trace):
+    """Data source of a trace such as 'normal' or 'max hold'"""
+    return "RF_" + trace.upper().replace("MIN ", "MIN").replace("MAX ", "MAX")
+
+
+@lru_cache(maxsize=None)
+def _db_unit(vertical_unit):
+    """(scale, reference in watts, label) of a dB vertical unit such as DBM"""
+    match = re.match("^DB(?P<prefix>[UM])(?P<unit>[AVW])*$", vertical_unit)
+    prefix = "m" if match.group("prefix") == "M" else "µ"
+    unit = "W" if match.group("unit") is None else match.group("unit")
+    scale = 10 if unit == "W" else 20
+    ref = 1e-3 if prefix == "m" else 1e-6
+    return scale, ref, "dB" + prefix + unit
+
+
+def _stitch(segments, step):
+    """Join segments on a common grid, each point taken from the nearest segment
+
+    Args:
+        segments (numpy.ndarray): one row per segment, each starting step points
+            after the previous one
+        step (int): points between the starts of consecutive segments
+    Returns:
+        (numpy.ndarray)
+    """
+    n_segments, n_points = segments.shape
+    index = step * np.arange(n_segments)[:, None] + np.arange(n_points)
+    # boundaries in the middle of the overlaps
+    bounds = step * np.arange(n_segments + 1) + (n_points - 1 - step) // 2
+    bounds[0], bounds[-1] = 0, index[-1, -1] + 1
+    keep = (index >= bounds[:-1, None]) & (index < bounds[1:, None])
+    stitched = np.empty(bounds[-1], segments.dtype)
+    stitched[index[keep]] = segments[keep]
+    return stitched
+
+
 class SpectrumAnalyzerBase(Instrument, kind="Base Spectrum Analyzer"):
     """Spectrum analyzer instrument
 
@@ -15,6 +56,19 @@ class SpectrumAnalyzerBase(Instrument, kind="Base Spectrum Analyzer"):
         visa (pyvisa.resources.Resource): pyvisa resource
     """
 
+    def __init__(self, instr):
+        super().__init__(instr)
+        self._settings = self._visa.settings_cache()  # for the dB conversion
+
+    def _vertical_unit(self):
+        """Vertical unit as last read unless written since"""
+        try:
+            return self._settings["RF:UNITS"]
+        except KeyError:
+            unit = self._settings["RF:UNITS"] = self._visa.query("RF:UNITS?")
+            return unit
+
+    @atomic
     def _get_wfmpre(self, inout=""):
         self._visa.write("HEADER ON")
         pre_str = self._visa.query(f"WFM{inout}PRE?").replace(f":WFM{inout}PRE:", "")
@@ -33,6 +87,7 @@ class SpectrumAnalyzerBase(Instrument, kind="Base Spectrum Analyzer"):
         self._visa.write("HEADER OFF")
         return preamble
 
+    @atomic
     def _get_select(self):
         """Get the current display selection"""
         self._visa.write("HEADER ON")
@@ -66,105 +121,73 @@ class SpectrumAnalyzerBase(Instrument, kind="Base Spectrum Analyzer"):
         for tr in traces - displayed_traces:
             self._visa.write(f"SELECT:RF_{tr} ON")
 
-    @property
-    def center_frequency(self):
-        """value (float): center frequency in hertz"""
-        return float(self._visa.query("RF:FREQUENCY?"))
-
-    @center_frequency.setter
-    @validate
-    def center_frequency(self, value):
-        self._visa.write(f"RF:FREQUENCY {float(value)}")
-
-    @property
-    def span(self):
-        """value (float): span"""
-        return float(self._visa.query("RF:SPAN?"))
-
-    @span.setter
-    @validate
-    def span(self, value):
-        self._visa.write(f"RF:SPAN {float(value)}")
-
-    @property
-    def rbw_mode(self):
-        """value (str): resolution bandwidth (rbw) mode; AUTO or MANUAL"""
-        return self._visa.query("RF:RBW:MODE?")
-
-    @rbw_mode.setter
-    @validate
-    def rbw_mode(self, value):
-        self._visa.write(f"RF:RBW:MODE {value}")
-
-    @property
-    def rbw(self):
-        """value (float): resolution bandwidth"""
-        return float(self._visa.query("RF:RBW?"))
-
-    @rbw.setter
-    @validate
-    def rbw(self, value):
-        self._visa.write(f"RF:RBW {value}")
-
-    @property
-    def rbw_ratio(self):
-        """value (float): ration of span to resolution bandwidth"""
-        return float(self._visa.query("RF:SPANRBWRATIO?"))
-
-    @rbw_ratio.setter
-    @validate
-    def rbw_ratio(self, value):
-        self._visa.write(f"RF:SPANRBWRATIO {float(value)}")
-
-    @property
-    def ref_level(self):
-        """value (float): reference level"""
-        return float(self._visa.query("RF:REFLEVEL?"))
-
-    @ref_level.setter
-    @validate
-    def ref_level(self, value):
-        self._visa.write(f"RF:REFLEVEL {value}")
-
-    @property
-    def vertical_position(self):
-        """value (float): vertical position"""
-        return float(self._visa.query("RF:POSITION?"))
-
-    @vertical_position.setter
-    @validate
-    def vertical_position(self, value):
-        self._visa.write(f"RF:POSITION {float(value)}")
-
-    @property
-    def vertical_scale(self):
-        """value (float): vertical_unit per division"""
-        return float(self._visa.query("RF:SCALE?"))
-
-    @vertical_scale.setter
-    @validate
-    def vertical_scale(self, value):
-        self._visa.write(f"RF:SCALE {float(value)}")
+    center_frequency = ScpiProperty(
+        "RF:FREQUENCY",
+        float,
+        float,
+        doc="value (float): center frequency in hertz",
+    )
+
+    span = ScpiProperty(
+        "RF:SPAN",
+        float,
+        float,
+        doc="value (float): span",
+    )
+
+    rbw_mode = ScpiProperty(
+        "RF:RBW:MODE",
+        doc="value (str): resolution bandwidth (rbw) mode; AUTO or MANUAL",
+    )
+
+    rbw = ScpiProperty(
+        "RF:RBW",
+        float,
+        doc="value (float): resolution bandwidth",
+    )
+
+    rbw_ratio = ScpiProperty(
+        "RF:SPANRBWRATIO",
+        float,
+        float,
+        doc="value (float): ration of span to resolution bandwidth",
+    )
+
+    ref_level = ScpiProperty(
+        "RF:REFLEVEL",
+        float,
+        doc="value (float): reference level",
+    )
+
+    vertical_position = ScpiProperty(
+        "RF:POSITION",
+        float,
+        float,
+        doc="value (float): vertical position",
+    )
+
+    vertical_scale = ScpiProperty(
+        "RF:SCALE",
+        float,
+        float,
+        doc="value (float): vertical_unit per division",
+    )
 
     @property
     def vertical_unit(self):
         """value (str): vertical unit; dBm, dBuw, etc."""
-        return self._visa.query("RF:UNITS?")
+        unit = self._settings["RF:UNITS"] = self._visa.query("RF:UNITS?", cache=True)
+        return unit
 
     @vertical_unit.setter
     @validate
     def vertical_unit(self, value):
         self._visa.write(f"RF:UNITS {value}")
 
-    @property
-    def window(self):
-        """value (str): window function"""
-        return self._visa.query("RF:WINDOW?")
-
-    @window.setter
-    @validate
-    def window(self, value):
-        self._visa.write(f"RF:WINDOW {value}")
+    window = ScpiProperty(
+        "RF:WINDOW",
+        doc="value (str): window function",
+    )
 
     @property
     def label(self):
@@ -176,30 +199,61 @@ class SpectrumAnalyzerBase(Instrument, kind="Base Spectrum Analyzer"):
     def label(self, value):
         self._visa.write(f"RF:LABEL '{value}'")
 
-    def read(self, dB=True, wdt=True):
+    @atomic
+    def read(self, dB=True, wdt=True, traces=None, dtype=np.float32, out=None):
         """Transfer RF spectrum
 
+        The traces share the preamble of the first one and are transferred back to
+        back.
+        >>> tek.spectrum_analyzer.trace = ["normal", "max hold"]
+        >>> spectra = tek.spectrum_analyzer.read(traces=["normal", "max hold"])
+
+        Without wdt, each trace takes one transaction and the vertical unit is that
+        of the last read unless the session has written since, e.g. restore. The dB
+        conversion is done in place, so polling into the same out doesn't allocate.
+        >>> spectrum = np.empty(1000, np.float32)
+        >>> while True:
+        ...     tek.spectrum_analyzer.read(wdt=False, out=spectrum)
+
         Args:
             dB (bool): scale data in dB if True, otherwise unit is watts
             wdt (bool): return data as WaveformDT, otherwise Numpy ndarray
+            traces (list): traces such as 'normal', 'average', 'max hold' or
+                'min hold', e.g. the displayed trace; None for the normal trace
+            dtype (numpy.dtype): float32 or float64; ignored if out is given
+            out (ndarray): array to put the data in, of the shape of the result
         Returns:
-            (ndarray or WaveformDT)
+            (ndarray or WaveformDT): one row per trace if traces is given; a view
+                of out if given
         """
-        self._visa.write("DATA:SOURCE RF_NORMAL")
-        preamble = self._get_wfmpre("OUT")
-        time = self._visa.query("TIME?")
-        date = self._visa.query("DATE?")
-        data = self._visa.query_binary_values(
-            "CURVE?", is_big_endian=True, container=np.ndarray
-        )
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-locals
+        if traces is None:
+            sources = ["RF_NORMAL"]
+        else:
+            traces = sorted(traces) if isinstance(traces, set) else traces
+            sources = [_rf_source(trace) for trace in traces]
+        messages = [f"DATA:SOURCE {source};:CURVE?" for source in sources]
+        if wdt:
+            self._visa.write(f"DATA:SOURCE {sources[0]}")
+            preamble = self._get_wfmpre("OUT")
+            response = self._visa.query("RF:UNITS?;:TIME?;:DATE?")
+            self._settings["RF:UNITS"], time, date = response.split(";")
+            messages[0] = "CURVE?"
+        for i, message in enumerate(messages):
+            rawdata = self._visa.query_binary_values(
+                message, is_big_endian=True, container=np.ndarray
+            )
+            if out is None:
+                n_traces = () if traces is None else (len(sources),)
+                out = np.empty(n_traces + rawdata.shape, dtype)
+            np.copyto(out if traces is None else out[i], rawdata)
+        data = out
         if dB:
-            match = re.match("^DB(?P<prefix>[UM])(?P<unit>[AVW])*$", self.vertical_unit)
-            prefix = "m" if match.group("prefix") == "M" else "µ"
-            unit = "W" if match.group("unit") is None else match.group("unit")
-            y_unit = "dB" + prefix + unit
-            scale = 10 if unit == "W" else 20
-            ref = 1e-3 if prefix == "m" else 1e-6
-            data = scale * np.log10(data / ref)
+            scale, ref, y_unit = _db_unit(self._vertical_unit())
+            np.divide(data, ref, out=data)
+            np.log10(data, out=data)
+            np.multiply(data, scale, out=data)
         else:
             y_unit = "W"
         if wdt:
@@ -213,6 +267,108 @@ class SpectrumAnalyzerBase(Instrument, kind="Base Spectrum Analyzer"):
             setattr(data, "y_unit", y_unit)
         return data
 
+    def spectrogram(self, rows=1000, trace="normal", path=None):
+        """Capture the spectra of successive acquisitions in a ring buffer
+
+        >>> with tek.spectrum_analyzer.spectrogram(rows=10000, path="hop.npy") as sg:
+        ...     time.sleep(60)
+        ...     times, spectra = sg.series()
+
+        Args:
+            rows (int): spectra kept
+            trace (str): 'normal', 'average', 'max hold' or 'min hold'
+            path (str): .npy file to memory map the ring to; None to keep it in
+                memory
+        Returns:
+            (Spectrogram): see frequencies and series
+        """
+        return Spectrogram(self, rows, trace, path=path)
+
+    @atomic
+    def sweep(self, start, stop, rbw, max_span=None, overlap=0.1, dB=True, wdt=True):
+        """Survey a band wider than the span in steps of the center frequency
+
+        The span is the band or max_span if narrower, and the steps are the fewest
+        whose segments overlap by at least overlap of the span, a whole number of
+        points apart, so the segments are joined on one grid taking each point
+        from the segment whose center is nearest. Each step is a single sequence
+        started with the new center frequency in one write; the next one is
+        started before the segment just transferred is converted. The settings
+        are restored afterwards. The band and the last center frequency are checked
+        against the model's frequency range, as the instrument would clamp them.
+        >>> spectrum = tek.spectrum_analyzer.sweep(0, 3e9, rbw=1e6, max_span=500e6)
+
+        Args:
+            start (float): first frequency in hertz
+            stop (float): last frequency in hertz
+            rbw (float): resolution bandwidth in hertz
+            max_span (float): widest span in hertz; None for that of the model
+            overlap (float): fraction of the span shared by consecutive segments
+            dB (bool): scale data in dB if True, otherwise unit is watts
+            wdt (bool): return data as WaveformDT, otherwise Numpy ndarray
+        Returns:
+            (ndarray or WaveformDT): spectrum from start to stop
+        """
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-locals
+        # pylint: disable=protected-access
+        if not 0 <= overlap < 1:
+            raise ValueError("overlap must be at least 0 and less than 1")
+        if not start < stop:
+            raise ValueError("stop must be above start")
+        frequency = self._instr._capabilities.get("RF:FREQUENCY", float)
+        span_rule = self._instr._capabilities.get("RF:SPAN", float)
+        frequency(start)
+        frequency(stop)
+        if max_span is None:
+            if not isinstance(span_rule, Range):
+                raise ValueError("max_span is required for this model")
+            max_span = span_rule.maximum
+        span = span_rule(min(max_span, stop - start))
+        state = self._instr.snapshot()
+        try:
+            self._visa.write(
+                f"RF:SPAN {span};:RF:RBW:MODE MANUAL;:RF:RBW {rbw};"
+                f":RF:FREQUENCY {start + span / 2};:ACQUIRE:STOPAFTER SEQUENCE;"
+                ":DATA:SOURCE RF_NORMAL"
+            )
+            preamble = self._get_wfmpre("OUT")
+            y_unit = "W"
+            if dB:
+                scale, ref, y_unit = _db_unit(self._vertical_unit())
+            n_points, df = preamble["NR_PT"], preamble["XINCR"]
+            step = max(int((n_points - 1) * (1 - overlap)), 1)
+            n_segments = 1 + max(int(np.ceil((stop - start - span) / (step * df))), 0)
+            centers = start + span / 2 + step * df * np.arange(n_segments)
+            try:
+                frequency(centers[-1])
+            except ValueError:
+                raise ValueError(
+                    f"the last center frequency {centers[-1]} is out of range"
+                ) from None
+            segments = np.empty((n_segments, n_points), np.float32)
+            self._visa.write("ACQUIRE:STATE RUN")
+            for i, segment in enumerate(segments):
+                self._visa.query("*OPC?")
+                self.read(dB=False, wdt=False, traces=["normal"], out=segment[None])
+                if i + 1 < n_segments:
+                    self._visa.write(
+                        f"RF:FREQUENCY {centers[i + 1]};:ACQUIRE:STATE RUN"
+                    )
+                if dB:
+                    np.divide(segment, ref, out=segment)
+                    np.log10(segment, out=segment)
+                    np.multiply(segment, scale, out=segment)
+        finally:
+            self._instr.restore(state)
+        data = _stitch(segments, step)[: int(round((stop - start) / df)) + 1]
+        if wdt:
+            data = WaveformDT(data, df, datetime.now())
+            setattr(data, "wf_start_offset", start)
+            setattr(data, "x_unit", preamble["XUNIT"])
+            setattr(data, "y_unit", y_unit)
+        return data
+
     @property
     def clipping(self):
         """(bool): RF input clipping"""
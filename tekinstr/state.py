@@ -0,0 +1,190 @@
+"""Instrument setup state"""
+import math
+from collections.abc import Mapping
+
+
+def _split_message(message):
+    """Split a program message into its message units
+
+    Semicolons within quoted strings do not separate message units.
+    """
+    units = []
+    quote = None
+    start = 0
+    for i, c in enumerate(message):
+        if quote is not None:
+            if c == quote:
+                quote = None
+        elif c in "\"'":
+            quote = c
+        elif c == ";":
+            units.append(message[start:i])
+            start = i + 1
+    units.append(message[start:])
+    return [unit.strip() for unit in units if unit.strip()]
+
+
+def _parse_value(value):
+    """Convert an argument string to int, float or unquoted str"""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value.strip("\"'")
+
+
+def message_units(message):
+    """Split a program message into message units with absolute headers
+
+    Headers that don't begin with ':' are relative to the path of the preceding
+    header, e.g. ':ACQUIRE:MODE SAMPLE;NUMAVG 16' sets ACQUIRE:MODE and
+    ACQUIRE:NUMAVG.
+
+    Args:
+        message (str): program message
+    Returns:
+        (list): (header, argument string) tuples; query headers end with '?'
+    """
+    units = []
+    path = ""
+    for unit in _split_message(message.strip()):
+        header, _, args = unit.partition(" ")
+        header = header.upper()
+        if header.startswith("*"):
+            units.append((header, args.strip()))
+            continue
+        if header.startswith(":"):
+            header = header[1:]
+        else:
+            header = path + header
+        path = header.rsplit(":", maxsplit=1)[0] + ":" if ":" in header else ""
+        units.append((header, args.strip()))
+    return units
+
+
+def parse_program_message(message):
+    """Parse a program message, such as the response to SET?, into settings
+
+    Args:
+        message (str): program message
+    Returns:
+        (dict): header -> argument string, in message order
+    """
+    return dict(message_units(message))
+
+
+def _same_value(value, other):
+    """Compare two argument strings, e.g. '0.5' and '5.0000E-01' or 'ON' and '1'"""
+    value, other = _parse_value(value), _parse_value(other)
+    if isinstance(value, str) or isinstance(other, str):
+        booleans = {"ON": "1", "OFF": "0"}
+        value = str(value).upper()
+        other = str(other).upper()
+        return booleans.get(value, value) == booleans.get(other, other)
+    return math.isclose(value, other, rel_tol=1e-6)
+
+
+def _same_mnemonic(mnemonic, key_mnemonic):
+    """Short form mnemonics are the leading characters of the long form"""
+    if mnemonic[-1].isdigit():
+        return mnemonic == key_mnemonic
+    return key_mnemonic.startswith(mnemonic)
+
+
+def find_header(headers, header):
+    """Find the header in headers that header is the long or short form of
+
+    Args:
+        headers (iterable): absolute long form headers such as 'CH1:TERMINATION'
+        header (str): header in long or short form, e.g. 'CH1:TER'
+    Returns:
+        (str or None): the matching header of headers
+    """
+    mnemonics = header.split(":")
+    for key in headers:
+        key_mnemonics = key.split(":")
+        if len(key_mnemonics) == len(mnemonics) and all(
+            map(_same_mnemonic, mnemonics, key_mnemonics)
+        ):
+            return key
+    return None
+
+
+class InstrumentState(Mapping):
+    """Instrument settings as returned by the SET? query
+
+    Values are parsed to int, float or str. Two states can be compared with
+    `diff` and the state is restored by sending `str(state)` to the instrument.
+
+    Attributes:
+        message (str): response to SET? or a program message
+    """
+
+    def __init__(self, message):
+        self._settings = parse_program_message(message)
+
+    def __getitem__(self, header):
+        return _parse_value(self._settings[header.upper().lstrip(":")])
+
+    def __iter__(self):
+        return iter(self._settings)
+
+    def __len__(self):
+        return len(self._settings)
+
+    def lookup(self, header):
+        """Get the argument string of header
+
+        Args:
+            header (str): header in long or short form, e.g. 'CH1:TER'
+        Returns:
+            (str or None): None if header isn't in the state
+        """
+        header = header.upper().lstrip(":")
+        if header in self._settings:
+            return self._settings[header]
+        key = find_header(self._settings, header)
+        return None if key is None else self._settings[key]
+
+    def matches(self, command):
+        """Check if command would leave the state unchanged
+
+        Args:
+            command (str): command such as 'CH1:SCALE 0.5'
+        Returns:
+            (bool)
+        """
+        header, _, args = command.strip().partition(" ")
+        current = self.lookup(header)
+        if current is None or not args:
+            return False
+        return _same_value(args.strip(), current)
+
+    def diff(self, other):
+        """Settings that differ between this state and other
+
+        Args:
+            other (InstrumentState)
+        Returns:
+            (dict): header -> (value in self, value in other); None if missing
+        """
+        changes = {}
+        for header in list(self) + [h for h in other if h not in self]:
+            value = self.get(header)
+            other_value = other.get(header)
+            if value != other_value:
+                changes[header] = (value, other_value)
+        return changes
+
+    def __str__(self):
+        units = []
+        for header, args in self._settings.items():
+            header = header if header.startswith("*") else ":" + header
+            units.append(f"{header} {args}".strip())
+        return ";".join(units)
+
+    def __repr__(self):
+        return f"<InstrumentState with {len(self)} settings>"
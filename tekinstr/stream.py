@@ -0,0 +1,571 @@
+"""Continuous acquisition streaming"""
+import asyncio
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from waveformDT.waveform import WaveformDT
+
+_END = object()
+
+
+class _Error:
+    """Exception raised in the producer, re-raised to the consumer"""
+
+    def __init__(self, exc):
+        self.exc = exc
+
+
+class Stream:
+    """Iterator of the waveforms of continuous acquisitions
+
+    The oscilloscope acquires continuously while a thread reads the latest
+    acquisition whenever ACQUIRE:NUMACQ? has advanced and puts it in a bounded
+    queue. Acquisitions that complete while a waveform is transferred are missed,
+    and the waveforms of several channels may come from consecutive acquisitions.
+    The preambles are read once, so the settings must not be changed while
+    streaming.
+
+    Attributes:
+        oscilloscope (OscilloscopeBase)
+        channels (list): channels such as ['CH1', 'CH2']
+        samples ('all', int or tuple): see OscilloscopeBase.read
+        maxsize (int): size of the queue
+        policy (str): when the queue is full, 'block' waits for the consumer and
+            'drop' discards the oldest waveform
+        timeout (float): seconds to wait for an acquisition, None for no timeout
+        interval (float): polling interval of ACQUIRE:NUMACQ? in seconds
+        wdt (bool): If true, yield data as WaveformDT.
+        sequence (int): number of acquisitions since the stream started, counted
+            with ACQUIRE:NUMACQ?
+        missed (int): acquisitions that weren't transferred
+        dropped (int): waveforms discarded by the 'drop' policy
+    Yields:
+        (tuple): (sequence number, waveform)
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        oscilloscope,
+        channels,
+        samples="all",
+        maxsize=8,
+        policy="block",
+        timeout=10,
+        interval=1e-3,
+        wdt=True,
+    ):
+        if policy not in ["block", "drop"]:
+            raise ValueError(f"policy {policy} is not 'block' or 'drop'")
+        self._osc = oscilloscope
+        self._visa = oscilloscope._visa
+        self._channels = channels
+        self._samples = samples
+        self._policy = policy
+        self._timeout = timeout
+        self._interval = interval
+        self._wdt = wdt
+        self._queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self.missed = 0
+        self.dropped = 0
+        self.sequence = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        """(bool): the producer thread is running"""
+        return self._thread.is_alive()
+
+    def _run(self):
+        # pylint: disable=protected-access
+        restore = None
+        try:
+            with self._visa.locked():
+                restore = [
+                    f"ACQUIRE:STOPAFTER {self._visa.query('ACQUIRE:STOPAFTER?')}",
+                    f"ACQUIRE:STATE {self._visa.query('ACQUIRE:STATE?')}",
+                ]
+                self._osc._set_data(self._samples)
+                preambles = []
+                for channel in self._channels:
+                    self._visa.write(f"DATA:SOURCE {channel}")
+                    preambles.append(self._osc._get_wfmpre())
+                self._visa.write("ACQUIRE:STOPAFTER RUNSTOP")
+                self._visa.write("ACQUIRE:STATE RUN")
+                # acquisitions before the stream, if it was already running
+                last = int(self._visa.query("ACQUIRE:NUMACQ?"))
+            while not self._stop.is_set():
+                count = self._wait(last)
+                if count is None:
+                    break
+                # the count restarts from 0 when a setting changes
+                acquisitions = count - last if count > last else count
+                self.sequence += acquisitions
+                self.missed += acquisitions - 1
+                last = count
+                self._put((self.sequence, self._transfer(preambles)))
+        except Exception as exc:  # pylint: disable=broad-except
+            self._put(_Error(exc))
+        finally:
+            if restore is not None:
+                try:
+                    for command in restore:
+                        self._visa.write(command)
+                except Exception:  # pylint: disable=broad-except
+                    pass
+            self._put(_END)
+
+    def _wait(self, last):
+        """Poll ACQUIRE:NUMACQ? until it passes last
+
+        Returns:
+            (int or None): the acquisition count, None if stopped
+        """
+        start = time.monotonic()
+        while not self._stop.is_set():
+            count = int(self._visa.query("ACQUIRE:NUMACQ?"))
+            if count != last:
+                return count
+            if self._timeout is not None and time.monotonic() - start > self._timeout:
+                raise TimeoutError(f"no acquisition within {self._timeout} s")
+            time.sleep(self._interval)
+        return None
+
+    def _transfer(self, preambles):
+        """Read the waveforms of the latest acquisition"""
+        t0 = datetime.now()
+        data = []
+        with self._visa.locked():
+            for channel, preamble in zip(self._channels, preambles):
+                if len(self._channels) > 1:
+                    self._visa.write(f"DATA:SOURCE {channel}")
+                rawdata = self._visa.query_binary_values(
+                    "CURVE?", "b", container=np.ndarray
+                )
+                data.append(
+                    preamble["YZERO"] + preamble["YMULT"] * (rawdata - preamble["YOFF"])
+                )
+        data = data[0] if len(data) == 1 else np.asarray(data)
+        if self._wdt:
+            preamble = preambles[0]  # the channels share the time axis
+            data = WaveformDT(
+                data, preamble["XINCR"], t0 + timedelta(seconds=preamble["XZERO"])
+            )
+            setattr(data, "wf_start_offset", preamble["XZERO"])
+            setattr(data, "_xunit", preamble["XUNIT"])
+            setattr(data, "_yunit", preamble["YUNIT"])
+            setattr(data, "y_position", preamble["YOFF"] * preamble["YMULT"])
+            setattr(data, "y_offset", preamble["YZERO"])
+        return data
+
+    def _put(self, item):
+        """Put item in the queue according to the policy"""
+        if self._policy == "drop" and not isinstance(item, _Error) and item is not _END:
+            self.dropped += self._put_nowait(item)
+            return
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        if item is _END:
+            # a consumer waiting in _get is woken even once closed
+            self._put_nowait(item)
+
+    def _put_nowait(self, item):
+        """Put item in the queue, discarding the oldest items to make room
+
+        Returns:
+            (int): number of items discarded
+        """
+        discarded = 0
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return discarded
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    discarded += 1
+                except queue.Empty:
+                    pass
+
+    def _get(self):
+        item = self._queue.get()
+        if isinstance(item, _Error):
+            self._stop.set()
+            raise item.exc
+        return item
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._stop.is_set() and self._queue.empty():
+            raise StopIteration
+        item = self._get()
+        if item is _END:
+            self._stop.set()
+            raise StopIteration
+        return item
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._stop.is_set() and self._queue.empty():
+            raise StopAsyncIteration
+        item = await asyncio.get_running_loop().run_in_executor(None, self._get)
+        if item is _END:
+            self._stop.set()
+            raise StopAsyncIteration
+        return item
+
+    def close(self):
+        """Stop streaming and restore the acquisition settings"""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<Stream of {', '.join(self._channels)}>"
+
+
+def _locate(tail, chunk, expected):
+    """Find the samples of chunk that follow tail
+
+    Args:
+        tail (numpy.ndarray): the latest samples of the previous pull
+        chunk (numpy.ndarray): the latest samples of this pull
+        expected (int): index of the first new sample estimated from the elapsed time
+    Returns:
+        (int or None): index of the first new sample, None if tail isn't in chunk
+    """
+    if len(tail) > len(chunk):
+        return None
+    windows = np.lib.stride_tricks.sliding_window_view(chunk, len(tail))
+    ends = np.flatnonzero((windows == tail).all(axis=1)) + len(tail)
+    if len(ends) == 0:
+        return None
+    return int(ends[np.argmin(abs(ends - expected))])
+
+
+class Roll:
+    """Gapless time series of slow signals acquired in roll mode
+
+    In roll mode the samples scroll through the record as they're acquired. A
+    thread reads only the latest samples of the record every interval seconds and
+    locates the last overlap samples of the previous read in them to append just
+    the new ones to a ring buffer, so no samples are lost or repeated as long as
+    interval is well below the time span of the record. Slower reads, or
+    samples that can't be located, are counted as gaps.
+
+    Attributes:
+        oscilloscope (OscilloscopeBase)
+        channels (list): channels such as ['CH1', 'CH2']
+        scale (float): time base in s/div; roll mode requires 40 ms/div or slower
+        capacity (int): samples kept per channel, taking 8 bytes each
+        interval (float): seconds between reads
+        overlap (int): samples of the previous read located in the next one
+        n_samples (int): samples appended since the start, including those no
+            longer kept
+        gaps (int): reads that couldn't be joined with the previous one
+    """
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        oscilloscope,
+        channels,
+        scale=0.1,
+        capacity=1000000,
+        interval=0.1,
+        overlap=256,
+    ):
+        self._osc = oscilloscope
+        self._visa = oscilloscope._visa
+        self._channels = channels
+        self._scale = scale
+        self._interval = interval
+        self._overlap = overlap
+        self._buffer = np.zeros((len(channels), capacity))
+        self._counts = [0] * len(channels)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = None
+        self._dt = None
+        self._error = None
+        self.gaps = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def n_samples(self):
+        """(int): samples appended per channel since the start"""
+        return min(self._counts)
+
+    @property
+    def running(self):
+        """(bool): the reading thread is running"""
+        return self._thread.is_alive()
+
+    def _run(self):
+        # pylint: disable=protected-access
+        state = None
+        try:
+            with self._visa.locked():
+                state = self._osc._instr.snapshot()
+                self._visa.write("ACQUIRE:STATE STOP")
+                self._visa.write("ACQUIRE:STOPAFTER RUNSTOP")
+                self._visa.write("HORIZONTAL:ROLL AUTO")
+                self._visa.write(f"HORIZONTAL:SCALE {self._scale}")
+                self._visa.write("TRIGGER:A:MODE AUTO")
+                self._visa.write("DATA:WIDTH 1")
+                self._visa.write("DATA:ENCDG RIBinary")
+                record_length = self._osc.record_length
+                self._visa.write(f"DATA:START 1;STOP {record_length}")
+                preambles = []
+                for channel in self._channels:
+                    self._visa.write(f"DATA:SOURCE {channel}")
+                    preambles.append(self._osc._get_wfmpre())
+                self._dt = preambles[0]["XINCR"]
+                self._visa.write("ACQUIRE:STATE RUN")
+                last = time.monotonic()
+                self._started = datetime.now()
+            tails = [None] * len(self._channels)
+            while not self._stop.wait(self._interval):
+                now = time.monotonic()
+                expected = round((now - last) / self._dt)
+                last = now
+                with self._visa.locked():
+                    for i, (channel, preamble) in enumerate(
+                        zip(self._channels, preambles)
+                    ):
+                        tails[i] = self._pull(
+                            i, channel, preamble, tails[i], expected, record_length
+                        )
+        except Exception as exc:  # pylint: disable=broad-except
+            self._error = exc
+        finally:
+            if state is not None:
+                try:
+                    self._osc._instr.restore(state)
+                except Exception:  # pylint: disable=broad-except
+                    pass
+
+    def _pull(self, index, channel, preamble, tail, expected, record_length):
+        """Read the latest samples of channel and append the new ones
+
+        Returns:
+            (numpy.ndarray): the tail for the next pull
+        """
+        # pylint: disable=too-many-arguments
+        size = min(record_length, expected + 2 * self._overlap)
+        if len(self._channels) > 1:
+            self._visa.write(f"DATA:SOURCE {channel}")
+        self._visa.write(f"DATA:START {record_length - size + 1};STOP {record_length}")
+        chunk = self._visa.query_binary_values("CURVE?", "b", container=np.ndarray)
+        if tail is None:
+            start = max(len(chunk) - expected, 0)
+        else:
+            start = _locate(tail, chunk, len(chunk) - expected)
+            if start is None:
+                self.gaps += 1
+                start = max(len(chunk) - expected, 0)
+        volts = preamble["YZERO"] + preamble["YMULT"] * (
+            chunk[start:] - preamble["YOFF"]
+        )
+        self._append(index, volts)
+        return chunk[-self._overlap :]
+
+    def _append(self, index, volts):
+        capacity = self._buffer.shape[1]
+        volts = volts[-capacity:]
+        with self._lock:
+            position = self._counts[index] % capacity
+            head = min(len(volts), capacity - position)
+            self._buffer[index, position : position + head] = volts[:head]
+            self._buffer[index, : len(volts) - head] = volts[head:]
+            self._counts[index] += len(volts)
+
+    def series(self, wdt=True):
+        """Get the samples kept so far
+
+        Args:
+            wdt (bool): If true, return data as WaveformDT.
+        Returns:
+            WaveformDT or numpy.ndarray: a copy, one row per channel if several
+        """
+        if self._error is not None:
+            raise self._error
+        capacity = self._buffer.shape[1]
+        with self._lock:
+            count = min(self._counts)
+            first = max(count - capacity, 0)
+            indices = np.arange(first, count) % capacity
+            data = self._buffer[:, indices]
+        data = data[0] if len(self._channels) == 1 else data
+        if wdt and self._started is not None:
+            t0 = self._started + timedelta(seconds=first * self._dt)
+            data = WaveformDT(data, self._dt, t0)
+        return data
+
+    def close(self):
+        """Stop reading and restore the settings"""
+        self._stop.set()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<Roll of {', '.join(self._channels)}>"
+
+
+class Spectrogram:
+    """Spectra of successive RF acquisitions in a ring buffer
+
+    A thread reads the trace whenever ACQUIRE:NUMACQ? has advanced, straight into
+    the next row of a preallocated ring of records, each the time in seconds since
+    the epoch and the spectrum in dB. The ring has one row more than rows for the
+    spectrum being read, so series doesn't wait for the transfer. The preamble is
+    read once, so the settings must not be changed while capturing.
+
+    With a path the ring is a memory-mapped .npy file of these records, so long
+    captures aren't limited by memory. The file doesn't record where the ring
+    starts, so order the records by time; rows never written have time 0:
+    >>> records = np.sort(np.load("hop.npy"), order="time")[-rows:]
+
+    Attributes:
+        spectrum_analyzer (SpectrumAnalyzerBase)
+        rows (int): spectra kept
+        trace (str): 'normal', 'average', 'max hold' or 'min hold'
+        interval (float): polling interval of ACQUIRE:NUMACQ? in seconds
+        path (str): .npy file backing the ring; None to keep it in memory
+        frequencies (numpy.ndarray): frequency of each point in hertz
+        n_rows (int): spectra captured since the start, including those no longer
+            kept
+        missed (int): acquisitions that weren't transferred
+    """
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self, spectrum_analyzer, rows=1000, trace="normal", interval=1e-3, path=None
+    ):
+        # pylint: disable=protected-access
+        self._sa = spectrum_analyzer
+        self._visa = spectrum_analyzer._visa
+        self._trace = trace
+        self._interval = interval
+        with self._visa.locked():
+            self._visa.write("DATA:SOURCE RF_NORMAL")  # the traces share the axis
+            preamble = self._sa._get_wfmpre("OUT")
+            self._sa._vertical_unit()  # kept for the dB conversion
+        n_points = preamble["NR_PT"]
+        self.frequencies = preamble["XZERO"] + preamble["XINCR"] * np.arange(n_points)
+        dtype = np.dtype([("time", "f8"), ("spectrum", "f4", (n_points,))])
+        if path is None:
+            self._buffer = np.zeros(rows + 1, dtype)
+        else:
+            self._buffer = np.lib.format.open_memmap(path, "w+", dtype, (rows + 1,))
+        self._rows = rows
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._error = None
+        self.n_rows = 0
+        self.missed = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        """(bool): the capturing thread is running"""
+        return self._thread.is_alive()
+
+    def _run(self):
+        restore = None
+        try:
+            with self._visa.locked():
+                restore = [
+                    f"ACQUIRE:STOPAFTER {self._visa.query('ACQUIRE:STOPAFTER?')}",
+                    f"ACQUIRE:STATE {self._visa.query('ACQUIRE:STATE?')}",
+                ]
+                self._visa.write("ACQUIRE:STOPAFTER RUNSTOP")
+                self._visa.write("ACQUIRE:STATE RUN")
+            last = 0
+            while not self._stop.wait(self._interval):
+                count = int(self._visa.query("ACQUIRE:NUMACQ?"))
+                if count == last:
+                    continue
+                if self.n_rows:
+                    self.missed += max(count - last - 1, 0)
+                last = count
+                self._capture()
+        except Exception as exc:  # pylint: disable=broad-except
+            self._error = exc
+        finally:
+            if restore is not None:
+                try:
+                    for command in restore:
+                        self._visa.write(command)
+                except Exception:  # pylint: disable=broad-except
+                    pass
+
+    def _capture(self):
+        """Read the trace into the next row"""
+        row = self.n_rows % len(self._buffer)
+        started = time.time()
+        spectrum = self._buffer["spectrum"][row : row + 1]
+        self._sa.read(wdt=False, traces=[self._trace], out=spectrum)
+        with self._lock:
+            self._buffer["time"][row] = started
+            self.n_rows += 1
+
+    def series(self):
+        """Get the spectra kept so far
+
+        Returns:
+            (tuple): times in seconds since the epoch and spectra, one row each,
+                oldest first; copies
+        """
+        if self._error is not None:
+            raise self._error
+        with self._lock:
+            first = max(self.n_rows - self._rows, 0)
+            records = self._buffer[np.arange(first, self.n_rows) % len(self._buffer)]
+        return records["time"], records["spectrum"]
+
+    def close(self):
+        """Stop capturing and restore the acquisition settings"""
+        self._stop.set()
+        self._thread.join()
+        if isinstance(self._buffer, np.memmap):
+            self._buffer.flush()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<Spectrogram of {self._trace} with {self._rows} rows>"
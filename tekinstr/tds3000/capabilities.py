@@ -0,0 +1,32 @@
+"""TDS3000 Series argument capabilities"""
+from tekinstr.capability import (
+    Choice,
+    Range,
+    Discrete,
+    AnyOf,
+    POWERS_OF_2,
+    MEASUREMENT_TYPES,
+)
+
+CAPABILITIES = {
+    "HORIZONTAL:RECORDLENGTH": Discrete([500, 10000], int),
+    "ACQUIRE:MODE": Choice("SAMple", "PEAKdetect", "AVErage", "ENVelope"),
+    "ACQUIRE:NUMAVG": Discrete(POWERS_OF_2, int),
+    "ACQUIRE:NUMENV": AnyOf(Range(1, 2000, int), Choice("INFInite")),
+    "CH{ch}:BANDWIDTH": Choice("TWEnty", "ONEfifty", "FULl"),
+    "CH{ch}:COUPLING": Choice("AC", "DC", "GND"),
+    "TRIGGER:A:MODE": Choice("AUTO", "NORMal"),
+    "TRIGGER:B:BY": Choice("TIMe", "EVENTS"),
+    "TRIGGER:{designation}:EDGE:COUPLING": Choice(
+        "AC", "DC", "HFRej", "LFRej", "NOISErej"
+    ),
+    "TRIGGER:{designation}:EDGE:SLOPE": Choice("RISe", "FALL"),
+    "TRIGGER:A:LOGIC:CLASS": Choice("PATtern", "STATE"),
+    "TRIGGER:A:LOGIC:PATTERN:FUNCTION": Choice("AND", "NANd", "NOR", "OR"),
+    "TRIGGER:A:PULSE:CLASS": Choice("WIDth", "RUNT", "SLEWrate"),
+    "TRIGGER:A:PULSE:RUNT:POLARITY": Choice("EITher", "POSITIVe", "NEGAtive"),
+    "TRIGGER:A:PULSE:SLEWRATE:POLARITY": Choice("EITher", "POSITIVe", "NEGAtive"),
+    "TRIGGER:A:PULSE:WIDTH:POLARITY": Choice("POSITIVe", "NEGAtive"),
+    "MEASUREMENT:MEAS{slot}:TYPE": MEASUREMENT_TYPES,
+    "MEASUREMENT:IMMED:TYPE": MEASUREMENT_TYPES,
+}
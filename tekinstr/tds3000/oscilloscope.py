@@ -2,6 +2,7 @@
 from tekinstr.oscilloscope import OscilloscopeBase, ChannelBase, ProbeBase
 from tekinstr.tds3000.trigger import Trigger
 from tekinstr.measurement import Measurement
+from tekinstr.scpi import ScpiProperty
 
 
 class Oscilloscope(OscilloscopeBase, kind="Oscilloscope"):
@@ -37,10 +38,12 @@ class Channel(ChannelBase, kind="CH"):
 class Probe(ProbeBase, kind="Probe"):
     """Probe"""
 
-    @property
-    def gain(self):
-        """value (float): probe attenuation factor (input/output)"""
-        return float(self._visa.query(f"CH{self._ch}:PROBE?"))
+    gain = ScpiProperty(
+        "CH{ch}:PROBE",
+        float,
+        readonly=True,
+        doc="value (float): probe attenuation factor (input/output)",
+    )
 
     def __repr__(self):
         owner = self._owner.__repr__().strip("<>")
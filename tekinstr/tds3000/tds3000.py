@@ -1,6 +1,7 @@
 """TDS3000 Series Oscilloscope"""
 import re
 from tekinstr.model import Model
+from tekinstr.tds3000.capabilities import CAPABILITIES
 from tekinstr.tds3000.oscilloscope import Oscilloscope
 
 
@@ -11,6 +12,9 @@ class TDS3000(Model):
         resource (pyvisa.resources.Resource): pyvisa resource
     """
 
+    _capabilities = CAPABILITIES
+    _measurement_stats = False
+
     def __init__(self, visa):
         super().__init__(visa)
         self._visa.timeout = 4000
@@ -2,6 +2,7 @@
 from tekinstr.instrument import InstrumentSubsystem
 from tekinstr.trigger import TriggerBase, LogicInput
 from tekinstr.common import validate
+from tekinstr.scpi import ScpiProperty
 
 
 class Trigger(TriggerBase, kind="Trigger"):
@@ -53,35 +54,20 @@ class EdgeTrigger(InstrumentSubsystem, kind="Edge"):
         subsys = self._owner._kind
         return f"<{instr_model} {instr} {self._designation}-{subsys}: {self._kind}>"
 
-    @property
-    def coupling(self):
-        """value (str): {AC, DC, HFRej, LFRej, NOISErej}"""
-        return self._visa.query(f"TRIGGER:{self._designation}:EDGE:COUPLING?")
-
-    @coupling.setter
-    @validate
-    def coupling(self, value):
-        self._visa.write(f"TRIGGER:{self._designation}:EDGE:COUPLING {value}")
-
-    @property
-    def slope(self):
-        """value (str): trigger on slope RISE or FALL"""
-        return self._visa.query(f"TRIGGER:{self._designation}:EDGE:SLOPE?")
-
-    @slope.setter
-    @validate
-    def slope(self, value):
-        self._visa.write(f"TRIGGER:{self._designation}:EDGE:SLOPE {value}")
+    coupling = ScpiProperty(
+        "TRIGGER:{designation}:EDGE:COUPLING",
+        doc="value (str): {AC, DC, HFRej, LFRej, NOISErej}",
+    )
 
-    @property
-    def source(self):
-        """value (str): trigger source, CHx, EXT or LINE"""
-        return self._visa.query(f"TRIGGER:{self._designation}:EDGE:SOURCE?")
+    slope = ScpiProperty(
+        "TRIGGER:{designation}:EDGE:SLOPE",
+        doc="value (str): trigger on slope RISE or FALL",
+    )
 
-    @source.setter
-    @validate
-    def source(self, value):
-        self._visa.write(f"TRIGGER:{self._designation}:EDGE:SOURCE {value}")
+    source = ScpiProperty(
+        "TRIGGER:{designation}:EDGE:SOURCE",
+        doc="value (str): trigger source, CHx, EXT or LINE",
+    )
 
 
 class LogicTrigger(InstrumentSubsystem, kind="Logic"):
@@ -104,15 +90,10 @@ class LogicTrigger(InstrumentSubsystem, kind="Logic"):
         subsys = self._owner._kind
         return f"<{instr_model} {instr} {self._designation}-{subsys}: {self._kind}>"
 
-    @property
-    def logic_class(self):
-        """value (str): trigger class, {PATTERN, STATE}"""
-        return self._visa.query("TRIGGER:A:LOGIC:CLASS?")
-
-    @logic_class.setter
-    @validate
-    def logic_class(self, value):
-        self._visa.write(f"TRIGGER:A:LOGIC:CLASS {value}")
+    logic_class = ScpiProperty(
+        "TRIGGER:A:LOGIC:CLASS",
+        doc="value (str): trigger class, {PATTERN, STATE}",
+    )
 
     @property
     def input_1(self):
@@ -124,57 +105,30 @@ class LogicTrigger(InstrumentSubsystem, kind="Logic"):
         """(LogicInput): logic trigger input 2 object"""
         return self._input_2
 
-    @property
-    def deltatime(self):
-        """value (float): pattern trigger delta time condition"""
-        q_str = f"TRIGGER:A:LOGIC:PATTERN:DELTATIME?"
-        return float(self._visa.query(q_str))
-
-    @deltatime.setter
-    @validate
-    def deltatime(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:PATTERN:DELTATIME {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def function(self):
-        """value (str): logic function for pattern trigger, {AND, NAND, NOR, OR}"""
-        q_str = f"TRIGGER:A:LOGIC:PATTERN:FUNCTION?"
-        return self._visa.query(q_str)
+    deltatime = ScpiProperty(
+        "TRIGGER:A:LOGIC:PATTERN:DELTATIME",
+        float,
+        doc="value (float): pattern trigger delta time condition",
+    )
 
-    @function.setter
-    @validate
-    def function(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:PATTERN:FUNCTION {value}"
-        self._visa.write(cmd_str)
+    function = ScpiProperty(
+        "TRIGGER:A:LOGIC:PATTERN:FUNCTION",
+        doc="value (str): logic function for pattern trigger, {AND, NAND, NOR, OR}",
+    )
 
-    @property
-    def when_pattern(self):
-        """value (str): trigger condition
+    when_pattern = ScpiProperty(
+        "TRIGGER:A:LOGIC:PATTERN:WHEN",
+        doc="""value (str): trigger condition
         PATTERN: TRUE, FALSE, LESSTHAN, MORETHAN, EQUAL, or NOTEQUAL
-        """
-        q_str = f"TRIGGER:A:LOGIC:PATTERN:WHEN?"
-        return self._visa.query(q_str)
-
-    @when_pattern.setter
-    @validate
-    def when_pattern(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:PATTERN:WHEN {value}"
-        self._visa.write(cmd_str)
+        """,
+    )
 
-    @property
-    def when_state(self):
-        """value (str): trigger condition
+    when_state = ScpiProperty(
+        "TRIGGER:A:LOGIC:STATE:WHEN",
+        doc="""value (str): trigger condition
         STATE: TRUE or FALSE
-        """
-        q_str = f"TRIGGER:A:LOGIC:STATE:WHEN?"
-        return self._visa.query(q_str)
-
-    @when_state.setter
-    @validate
-    def when_state(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:STATE:WHEN {value}"
-        self._visa.write(cmd_str)
+        """,
+    )
 
     def __dir__(self):
         attrs = super().__dir__()
@@ -203,29 +157,15 @@ class PulseTrigger(InstrumentSubsystem, kind="Pulse"):
         subsys = self._owner._kind
         return f"<{instr_model} {instr} {self._designation}-{subsys}: {self._kind}>"
 
-    @property
-    def pulse_class(self):
-        """value (str): pulse trigger class {WIDTH, RUNT, SLEWRATE}"""
-        q_str = f"TRIGGER:A:PULSE:CLASS?"
-        return self._visa.query(q_str)
-
-    @pulse_class.setter
-    @validate
-    def pulse_class(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:CLASS {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def runt_polarity(self):
-        """value (str): {EITHER, POSITIVE, NEGATIVE}"""
-        q_str = f"TRIGGER:A:PULSE:RUNT:POLARITY?"
-        return self._visa.query(q_str)
+    pulse_class = ScpiProperty(
+        "TRIGGER:A:PULSE:CLASS",
+        doc="value (str): pulse trigger class {WIDTH, RUNT, SLEWRATE}",
+    )
 
-    @runt_polarity.setter
-    @validate
-    def runt_polarity(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:RUNT:POLARITY {value}"
-        self._visa.write(cmd_str)
+    runt_polarity = ScpiProperty(
+        "TRIGGER:A:PULSE:RUNT:POLARITY",
+        doc="value (str): {EITHER, POSITIVE, NEGATIVE}",
+    )
 
     @property
     def runt_threshold(self):
@@ -245,64 +185,34 @@ class PulseTrigger(InstrumentSubsystem, kind="Pulse"):
         else:
             self._visa.write(cmd_str + f"BOTH {value}")
 
-    @property
-    def runt_when(self):
-        """value (str): {OCCURS, LESSTHAN, MOETHAN, EQUAL, NOTEQUAL}"""
-        q_str = "TRIGGER:A:PULSE:RUNT:WHEN?"
-        return self._visa.query(q_str)
-
-    @runt_when.setter
-    @validate
-    def runt_when(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:RUNT:WHEN {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def runt_width(self):
-        """value (float): runt pulse width in seconds"""
-        q_str = "TRIGGER:A:PULSE:RUNT:WIDTH?"
-        return float(self._visa.query(q_str))
-
-    @runt_width.setter
-    @validate
-    def runt_width(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:RUNT:WIDTH {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def slewrate_deltatime(self):
-        """value (float): slew rate trigger delta time condition"""
-        q_str = f"TRIGGER:A:PULSE:SLEWRATE:DELTATIME?"
-        return float(self._visa.query(q_str))
-
-    @slewrate_deltatime.setter
-    @validate
-    def slewrate_deltatime(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:SLEWRATE:DELTATIME {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def slewrate_polarity(self):
-        """value (str): {EITHER, POSITIVE, NEGATIVE}"""
-        q_str = f"TRIGGER:A:PULSE:SLEWRATE:POLARITY?"
-        return self._visa.query(q_str)
-
-    @slewrate_polarity.setter
-    @validate
-    def slewrate_polarity(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:SLEWRATE:POLARITY {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def slewrate(self):
-        """value (float): slew rate value in volts per second"""
-        q_str = "TRIGGER:A:PULSE:SLEWRATE:SLEWRATE?"
-        return float(self._visa.query(q_str))
-
-    @slewrate.setter
-    def slewrate(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:SLEWRATE:SLEWRATE {value}"
-        self._visa.write(cmd_str)
+    runt_when = ScpiProperty(
+        "TRIGGER:A:PULSE:RUNT:WHEN",
+        doc="value (str): {OCCURS, LESSTHAN, MOETHAN, EQUAL, NOTEQUAL}",
+    )
+
+    runt_width = ScpiProperty(
+        "TRIGGER:A:PULSE:RUNT:WIDTH",
+        float,
+        doc="value (float): runt pulse width in seconds",
+    )
+
+    slewrate_deltatime = ScpiProperty(
+        "TRIGGER:A:PULSE:SLEWRATE:DELTATIME",
+        float,
+        doc="value (float): slew rate trigger delta time condition",
+    )
+
+    slewrate_polarity = ScpiProperty(
+        "TRIGGER:A:PULSE:SLEWRATE:POLARITY",
+        doc="value (str): {EITHER, POSITIVE, NEGATIVE}",
+    )
+
+    slewrate = ScpiProperty(
+        "TRIGGER:A:PULSE:SLEWRATE:SLEWRATE",
+        float,
+        check=False,
+        doc="value (float): slew rate value in volts per second",
+    )
 
     @property
     def slewrate_threshold(self):
@@ -322,53 +232,26 @@ class PulseTrigger(InstrumentSubsystem, kind="Pulse"):
         else:
             self._visa.write(cmd_str + f"BOTH {value}")
 
-    @property
-    def slewrate_when(self):
-        """value (str): {OCCURS, LESSTHAN, MOETHAN, EQUAL, NOTEQUAL}"""
-        q_str = "TRIGGER:A:PULSE:SLEWRATE:WHEN?"
-        return self._visa.query(q_str)
-
-    @slewrate_when.setter
-    @validate
-    def slewrate_when(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:SLEWRATE:WHEN {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def width_polarity(self):
-        """value (str): {POSITIVE, NEGATIVE}"""
-        q_str = f"TRIGGER:A:PULSE:WIDTH:POLARITY?"
-        return self._visa.query(q_str)
-
-    @width_polarity.setter
-    @validate
-    def width_polarity(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:WIDTH:POLARITY {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def width_when(self):
-        """value (str): {LESSTHAN, MOETHAN, EQUAL, NOTEQUAL}"""
-        q_str = "TRIGGER:A:PULSE:WIDTH:WHEN?"
-        return self._visa.query(q_str)
-
-    @width_when.setter
-    @validate
-    def width_when(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:WIDTH:WHEN {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def pulse_width(self):
-        """value (float): pulse width trigger time period in seconds"""
-        q_str = "TRIGGER:A:PULSE:WIDTH:WIDTH?"
-        return float(self._visa.query(q_str))
-
-    @pulse_width.setter
-    @validate
-    def pulse_width(self, value):
-        cmd_str = f"TRIGGER:A:PULSE:WIDTH:WIDTH {value}"
-        self._visa.write(cmd_str)
+    slewrate_when = ScpiProperty(
+        "TRIGGER:A:PULSE:SLEWRATE:WHEN",
+        doc="value (str): {OCCURS, LESSTHAN, MOETHAN, EQUAL, NOTEQUAL}",
+    )
+
+    width_polarity = ScpiProperty(
+        "TRIGGER:A:PULSE:WIDTH:POLARITY",
+        doc="value (str): {POSITIVE, NEGATIVE}",
+    )
+
+    width_when = ScpiProperty(
+        "TRIGGER:A:PULSE:WIDTH:WHEN",
+        doc="value (str): {LESSTHAN, MOETHAN, EQUAL, NOTEQUAL}",
+    )
+
+    pulse_width = ScpiProperty(
+        "TRIGGER:A:PULSE:WIDTH:WIDTH",
+        float,
+        doc="value (float): pulse width trigger time period in seconds",
+    )
 
     def __dir__(self):
         attrs = super().__dir__()
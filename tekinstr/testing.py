@@ -0,0 +1,30 @@
+"""Utilities for testing code that uses tekinstr"""
+from contextlib import contextmanager
+from tekinstr.common import TekBase
+
+
+@contextmanager
+def expect_roundtrips(tek, max):  # pylint: disable=redefined-builtin
+    """Fail if the block makes more than max round trips to the instrument
+
+    Every write and query counts as a round trip, as with VXI-11 where each is
+    a remote procedure call. Responses from the session cache don't count.
+    >>> with expect_roundtrips(tek, max=1):
+    ...     tek.oscilloscope.ch1.scale = 0.5
+
+    Args:
+        tek (TekBase or Session): model, instrument or session
+        max (int): allowed number of round trips
+    Yields:
+        (Trace): the transactions of the block
+    Raises:
+        AssertionError: more than max round trips
+    """
+    # pylint: disable=protected-access
+    session = tek._visa if isinstance(tek, TekBase) else tek
+    with session.tracing(None) as trace:
+        yield trace
+    if len(trace) > max:
+        raise AssertionError(
+            f"{len(trace)} round trips, expected at most {max}\n{trace}"
+        )
@@ -0,0 +1,136 @@
+"""Trace of the SCPI transactions of a session"""
+import inspect
+import os
+import sys
+from collections import deque, namedtuple
+from tekinstr.common import TekBase
+from tekinstr.scpi import ScpiProperty
+
+Transaction = namedtuple(
+    "Transaction", ["kind", "message", "n_bytes", "duration", "caller"]
+)
+Transaction.__doc__ = """A write or query sent to the instrument
+
+Attributes:
+    kind (str): 'write', 'query' or 'binary'
+    message (str): program message
+    n_bytes (int): bytes written and read
+    duration (float): wall time in seconds
+    caller (str): outermost property or method, e.g. 'Oscilloscope.read'; None if
+        called directly on the session
+"""
+
+Totals = namedtuple("Totals", ["count", "duration", "n_bytes"])
+
+
+_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+
+# code object -> 'descriptor' for ScpiProperty, 'method' for a property or method
+# of a TekBase object, None for neither
+_KINDS = {}
+
+
+def _kind(code, f_locals):
+    owner = f_locals.get("self")
+    if isinstance(owner, ScpiProperty):
+        return "descriptor"
+    if isinstance(owner, TekBase) and not code.co_name.startswith("_"):
+        attr = inspect.getattr_static(type(owner), code.co_name, None)
+        if isinstance(attr, property) or inspect.isfunction(attr):
+            return "method"
+    return None
+
+
+def _caller(frame):
+    """Find the outermost property or method of a TekBase object in the stack
+
+    Only the frames of the package are walked and each code object is classified
+    once, so the locals are read only for frames of properties and methods.
+    """
+    caller = None
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE):
+        code = frame.f_code
+        try:
+            kind = _KINDS[code]
+        except KeyError:
+            kind = _KINDS[code] = _kind(code, frame.f_locals)
+        if kind == "descriptor":
+            instance = frame.f_locals.get("instance")
+            if isinstance(instance, TekBase):
+                caller = f"{type(instance).__name__}.{frame.f_locals['self'].name}"
+        elif kind == "method":
+            caller = f"{type(frame.f_locals['self']).__name__}.{code.co_name}"
+        frame = frame.f_back
+    return caller
+
+
+def _command(message):
+    """Message without arguments, e.g. 'CH1:SCALE' for 'CH1:SCALE 0.5'"""
+    return ";".join(unit.split(maxsplit=1)[0] for unit in message.split(";") if unit)
+
+
+class Trace:
+    """Ring buffer of the transactions of a session
+
+    Attributes:
+        maxlen (int): number of transactions kept
+    """
+
+    def __init__(self, maxlen=10000):
+        self.transactions = deque(maxlen=maxlen)
+
+    def record(self, kind, message, n_bytes, duration):
+        """Record a transaction
+
+        The caller is found by walking the frames of the package, so this is only
+        done while tracing.
+        """
+        caller = _caller(sys._getframe(1))  # pylint: disable=protected-access
+        self.transactions.append(Transaction(kind, message, n_bytes, duration, caller))
+
+    def _totals(self, key):
+        totals = {}
+        for transaction in self.transactions:
+            count, duration, n_bytes = totals.get(key(transaction), (0, 0.0, 0))
+            duration += transaction.duration
+            n_bytes += transaction.n_bytes
+            totals[key(transaction)] = Totals(count + 1, duration, n_bytes)
+        return totals
+
+    def commands(self):
+        """Totals per command
+
+        Returns:
+            (dict): command -> Totals(count, duration, n_bytes)
+        """
+        return self._totals(lambda t: _command(t.message))
+
+    def properties(self):
+        """Totals per calling property or method
+
+        Returns:
+            (dict): caller -> Totals(count, duration, n_bytes)
+        """
+        return self._totals(lambda t: t.caller)
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def __str__(self):
+        lines = []
+        for title, totals in [
+            ("command", self.commands()),
+            ("property", self.properties()),
+        ]:
+            width = max([len(title)] + [len(str(k)) for k in totals])
+            lines.append(f"{title:<{width}}  count  time (ms)     bytes")
+            ordered = sorted(totals.items(), key=lambda kv: -kv[1].duration)
+            for key, (count, duration, n_bytes) in ordered:
+                lines.append(
+                    f"{str(key):<{width}}  {count:5d}  {1e3 * duration:9.3f}  {n_bytes:8d}"
+                )
+            lines.append("")
+        return "\n".join(lines[:-1])
+
+    def __repr__(self):
+        return f"<Trace of {len(self)} transactions>"
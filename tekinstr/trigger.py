@@ -1,6 +1,7 @@
 """Trigger base definitions"""
 from tekinstr.instrument import InstrumentSubsystem
-from tekinstr.common import validate
+from tekinstr.common import validate, atomic
+from tekinstr.scpi import ScpiProperty, float_or_str
 
 
 class TriggerBase(InstrumentSubsystem, kind="TriggerBase"):
@@ -35,6 +36,7 @@ class TriggerBase(InstrumentSubsystem, kind="TriggerBase"):
         """(dict): trigger parameters"""
         return self._get_parameters()
 
+    @atomic
     def _get_parameters(self):
         self._visa.write("HEADER ON")
         raw_str = self._visa.query(f"TRIGGER:{self._designation}?")
@@ -51,87 +53,50 @@ class TriggerBase(InstrumentSubsystem, kind="TriggerBase"):
             parameters[k] = v
         return parameters
 
-    @property
-    def mode(self):
-        """value (str): A trigger mode, AUTO or NORMAL"""
-        return self._visa.query("TRIGGER:A:MODE?")
+    mode = ScpiProperty(
+        "TRIGGER:A:MODE", doc="value (str): A trigger mode, AUTO or NORMAL"
+    )
 
-    @mode.setter
-    @validate
-    def mode(self, value):
-        self._visa.write(f"TRIGGER:A:MODE {value}")
+    state = ScpiProperty(
+        "TRIGGER:B:STATE", doc="value (str): B trigger state, ON or OFF"
+    )
 
-    @property
-    def state(self):
-        """value (str): B trigger state, ON or OFF"""
-        return self._visa.query("TRIGGER:B:STATE?")
-
-    @state.setter
-    @validate
-    def state(self, value):
-        self._visa.write(f"TRIGGER:B:STATE {value}")
-
-    @property
-    def level(self):
-        """value (float or str): trigger threshold level, {voltage, ECL, TTL}
+    level = ScpiProperty(
+        "TRIGGER:{designation}:LEVEL",
+        float_or_str,
+        doc="""value (float or str): trigger threshold level, {voltage, ECL, TTL}
         float: level in volts
         str: ECL (-1.3 V) or TTL (1.4 V)
-        """
-        level = self._visa.query(f"TRIGGER:{self._designation}:LEVEL?")
-        try:
-            level = float(level)
-        except ValueError:
-            pass
-        return level
-
-    @level.setter
-    @validate
-    def level(self, value):
-        self._visa.write(f"TRIGGER:{self._designation}:LEVEL {value}")
+        """,
+    )
 
     def set_level(self):
         """set trigger level to 50 %"""
         self._visa.write(f"TRIGGER:{self._designation}:SETLEVEL")
 
-    @property
-    def by(self):
-        """value (str): delay B trigger by TIME or EVENTS"""
-        return self._visa.query("TRIGGER:B:BY?")
-
-    @by.setter
-    @validate
-    def by(self, value):
-        self._visa.write(f"TRIGGER:B:BY {value}")
-
-    @property
-    def time(self):
-        """value (float): delay B trigger by value seconds when 'by' set to TIME"""
-        return float(self._visa.query("TRIGGER:B:TIME?"))
-
-    @time.setter
-    @validate
-    def time(self, value):
-        self._visa.write(f"TRIGGER:B:TIME {value}")
-
-    @property
-    def events(self):
-        """value (int): B trigger occurs on the value occurance after A trigger"""
-        return int(self._visa.query("TRIGGER:B:EVENTS?"))
-
-    @events.setter
-    @validate
-    def events(self, value):
-        self._visa.write(f"TRIGGER:B:EVENTS:COUNT {value}")
-
-    @property
-    def holdoff(self):
-        """value (float): A trigger holdoff time in seconds"""
-        return float(self._visa.query("TRIGGER:A:HOLDOFF?"))
-
-    @holdoff.setter
-    @validate
-    def holdoff(self, value):
-        self._visa.write(f"TRIGGER:A:HOLDOFF:TIME {value}")
+    by = ScpiProperty(
+        "TRIGGER:B:BY", doc="value (str): delay B trigger by TIME or EVENTS"
+    )
+
+    time = ScpiProperty(
+        "TRIGGER:B:TIME",
+        float,
+        doc="value (float): delay B trigger by value seconds when 'by' set to TIME",
+    )
+
+    events = ScpiProperty(
+        "TRIGGER:B:EVENTS",
+        int,
+        set_header="TRIGGER:B:EVENTS:COUNT",
+        doc="value (int): B trigger occurs on the value occurance after A trigger",
+    )
+
+    holdoff = ScpiProperty(
+        "TRIGGER:A:HOLDOFF",
+        float,
+        set_header="TRIGGER:A:HOLDOFF:TIME",
+        doc="value (float): A trigger holdoff time in seconds",
+    )
 
     def __dir__(self):
         attrs = super().__dir__()
@@ -162,29 +127,14 @@ class LogicInput(InstrumentSubsystem, kind="LogicTrigger:Input"):
         subsys = self._owner._kind
         return f"<{instr_model} {instr} {subsys} {self._kind}>"
 
-    @property
-    def level(self):
-        """value (str): HIGH or LOW"""
-        q_str = f"TRIGGER:A:LOGIC:INPUT{self._input_n}:LOGICLEVEL?"
-        return self._visa.query(q_str)
+    level = ScpiProperty(
+        "TRIGGER:A:LOGIC:INPUT{input_n}:LOGICLEVEL", doc="value (str): HIGH or LOW"
+    )
 
-    @level.setter
-    @validate
-    def level(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:INPUT{self._input_n}:LOGICLEVEL {value}"
-        self._visa.write(cmd_str)
-
-    @property
-    def slope(self):
-        """value (str): input 2 state logic trigger slope, RISE or FALL"""
-        q_str = f"TRIGGER:A:LOGIC:INPUT2:SLOPE?"
-        return self._visa.query(q_str)
-
-    @slope.setter
-    @validate
-    def slope(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:INPUT2:SLOPE {value}"
-        self._visa.write(cmd_str)
+    slope = ScpiProperty(
+        "TRIGGER:A:LOGIC:INPUT2:SLOPE",
+        doc="value (str): input 2 state logic trigger slope, RISE or FALL",
+    )
 
     def __dir__(self):
         attrs = super().__dir__()
@@ -192,31 +142,13 @@ class LogicInput(InstrumentSubsystem, kind="LogicTrigger:Input"):
             attrs.remove("slope")
         return attrs
 
-    @property
-    def source(self):
-        """value (str): input signal source, CHx"""
-        q_str = f"TRIGGER:A:LOGIC:INPUT{self._input_n}:SOURCE?"
-        return self._visa.query(q_str)
-
-    @source.setter
-    @validate
-    def source(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:INPUT{self._input_n}:SOURCE {value}"
-        self._visa.write(cmd_str)
+    source = ScpiProperty(
+        "TRIGGER:A:LOGIC:INPUT{input_n}:SOURCE",
+        doc="value (str): input signal source, CHx",
+    )
 
-    @property
-    def threshold(self):
-        """value (float or str): threshold in volts, ECL or TTL"""
-        q_str = f"TRIGGER:A:LOGIC:INPUT{self._input_n}:THRESHOLD?"
-        threshold_str = self._visa.query(q_str)
-        try:
-            threshold = float(threshold_str)
-        except ValueError:
-            threshold = threshold_str
-        return threshold
-
-    @threshold.setter
-    @validate
-    def threshold(self, value):
-        cmd_str = f"TRIGGER:A:LOGIC:INPUT{self._input_n}:THRESHOLD {value}"
-        self._visa.write(cmd_str)
+    threshold = ScpiProperty(
+        "TRIGGER:A:LOGIC:INPUT{input_n}:THRESHOLD",
+        float_or_str,
+        doc="value (float or str): threshold in volts, ECL or TTL",
+    )
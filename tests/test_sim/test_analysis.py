@@ -0,0 +1,44 @@
+"""Test host-side measurements"""
+import numpy as np
+import pytest
+from tekinstr import analysis
+from tekinstr.simulator import Signal, simulate
+
+# pylint: disable=missing-function-docstring
+
+
+def test_instrument():
+    # low noise, so the edges of a single acquisition are within tolerance
+    signals = {f"CH{x}": Signal(x * 1e6, 0.25, 0.0, 0.5e-3) for x in (1, 2)}
+    tek = simulate("MDO3024", signals=signals)
+    waveform = tek.oscilloscope.read("CH1:2")
+    types = ["amplitude", "frequency", "period", "rise", "fall", "pwidth", "rms"]
+    values = analysis.measure_many(waveform, types)
+    pairs = [(source, t) for source in ["CH1", "CH2"] for t in types]
+    expected = tek.oscilloscope.measurement.immediate_many(pairs).value
+    for i, measurement_type in enumerate(types):
+        assert values[measurement_type] == pytest.approx(
+            expected[i :: len(types)], rel=0.03
+        )
+
+
+def test_pulses():
+    period, dt = 100, 1e-6
+    pulse = np.where(np.arange(1000) % period < 25, 1.0, 0.0)
+    pulse[24::period] = 1.2  # overshoot of the falling edge
+    frames = np.stack([pulse, 2 * pulse, np.roll(pulse, 10)])
+    values = analysis.measure_many(
+        frames, ["period", "pduty", "nduty", "amplitude", "povershoot"], dt=dt
+    )
+    assert values["period"] == pytest.approx([period * dt] * 3)
+    assert values["pduty"] == pytest.approx([25] * 3, abs=1)
+    assert values["nduty"] == pytest.approx([75] * 3, abs=1)
+    assert values["amplitude"] == pytest.approx([1, 2, 1], rel=0.01)
+    assert values["povershoot"] == pytest.approx([20] * 3, abs=1)
+    assert analysis.measure(frames[0], "pk2pk", method="minmax") == 1.2
+
+
+def test_invalid():
+    assert np.isnan(analysis.measure(np.zeros(100), "frequency"))
+    with pytest.raises(ValueError):
+        analysis.measure(np.zeros(100), "bogus")
@@ -0,0 +1,85 @@
+"""Test the broker"""
+import os
+import threading
+import numpy as np
+import pytest
+from tekinstr.broker import Broker, connect, read_latest
+from tekinstr.common import CommandError
+from tekinstr.simulator import simulate
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+def test_broker():
+    tek = simulate("MDO3024")
+    metrics = tek.collect_metrics()
+    broker = Broker(tek, authkey=b"test").start()
+    try:
+        clients = [connect(broker.address, authkey=b"test") for _ in range(2)]
+        assert clients[0].model == "MDO3024"
+        with tek.trace() as trace:
+            clients[0].oscilloscope.ch1.scale = 0.5
+            assert clients[0].oscilloscope.ch1.scale == 0.5
+            assert clients[1].oscilloscope.ch1.scale == 0.5
+        assert trace.commands()["CH1:SCALE?"].count == 1
+        tek.oscilloscope.ch1.scale = 0.3  # by the process owning the session
+        assert clients[1].oscilloscope.ch1.scale == 0.3
+        with pytest.raises(CommandError):
+            clients[0]._visa.write_checked(["ACQUIRE:MODE BOGUS"])
+        waveforms = [
+            read_latest(client, "CH1", max_age=60, samples=100, wdt=False)
+            for client in clients
+        ]
+        assert np.array_equal(*waveforms)
+        assert metrics.snapshot()["acquisitions"] == 1
+        errors = []
+
+        def run(client):
+            try:
+                for _ in range(5):
+                    assert len(client.oscilloscope.read("CH1", samples=100)) == 100
+                    assert client.oscilloscope.horizontal_scale > 0
+            except Exception as exc:  # pylint: disable=broad-except
+                errors.append(exc)
+
+        threads = [threading.Thread(target=run, args=(c,)) for c in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        for client in clients:
+            client._visa.close()
+    finally:
+        broker.close()
+
+
+def test_pending_error(tmp_path):
+    tek = simulate("MDO3024")
+    broker = Broker(tek, str(tmp_path / "broker"))
+    assert os.stat(broker.address).st_mode & 0o777 == 0o600
+    broker.start()
+    try:
+        clients = [connect(broker.address) for _ in range(2)]
+        remote = clients[0]._visa._resource
+        remote.write(None)  # fails in the broker
+        with pytest.raises(TypeError):
+            with clients[0]._visa.locked():
+                pass
+        with pytest.raises(TypeError):
+            with clients[0]._visa.locked():
+                remote.write(None)
+        setter = threading.Thread(
+            target=setattr, args=(clients[1].oscilloscope.ch1, "scale", 0.2)
+        )
+        setter.start()
+        setter.join(5)
+        assert not setter.is_alive()  # the broker's lock was released
+        for client in clients:
+            client._visa.close()
+    finally:
+        broker.close()
+
+
+def test_authkey():
+    with pytest.raises(ValueError):
+        Broker(simulate("MDO3024"), ("localhost", 0))
@@ -0,0 +1,52 @@
+"""Test capability rules"""
+import pytest
+from tekinstr.capability import Choice, Range, Discrete, AnyOf, POWERS_OF_2
+from tekinstr.simulator import simulate
+from tekinstr.testing import expect_roundtrips
+
+# pylint: disable=missing-function-docstring
+def test_choice():
+    mode = Choice("SAMple", "AVErage")
+    assert mode("sam") == "SAMPLE"
+    assert mode("Average") == "AVERAGE"
+    with pytest.raises(ValueError):
+        mode("SAMP")
+
+
+def test_range():
+    assert Range(1, 2000, int)("16") == 16
+    with pytest.raises(ValueError):
+        Range(1, 2000, int)(2001)
+    with pytest.raises(ValueError):
+        Range(1, 2000, int)(2.7)
+    with pytest.raises(ValueError):
+        Range(1, 2000)("inf")
+    assert (Range(1, 2000).minimum, Range(1, 2000).maximum) == (1, 2000)
+
+
+def test_discrete():
+    record_length = Discrete([1e3, 1e4, 1e5, 1e6, 5e6, 1e7], int)
+    assert record_length(5e6) == 5_000_000
+    with pytest.raises(ValueError):
+        record_length(2e6)
+    with pytest.raises(ValueError):
+        Discrete(POWERS_OF_2, int)(1024)
+
+
+def test_anyof():
+    num_envelopes = AnyOf(Range(1, 2000, int), Choice("INFInite"))
+    assert num_envelopes(10) == 10
+    assert num_envelopes("infi") == "INFINITE"
+    with pytest.raises(ValueError):
+        num_envelopes(0)
+    with pytest.raises(ValueError):
+        num_envelopes("inf")
+
+
+def test_property():
+    tek = simulate("MDO3024")
+    with expect_roundtrips(tek, max=0):
+        with pytest.raises(ValueError, match="invalid record_length"):
+            tek.oscilloscope.record_length = 2e6
+        with pytest.raises(ValueError, match="invalid num_envelopes"):
+            tek.oscilloscope.num_envelopes = 2.7
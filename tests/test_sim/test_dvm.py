@@ -0,0 +1,32 @@
+"""Test the DVM"""
+import numpy as np
+import pytest
+from tekinstr.simulator import simulate
+from tekinstr.testing import expect_roundtrips
+
+# pylint: disable=missing-function-docstring
+
+
+def test_read_all():
+    tek = simulate("MDO3024")
+    tek.dvm.mode = "ACRMS"
+    with expect_roundtrips(tek, max=1):
+        reading = tek.dvm.read_all()
+    assert reading.value == pytest.approx(0.25 / np.sqrt(2), rel=1e-2)
+    assert reading.frequency == pytest.approx(1e6)
+    assert reading.minimum < reading.average < reading.maximum
+    tek.dvm.mode = "OFF"
+    assert np.isnan(tek.dvm.read_all().value)
+
+
+def test_sample():
+    tek = simulate("MDO3024")
+    tek.dvm.mode = "DC"
+    with expect_roundtrips(tek, max=20):
+        sampling = tek.dvm.sample(20, frequency=True)
+    samples = sampling.samples
+    assert samples.dtype.names == ("time", "value", "frequency")
+    assert len(samples) == 20
+    assert (np.diff(samples.time) >= 0).all()
+    assert sampling.rate > 0
+    assert 0 < sampling.duplicates < 20  # the reading updates every 100 ms
@@ -0,0 +1,36 @@
+"""Test the measurement logger"""
+import time
+import pytest
+from tekinstr.logger import read_log
+from tekinstr.simulator import simulate
+
+# pylint: disable=missing-function-docstring
+
+
+def test_logger(tmp_path):
+    tek = simulate("MDO3024")
+    measurement = tek.oscilloscope.measurement
+    measurement.add("CH1", "frequency")
+    measurement.add("CH2", "amplitude")
+    tek.dvm.mode = "DC"
+    path = tmp_path / "dut.log"
+    with measurement.logger(path, rate=200, dvm=tek.dvm, chunk=10, capacity=20) as log:
+        time.sleep(0.3)
+    assert log.columns == ["time", "ch1_frequency", "ch2_amplitude", "dvm"]
+    assert len(log.recent()) == min(log.n_samples, 20)
+    samples, units = read_log(path)
+    assert len(samples) == log.n_samples > 10
+    assert list(units.values()) == ["s", "Hz", "V", "V"]
+    assert samples.dvm == pytest.approx([0] * len(samples), abs=1e-2)
+    assert samples.ch1_frequency == pytest.approx([1e6] * len(samples), rel=1e-2)
+    assert (samples.time[1:] > samples.time[:-1]).all()
+    with open(path, "ab") as file:
+        file.write(b"\x05\0\0\0" + bytes(8 * 4 * 2))  # chunk cut short by a crash
+    assert len(read_log(path)[0]) == len(samples)
+    with measurement.logger(path, rate=100, dvm=tek.dvm) as log:
+        time.sleep(0.05)
+    appended, _ = read_log(path)
+    assert len(appended) == len(samples) + log.n_samples
+    assert (appended.time[1:] > appended.time[:-1]).all()
+    with pytest.raises(ValueError):
+        measurement.logger(path)
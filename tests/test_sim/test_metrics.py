@@ -0,0 +1,68 @@
+"""Test Metrics"""
+from urllib.request import urlopen
+import pytest
+from pyvisa import constants
+from pyvisa.errors import VisaIOError
+from tekinstr.common import CommandError
+from tekinstr.metrics import Histogram, serve
+from tekinstr.simulator import simulate
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+def test_histogram():
+    histogram = Histogram([1, 2])
+    for value in [0.5, 1, 1.5, 3]:
+        histogram.observe(value)
+    assert histogram.cumulative() == {1: 2, 2: 3, float("inf"): 4}
+    assert histogram.sum == 6.0
+
+
+def test_metrics():
+    tek = simulate("MDO3024")
+    metrics = tek.collect_metrics()
+    assert tek.collect_metrics() is metrics
+    tek.oscilloscope.read("CH1:2", samples=100)
+    with pytest.raises(VisaIOError):
+        tek._visa.query("UNKNOWN?")
+    with pytest.raises(CommandError):
+        tek._visa.write_checked(["ACQUIRE:MODE BOGUS"])
+    snapshot = metrics.snapshot()
+    assert snapshot["labels"] == {"model": "MDO3024", "serial": tek.serial_number}
+    assert snapshot["transactions"]["binary"] == 2
+    assert snapshot["bytes"]["binary"] == 2 * (100 + len("CURVE?"))
+    assert snapshot["transactions_per_second"] > 0
+    assert snapshot["timeouts"] == 1
+    assert snapshot["command_errors"] == 1
+    assert snapshot["acquisitions"] == 1
+    assert snapshot["latency"]["query"]["count"] == snapshot["transactions"]["query"]
+    server = serve([tek], port=0)
+    try:
+        with urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as rsp:
+            text = rsp.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert "# TYPE tekinstr_transaction_duration_seconds histogram" in text
+    assert 'tekinstr_timeouts_total{model="MDO3024",' in text
+    assert 'kind="binary",le="+Inf"} 2' in text
+
+
+@pytest.mark.parametrize("message", ["*ESR?", "*STB?"])
+def test_acquisition_timeout(monkeypatch, message):
+    tek = simulate("MDO3024")
+    metrics = tek.collect_metrics()
+    resource = tek._visa._resource
+    query = resource.query
+
+    def timeout(*args):
+        raise VisaIOError(constants.StatusCode.error_timeout)
+
+    if message == "*STB?":
+        monkeypatch.setattr(type(resource), "stb", property(timeout))
+    else:
+        monkeypatch.setattr(
+            resource, "query", lambda msg: timeout() if msg == message else query(msg)
+        )
+    with pytest.raises(TimeoutError):
+        tek.oscilloscope.read("CH1", samples=100, previous=False)
+    assert metrics.timeouts == 1
@@ -1,19 +1,79 @@
 """Test Model"""
-import os
 import pytest
-from tekinstr import CommChannel
+from tekinstr.common import CommandError
+from tekinstr.simulator import simulate
+from tekinstr.testing import expect_roundtrips
 
 # pylint: disable=missing-function-docstring
 # pylint: disable=redefined-outer-name
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="module", params=["MDO3024", "MSO4104B", "TDS3064B"])
 def tek(request):
-    path = os.path.dirname(os.path.abspath(__file__))
-    os.environ["PYVISA_LIBRARY"] = path + r"\sim_hw.yml@sim"
-    address = request.config.getoption("ipaddress")
-    cc = CommChannel(address)
-    yield cc.get_instrument()
-    cc.close()
+    yield simulate(request.param)
 
 
 def test_model(tek):
-    assert tek.model == "MDO3024"
+    assert tek.model in ["MDO3024", "MSO4104B", "TDS3064B"]
+
+
+def test_read(tek):
+    tek.oscilloscope.ch1.scale = 0.1
+    wf = tek.oscilloscope.read("CH1:2", samples=500, wdt=False)
+    assert wf.shape == (2, 500)
+    assert 0.24 < wf[0].max() < 0.26
+
+
+def test_measurement(tek):
+    measurement = tek.oscilloscope.measurement
+    measurement.add("CH1", "frequency")
+    assert measurement.CH1_frequency.value == pytest.approx(1e6, rel=1e-2)
+    measurement.remove("CH1_frequency")
+
+
+def test_read_all(tek):
+    measurement = tek.oscilloscope.measurement
+    measurement.add("CH1", "frequency")
+    measurement.add("CH2", "amplitude")
+    readout = measurement.read_all()
+    assert list(readout.name) == ["ch1_frequency", "ch2_amplitude"]
+    assert list(readout.unit) == ["Hz", "V"]
+    assert readout.value == pytest.approx([1e6, 0.5], rel=1e-2)
+    assert (readout.average > 0).all() == (tek.model != "TDS3064B")
+    measurement.remove("CH1_frequency")
+    measurement.remove("CH2_amplitude")
+
+
+def test_immediate(tek):
+    measurement = tek.oscilloscope.measurement
+    frequency = measurement.immediate("CH1", "frequency")
+    assert str(frequency.units) == "Hz"
+    assert frequency.value == pytest.approx(1e6, rel=1e-2)
+    readout = measurement.immediate_many([("CH1", "frequency"), ("CH2", "amp")])
+    assert list(readout.name) == ["ch1_frequency", "ch2_amplitude"]
+    assert readout.value == pytest.approx([1e6, 0.5], rel=1e-2)
+    with expect_roundtrips(tek, max=0):
+        with pytest.raises(ValueError):
+            measurement.immediate_many([("CH1", "frequency"), ("CH1", "bogus")])
+    tek.__dict__["_capabilities"] = {}  # leave the check to the instrument
+    with pytest.raises(CommandError):
+        measurement.immediate_many([("CH1", "frequency"), ("CH1", "bogus")])
+    del tek.__dict__["_capabilities"]
+
+
+def test_query_checked(tek):
+    visa = tek._visa  # pylint: disable=protected-access
+    with expect_roundtrips(tek, max=1):
+        fields = visa.query_checked(["CH1:SCALE 0.2", "CH1:SCALE?", "CH1:COUPLING?"])
+    assert float(fields[0]) == 0.2 and fields[1] == "DC"
+    with pytest.raises(CommandError):
+        visa.query_checked(["CH1:SCALE?", "CH1:COUPLING BOGUS"])
+
+
+def test_apply(tek):
+    tek.oscilloscope.ch1.scale = 0.1
+    tek.oscilloscope.num_averages = 16
+    state = tek.snapshot()
+    settings = {"oscilloscope": {"ch1": {"scale": 0.5}, "num_averages": 16}}
+    assert tek.apply(settings) == ["CH1:SCALE 0.5"]
+    assert tek.apply(settings) == []
+    tek.restore(state)
+    assert tek.oscilloscope.ch1.scale == 0.1
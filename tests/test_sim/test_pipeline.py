@@ -0,0 +1,53 @@
+"""Test Pipeline"""
+from itertools import islice
+import sys
+import numpy as np
+import pytest
+from tekinstr.pipeline import Pipeline, split
+from tekinstr.ring import WaveformRing
+from tekinstr.simulator import simulate
+
+# pylint: disable=missing-function-docstring
+shared_memory = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason="multiprocessing.shared_memory is new in 3.8"
+)
+
+
+def test_split():
+    record = np.arange(10)
+    assert [len(c) for c in split(record, 4)] == [4, 4, 2]
+    assert [c[0] for c in split(record, 4, overlap=1)] == [0, 3, 6]
+    with pytest.raises(ValueError):
+        list(split(record, 4, overlap=4))
+
+
+@shared_memory
+@pytest.mark.parametrize("processes", [False, True])
+def test_pipeline(processes):
+    tek = simulate("MDO3024")
+    waveforms = [tek.oscilloscope.read("CH1", samples=100) for _ in range(6)]
+    with WaveformRing(create=True, n_slots=4, n_channels=1, n_samples=100) as ring:
+        with Pipeline(2, processes, max_pending=3, ring=ring) as pipeline:
+            pipeline.register("peak", np.max)
+            pipeline.register("spectrum", np.fft.rfft)
+            results = list(pipeline.map(iter(waveforms)))
+    assert [r["peak"] for r in results] == [np.max(wf) for wf in waveforms]
+    assert len(results[0]["spectrum"]) == 51
+    with Pipeline(2, processes) as pipeline:
+        pipeline.register("mean", np.mean)
+        chunks = list(pipeline.map(split(np.arange(10.0), 5)))
+    assert chunks == [{"mean": 2.0}, {"mean": 7.0}]
+
+
+@shared_memory
+@pytest.mark.parametrize("processes", [False, True])
+def test_map_stream(processes):
+    tek = simulate("MDO3024")
+    with WaveformRing(create=True, n_slots=4, n_channels=1, n_samples=100) as ring:
+        with Pipeline(2, processes, max_pending=3, ring=ring) as pipeline:
+            pipeline.register("spectrum", np.fft.rfft)
+            with tek.oscilloscope.stream("CH1", samples=100) as stream:
+                results = list(pipeline.map_stream(islice(stream, 5)))
+    sequences = [sequence for sequence, _ in results]
+    assert len(sequences) == 5 and sequences == sorted(set(sequences))
+    assert all(len(result["spectrum"]) == 51 for _, result in results)
@@ -0,0 +1,53 @@
+"""Test WaveformRing"""
+import multiprocessing
+import sys
+import numpy as np
+import pytest
+from tekinstr.ring import WaveformRing
+from tekinstr.simulator import simulate
+
+# pylint: disable=missing-function-docstring
+shared_memory = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason="multiprocessing.shared_memory is new in 3.8"
+)
+
+
+def peak(name, sequence):
+    ring = WaveformRing(name)
+    try:
+        return float(np.max(ring.get(sequence)))
+    finally:
+        ring.close()
+
+
+@shared_memory
+def test_ring():
+    tek = simulate("MDO3024")
+    with WaveformRing(create=True, n_slots=2, n_channels=2, n_samples=100) as ring:
+        wf = tek.oscilloscope.read("CH1", samples=100)
+        assert ring.publish(wf) == 1
+        consumer = WaveformRing(ring.name)
+        view = consumer.latest()
+        assert np.array_equal(view, wf)
+        assert view.dt == wf.dt and view.t0 == wf.t0
+        assert view.y_offset == wf.y_offset
+        del view
+        ring.publish(tek.oscilloscope.read("CH1:2", samples=100))
+        assert consumer.get(2, wdt=False).shape == (2, 100)
+        ring.publish(wf)
+        assert not consumer.current(1)
+        with pytest.raises(KeyError):
+            consumer.get(1)
+        with pytest.raises(ValueError):
+            ring.publish(np.zeros(101))
+        with pytest.raises(TimeoutError):
+            consumer.wait(3, timeout=0.01)
+        consumer.close()
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            assert pool.apply(peak, (ring.name, 3)) == np.max(wf)
+
+
+def test_python37(monkeypatch):
+    monkeypatch.setitem(sys.modules, "multiprocessing.shared_memory", None)
+    with pytest.raises(ImportError, match="Python 3.8"):
+        WaveformRing(create=True)
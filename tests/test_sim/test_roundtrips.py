@@ -0,0 +1,82 @@
+"""Test the number of round trips of operations"""
+import pytest
+from tekinstr.mdo3000.mdo3000 import MDO3000
+from tekinstr.session import Session
+from tekinstr.simulator import SimulatedInstrument, SimulatedResource, simulate
+from tekinstr.testing import expect_roundtrips
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+@pytest.fixture(scope="module")
+def tek():
+    yield simulate("MDO3024")
+
+
+def test_attach():
+    session = Session(SimulatedResource(SimulatedInstrument("MDO3024")))
+    with expect_roundtrips(session, max=29):
+        MDO3000(session)
+
+
+def test_attach_probe():
+    class Unknown(MDO3000):
+        """Model that doesn't tell if it has measurement statistics"""
+
+        _measurement_stats = None
+
+    session = Session(SimulatedResource(SimulatedInstrument("MDO3024")))
+    with expect_roundtrips(session, max=37):
+        tek = Unknown(session)
+    assert tek.oscilloscope.measurement._has_stats
+    with expect_roundtrips(session, max=29):
+        Unknown(session)  # the probe is cached
+
+
+def test_read(tek):
+    with expect_roundtrips(tek, max=20):
+        tek.oscilloscope.read("CH1")
+    with expect_roundtrips(tek, max=35):
+        tek.oscilloscope.read("CH1:4")
+
+
+def test_measurement(tek):
+    measurement = tek.oscilloscope.measurement
+    with expect_roundtrips(tek, max=19):
+        measurement.add("CH1", "frequency")
+    with expect_roundtrips(tek, max=1):
+        _ = measurement.CH1_frequency.value
+    with expect_roundtrips(tek, max=0):
+        dir(measurement.CH1_frequency)
+    with expect_roundtrips(tek, max=1):
+        repr(measurement.CH1_frequency)
+    with expect_roundtrips(tek, max=1):
+        measurement.read_all()
+    with expect_roundtrips(tek, max=2):
+        measurement.immediate_many([("CH1", "frequency"), ("CH2", "rms")] * 10)
+    with expect_roundtrips(tek, max=6):
+        measurement.remove("CH1_frequency")
+
+
+def test_display(tek):
+    with expect_roundtrips(tek, max=14):
+        tek.display = "CH1:2"
+    with expect_roundtrips(tek, max=4):
+        _ = tek.display
+
+
+def test_properties(tek):
+    with expect_roundtrips(tek, max=1):
+        _ = tek.oscilloscope.horizontal_scale
+    with expect_roundtrips(tek, max=1):
+        tek.oscilloscope.ch1.scale = 0.2
+    with expect_roundtrips(tek, max=6):
+        tek.oscilloscope.horizontal_scale = 4e-6
+    with expect_roundtrips(tek, max=2):
+        tek.apply({"oscilloscope": {"ch1": {"scale": 0.1}}})
+
+
+def test_budget_exceeded(tek):
+    with pytest.raises(AssertionError, match="2 round trips"):
+        with expect_roundtrips(tek, max=1):
+            _ = tek.oscilloscope.horizontal_scale
+            _ = tek.oscilloscope.record_length
@@ -0,0 +1,123 @@
+"""Test the spectrum analyzer"""
+import threading
+import time
+import numpy as np
+import pytest
+from tekinstr.simulator import simulate
+from tekinstr.spectrum_analyzer import _stitch
+from tekinstr.testing import expect_roundtrips
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+@pytest.fixture(scope="module")
+def tek():
+    yield simulate("MDO3024")
+
+
+def test_read(tek):
+    spectrum = tek.spectrum_analyzer.read()
+    assert spectrum.shape == (1000,)
+    assert spectrum.y_unit == "dBmW"
+    assert spectrum.max() == pytest.approx(-20, abs=1)
+
+
+def test_read_traces(tek):
+    traces = ["normal", "max hold", "min hold"]
+    with expect_roundtrips(tek, max=8):
+        spectra = tek.spectrum_analyzer.read(traces=traces)
+    assert spectra.shape == (3, 1000)
+    assert np.median(spectra[1]) > np.median(spectra[0]) > np.median(spectra[2])
+    watts = tek.spectrum_analyzer.read(dB=False, wdt=False, traces=traces)
+    assert isinstance(watts, np.ndarray) and watts.shape == (3, 1000)
+
+
+def test_read_into(tek):
+    spectrum_analyzer = tek.spectrum_analyzer
+    spectrum_analyzer.read(wdt=False)  # reads the vertical unit
+    out = np.empty((2, 1000), np.float64)
+    traces = ["normal", "average"]
+    with expect_roundtrips(tek, max=2):
+        spectra = spectrum_analyzer.read(wdt=False, traces=traces, out=out)
+    assert spectra is out
+    assert out.max() == pytest.approx(-20, abs=1)
+    spectrum_analyzer.vertical_unit = "DBUW"
+    assert spectrum_analyzer.read(wdt=False).max() == pytest.approx(10, abs=1)
+    spectrum_analyzer.vertical_unit = "DBM"
+
+
+def test_vertical_unit(tek):
+    spectrum_analyzer = tek.spectrum_analyzer
+    state = tek.snapshot()
+    spectrum_analyzer.vertical_unit = "DBUW"
+    assert spectrum_analyzer.read(wdt=False).max() == pytest.approx(10, abs=1)
+    tek.restore(state)
+    assert spectrum_analyzer.read(wdt=False).max() == pytest.approx(-20, abs=1)
+    with expect_roundtrips(tek, max=1):
+        spectrum_analyzer.read(wdt=False)
+
+
+def test_spectrogram(tek, tmp_path):
+    path = tmp_path / "spectrogram.npy"
+    with tek.spectrum_analyzer.spectrogram(rows=5, path=path) as spectrogram:
+        while spectrogram.n_rows < 8:
+            time.sleep(0.01)
+    times, spectra = spectrogram.series()  # as written to the file
+    assert spectra.shape == (5, 1000)
+    assert (np.diff(times) > 0).all()
+    assert spectra.max() == pytest.approx(-20, abs=1)
+    assert len(spectrogram.frequencies) == 1000
+    records = np.sort(np.load(path), order="time")[-5:]
+    assert (records["time"] == times).all()
+    assert (records["spectrum"] == spectra).all()
+    assert not spectrogram.running
+
+
+def test_spectrogram_series(tek, monkeypatch):
+    spectrum_analyzer = tek.spectrum_analyzer
+    reading, transferred = threading.Event(), threading.Event()
+    read = type(spectrum_analyzer).read
+
+    def slow_read(self, *args, **kwargs):
+        reading.set()
+        transferred.wait()
+        return read(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(spectrum_analyzer), "read", slow_read)
+    with spectrum_analyzer.spectrogram(rows=5) as spectrogram:
+        assert reading.wait(1)
+        series = threading.Thread(target=spectrogram.series)
+        series.start()
+        series.join(1)
+        transferred.set()
+        assert not series.is_alive()
+
+
+def test_stitch():
+    band = np.arange(100.0)
+    segments = np.stack([band[start : start + 40] for start in range(0, 61, 30)])
+    assert (_stitch(segments, 30) == band).all()
+
+
+def test_sweep(tek):
+    spectrum_analyzer = tek.spectrum_analyzer
+    span = spectrum_analyzer.span
+    spectrum = spectrum_analyzer.sweep(0.5e9, 2.5e9, rbw=1e6, max_span=500e6)
+    frequencies = spectrum.wf_start_offset + spectrum.dt * np.arange(len(spectrum))
+    assert frequencies[-1] == pytest.approx(2.5e9, abs=spectrum.dt)
+    assert frequencies[np.argmax(spectrum)] == pytest.approx(1e9, abs=spectrum.dt)
+    assert spectrum.max() == pytest.approx(-20, abs=1)
+    assert spectrum_analyzer.span == span
+
+
+def test_sweep_band(tek):
+    spectrum_analyzer = tek.spectrum_analyzer
+    with expect_roundtrips(tek, max=0):
+        for start, stop in [(2.5e9, 0.5e9), (1e9, 1e9), (2e9, 3.5e9)]:
+            with pytest.raises(ValueError):
+                spectrum_analyzer.sweep(start, stop, rbw=1e6)
+    span = spectrum_analyzer.span
+    with pytest.raises(ValueError, match="last center"):
+        spectrum_analyzer.sweep(1e9, 3e9, rbw=1e6, max_span=1e9, overlap=0)
+    assert spectrum_analyzer.span == span
+    spectrum = spectrum_analyzer.sweep(0, 3e9, rbw=1e6, wdt=False)
+    assert len(spectrum) == 1000
@@ -0,0 +1,43 @@
+"""Test InstrumentState"""
+from tekinstr.state import InstrumentState
+
+# pylint: disable=missing-function-docstring
+SETUP = (
+    ':ACQUIRE:STOPAFTER RUNSTOP;STATE 1;MODE SAMPLE;:CH1:LABEL "a;b";SCALE 1.0E-1;'
+    ":TRIGGER:A:MODE AUTO;EDGE:SLOPE RISE"
+)
+
+
+def test_parse():
+    state = InstrumentState(SETUP)
+    assert state["ACQUIRE:STATE"] == 1
+    assert state["ch1:label"] == "a;b"
+    assert state["CH1:SCALE"] == 0.1
+    assert state["TRIGGER:A:EDGE:SLOPE"] == "RISE"
+    assert len(state) == 7
+
+
+def test_roundtrip():
+    state = InstrumentState(SETUP)
+    assert dict(InstrumentState(str(state))) == dict(state)
+
+
+def test_diff():
+    state = InstrumentState(SETUP)
+    other = InstrumentState(SETUP.replace("1.0E-1", "2.0E-1") + ";:HEADER 0")
+    assert state.diff(other) == {"CH1:SCALE": (0.1, 0.2), "HEADER": (None, 0)}
+
+
+def test_lookup():
+    state = InstrumentState(SETUP)
+    assert state.lookup("ACQ:STATE") == "1"
+    assert state.lookup("CH1:SCA") == "1.0E-1"
+    assert state.lookup("CH2:SCALE") is None
+
+
+def test_matches():
+    state = InstrumentState(SETUP)
+    assert state.matches("CH1:SCALE 0.1")
+    assert state.matches("ACQUIRE:STATE ON")
+    assert not state.matches("ACQUIRE:MODE AVERAGE")
+    assert not state.matches("CH2:SCALE 0.1")
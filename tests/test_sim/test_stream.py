@@ -0,0 +1,92 @@
+"""Test Stream"""
+import asyncio
+import threading
+import time
+import numpy as np
+import pytest
+from tekinstr.simulator import Signal, simulate
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def osc():
+    tek = simulate("MDO3024")
+    tek.oscilloscope.acquisition_state = "STOP"
+    yield tek.oscilloscope
+
+
+@pytest.mark.parametrize("state", ["0", "1"])
+def test_stream(osc, state):
+    osc.acquisition_state = state
+    time.sleep(0.1)  # acquisitions before the stream if running
+    received = []
+    with osc.stream("CH1:2", samples=100, timeout=0.2) as stream:
+        with pytest.raises(TimeoutError):
+            for item in stream:
+                received.append(item)
+                if len(received) == 5:
+                    osc.acquisition_state = "STOP"  # the stream times out
+    sequences = [sequence for sequence, _ in received]
+    assert sequences == sorted(set(sequences))
+    assert sequences[0] < 50
+    assert received[0][1].shape == (2, 100)
+    assert stream.missed == sequences[-1] - len(sequences)
+    assert not stream.running
+    assert osc.acquisition_state == state
+
+
+def test_close_waiting():
+    tek = simulate("MDO3024", trigger_rate=0.01)
+    stream = tek.oscilloscope.stream("CH1", samples=100, timeout=None)
+    consumer = threading.Thread(target=list, args=(stream,), daemon=True)
+    consumer.start()
+    time.sleep(0.1)  # the consumer waits for the first acquisition
+    stream.close()
+    consumer.join(5)
+    assert not consumer.is_alive()
+
+
+def test_drop(osc):
+    with osc.stream("CH1", samples=100, maxsize=2, policy="drop") as stream:
+        sequence, _ = next(stream)
+        time.sleep(0.1)
+        assert next(stream)[0] > sequence + 1
+    assert stream.dropped > 0
+    with pytest.raises(ValueError):
+        osc.stream("CH1", policy="wait")
+
+
+def test_async(osc):
+    async def consume(stream):
+        async for sequence, wf in stream:
+            if sequence >= 3:
+                return len(wf)
+        return None
+
+    with osc.stream("CH1", samples=100) as stream:
+        assert asyncio.run(consume(stream)) == 100
+
+
+def test_timeout(osc):
+    osc._visa.write("HORIZONTAL:SCALE 1")  # pylint: disable=protected-access
+    with osc.stream("CH1", samples=100, timeout=0.05) as stream:
+        with pytest.raises(TimeoutError):
+            next(stream)
+
+
+def test_roll():
+    tek = simulate("MDO3024", signals={"CH1": Signal(2, 1.0, 0.0, 0.0)})
+    tek.oscilloscope.ch1.scale = 0.5
+    start = time.monotonic()
+    with tek.oscilloscope.roll("CH1", scale=0.04, interval=0.05) as roll:
+        time.sleep(0.5)
+    elapsed = time.monotonic() - start
+    series = roll.series()
+    assert roll.gaps == 0
+    assert 0.8 * elapsed < len(series) * series.dt < 1.1 * elapsed
+    assert np.max(np.abs(np.diff(series))) <= 0.021
+    assert tek.oscilloscope.horizontal_scale == 4e-6
+    with tek.oscilloscope.roll("CH1:2", scale=0.04, capacity=1000) as roll:
+        time.sleep(0.25)
+    assert roll.series(wdt=False).shape == (2, 1000)
+    assert roll.n_samples > 1000
@@ -0,0 +1,66 @@
+"""Test sharing a model between threads"""
+import threading
+from tekinstr.simulator import simulate
+
+
+# pylint: disable=missing-function-docstring
+def test_threads():
+    tek = simulate("MDO3024", latency=1e-4)
+    metrics = tek.collect_metrics()
+    done = threading.Event()
+    errors = []
+
+    def monitor():
+        try:
+            while not done.is_set():
+                assert tek.oscilloscope.ch1.scale == 0.1
+                assert tek.oscilloscope.measurement.CH1_frequency.value > 0
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append(exc)
+
+    tek.oscilloscope.measurement.add("CH1", "frequency")
+    thread = threading.Thread(target=monitor)
+    thread.start()
+    try:
+        for _ in range(10):
+            wf = tek.oscilloscope.read("CH1", samples=100)
+            assert len(wf) == 100
+    finally:
+        done.set()
+        thread.join()
+    assert not errors
+    assert metrics.snapshot()["lock_wait"]["count"] > 0
+
+
+def test_defer():
+    tek = simulate("MDO3024")
+    visa = tek._visa  # pylint: disable=protected-access
+    tek.oscilloscope.ch2.scale = 0.1
+    setter = threading.Thread(target=setattr, args=(tek.oscilloscope.ch2, "scale", 0.7))
+    with visa.locked():
+        with visa.defer() as commands:
+            setter.start()
+            setter.join(0.1)
+            assert setter.is_alive()  # waits instead of being deferred
+    setter.join()
+    assert not commands
+    assert tek.oscilloscope.ch2.scale == 0.7
+
+
+def test_cache():
+    tek = simulate("MDO3024")
+    queries = []
+
+    def reader():
+        with tek.cached():
+            queries.append(tek.oscilloscope.ch1.scale)
+
+    with tek.cached():
+        with tek.trace() as trace:
+            _ = tek.oscilloscope.ch1.scale
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join()  # opens and closes a cache of its own
+            _ = tek.oscilloscope.ch1.scale
+    assert queries == [0.1]
+    assert trace.commands()["CH1:SCALE?"].count == 2
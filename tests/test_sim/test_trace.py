@@ -0,0 +1,17 @@
+"""Test Trace"""
+from tekinstr.simulator import simulate
+
+# pylint: disable=missing-function-docstring
+def test_trace():
+    tek = simulate("MDO3024")
+    with tek.trace() as trace:
+        _ = tek.oscilloscope.horizontal_position
+        _ = tek.oscilloscope.ch1.scale
+    assert trace.properties()["Oscilloscope.horizontal_position"].count == 3
+    assert trace.commands()["CH1:SCALE?"].count == 1
+    assert trace.transactions[-1].caller == "Channel.scale"
+    assert "HORIZONTAL:DELAY:TIME?" in str(trace)
+    with tek.trace(maxlen=2) as trace:
+        tek.oscilloscope.read("CH1", samples=100)
+    assert len(trace) == 2
+    assert trace.transactions[-1].caller == "Oscilloscope.read"